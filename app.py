@@ -1,22 +1,71 @@
 """Flask Application für Lagerverwaltung"""
 
+import atexit
+import hashlib
+import json
 import os
+import threading
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import Optional
 
-from flask import Flask, flash, redirect, render_template, request, url_for
+from flask import (
+    Flask, Response, abort, flash, jsonify, redirect, render_template, request, url_for
+)
+from werkzeug.http import is_resource_modified
 
+from src.adapters.caching_repository import CachingRepository
+from src.adapters.export import gzip_chunks, iter_movements_csv, iter_movements_jsonl
 from src.adapters.repository import SQLiteRepository
 from src.adapters.report import ConsoleReportAdapter
+from src.reports.chart_cache import CHART_STYLE_VERSION, ChartCache
 from src.reports.report_b import ReportB
 from src.services import WarehouseService
 
+# Höchstzahl Operationen pro Anfrage an /api/batch
+MAX_BATCH_OPERATIONS = 5000
 
-def create_app(db_path: str = "warehouse.db") -> Flask:
+# Produkte pro Seite bei /api/products (Standard und Höchstwert)
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def _report_since(days: int) -> Optional[datetime]:
+    """Beginn des Report-Zeitfensters (Mitternacht vor days Tagen, 0 = gesamte Historie)"""
+    if not days or days <= 0:
+        return None
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    return today - timedelta(days=days)
+
+
+def create_app(
+    db_path: str = "warehouse.db",
+    pool_size: int = 5,
+    db_profile: str = "safe",
+    product_cache_size: Optional[int] = 0,
+    chart_cache_size: int = 64,
+    chart_cache_ttl: Optional[float] = None,
+    chart_cache_dir: Optional[str] = None,
+    totals_reconcile_interval: Optional[float] = None,
+) -> Flask:
     """
     Flask App Factory
 
     Args:
         db_path: Pfad zur warehouse.db Datenbank
+        pool_size: Anzahl gepoolter Datenbankverbindungen (0 = kein Pooling)
+        db_profile: SQLite-PRAGMA-Profil ("safe" oder "throughput")
+        product_cache_size: Produkt-Cache (0 = kein Cache, None = ganzer Katalog,
+            sonst maximale Anzahl Produkte im LRU-Cache); wird vor jedem Request
+            mit dem Änderungszähler der Datenbank abgeglichen
+        chart_cache_size: Maximale Anzahl gecachter Report-Charts (0 = kein Cache)
+        chart_cache_ttl: Lebensdauer gecachter Charts in Sekunden (None = unbegrenzt)
+        chart_cache_dir: Verzeichnis, in dem Charts zusätzlich abgelegt werden
+            (None = nur im Speicher)
+        totals_reconcile_interval: Sekunden zwischen zwei Abgleichen der laufenden
+            Bestandswert-Summen mit einer Neuberechnung in einem Hintergrund-Thread
+            (None = kein Thread; z.B. 300 im Produktivbetrieb). Beendet wird er mit
+            app.stop_reconciliation.set() bzw. beim Prozessende
 
     Returns:
         Konfigurierte Flask App
@@ -30,14 +79,48 @@ def create_app(db_path: str = "warehouse.db") -> Flask:
     # Konfiguration
     app.config["SECRET_KEY"] = os.environ.get("SECRET_KEY", "dev-key-change-in-production")
     app.config["DATABASE"] = db_path
+    app.config["DB_POOL_SIZE"] = pool_size
+    app.config["DB_PROFILE"] = db_profile
+    app.config["PRODUCT_CACHE_SIZE"] = product_cache_size
+    app.config["CHART_CACHE_SIZE"] = chart_cache_size
 
     # Services initialisieren
-    repository = SQLiteRepository(db_path=db_path)
-    report_adapter = ConsoleReportAdapter()
+    repository = SQLiteRepository(
+        db_path=db_path, pool_size=pool_size, profile=app.config["DB_PROFILE"]
+    )
+    # Gepoolte Verbindungen beim Beenden des Prozesses sauber schließen
+    atexit.register(repository.close)
+    if product_cache_size != 0:
+        repository = cache = CachingRepository(repository, max_size=product_cache_size)
+
+        @app.before_request
+        def refresh_product_cache():
+            # Schreibzugriffe anderer Prozesse (weitere Worker, Skripte) verwerfen den Cache
+            cache.refresh()
+    # Berichte lesen Bestand und Bewegungsprotokoll direkt aus dem Repository
+    report_adapter = ConsoleReportAdapter(repository=repository)
     service = WarehouseService(repository=repository, report_adapter=report_adapter)
 
     # Service in App speichern für Zugriff in Routes
     app.warehouse_service = service
+    # Abgleich der laufenden Bestandswert-Summen außerhalb der Requests
+    app.stop_reconciliation = threading.Event()
+    app.reconciliation_thread = None
+    if totals_reconcile_interval is not None:
+        app.reconciliation_thread = threading.Thread(
+            target=service.run_reconciliation,
+            args=(totals_reconcile_interval, app.stop_reconciliation),
+            name="inventory-totals-reconciliation",
+            daemon=True,
+        )
+        app.reconciliation_thread.start()
+        atexit.register(app.stop_reconciliation.set)
+    # Gerenderte Report-Charts nach Fingerabdruck der Datenreihen
+    app.chart_cache = (
+        ChartCache(max_entries=chart_cache_size, ttl=chart_cache_ttl, directory=chart_cache_dir)
+        if chart_cache_size
+        else None
+    )
 
     # ===== ROUTES =====
 
@@ -55,7 +138,9 @@ def create_app(db_path: str = "warehouse.db") -> Flask:
         categories = app.warehouse_service.get_product_categories()
         
         if query:
-            products = app.warehouse_service.search_products(query)
+            # Beste Treffer zuerst, bei sehr allgemeinen Suchbegriffen begrenzt
+            limit = request.args.get("limit", default=100, type=int)
+            products = app.warehouse_service.search_products(query, limit=limit)
         
         return render_template("suche.html", products=products, query=query, categories=categories)
 
@@ -66,12 +151,13 @@ def create_app(db_path: str = "warehouse.db") -> Flask:
         categories = app.warehouse_service.get_product_categories()
         return render_template("kategorie.html", products=products, selected_category=category, categories=categories)
 
+    # Listen-Seiten laden ihre Produkte seitenweise über /api/products nach
+
     @app.route("/lager")
     def lager():
         """Lager-Übersicht"""
-        products = app.warehouse_service.get_products_with_totals()
         low_stock_count = app.warehouse_service.get_low_stock_count()
-        return render_template("lager.html", products=products, low_stock_count=low_stock_count)
+        return render_template("lager.html", low_stock_count=low_stock_count)
 
     @app.route("/low-stock")
     def low_stock():
@@ -82,8 +168,7 @@ def create_app(db_path: str = "warehouse.db") -> Flask:
     @app.route("/shop")
     def shop():
         """Shop-Übersicht"""
-        products = app.warehouse_service.get_products_with_totals()
-        return render_template("shop.html", products=products)
+        return render_template("shop.html")
 
     @app.route("/einkauf", methods=["GET", "POST"])
     def einkauf():
@@ -111,8 +196,7 @@ def create_app(db_path: str = "warehouse.db") -> Flask:
                 flash("Einkauf fehlgeschlagen", "danger")
                 return redirect(url_for("einkauf"))
 
-        products = app.warehouse_service.get_products_with_totals()
-        return render_template("einkauf.html", products=products)
+        return render_template("einkauf.html")
 
     @app.route("/transfer", methods=["GET", "POST"])
     def transfer():
@@ -145,8 +229,7 @@ def create_app(db_path: str = "warehouse.db") -> Flask:
 
             return redirect(url_for("transfer"))
 
-        products = app.warehouse_service.get_products_with_totals()
-        return render_template("transfer.html", products=products)
+        return render_template("transfer.html")
 
     @app.route("/verkauf", methods=["GET", "POST"])
     def verkauf():
@@ -174,19 +257,212 @@ def create_app(db_path: str = "warehouse.db") -> Flask:
                 flash("Verkauf fehlgeschlagen - Nicht genug Bestand im Shop", "danger")
                 return redirect(url_for("verkauf"))
 
-        products = app.warehouse_service.get_products_with_totals()
-        return render_template("verkauf.html", products=products)
+        return render_template("verkauf.html")
 
     @app.route("/report_b")
     def report_b():
         """Report B - Bewegungsprotokoll und Lagerverlauf-Statistiken"""
-        movements = app.warehouse_service.get_movements()
-        products = app.warehouse_service.get_products_with_totals()
-        
-        report_generator = ReportB(movements, products)
-        report_data = report_generator.generate_full_report()
+        # Zeitfenster in Tagen (0 = gesamte Historie)
+        days = request.args.get("tage", default=30, type=int)
+        since = _report_since(days)
+
+        # Auswertungen und Charts kommen aus den Bewegungsspalten (NumPy), das
+        # Protokoll aus den 50 neuesten Bewegungen - kein Durchlauf über Movement-Objekte
+        service = app.warehouse_service
+        recent_movements = service.get_movements(since=since, limit=50, newest_first=True)
+        products = service.get_products_with_totals()
+        columns = service.get_movement_columns(since=since)
+
+        report_generator = ReportB(
+            [],
+            products,
+            recent_movements=recent_movements,
+            since=since,
+            columns=columns,
+            chart_cache=app.chart_cache,
+        )
+        # Charts lädt der Browser parallel über report_b_chart
+        report_data = report_generator.generate_full_report(render_charts=False)
         
-        return render_template("report_b.html", report=report_data)
+        return render_template("report_b.html", report=report_data, days=days)
+
+    @app.route("/report_b/chart/<name>.<any(png, svg, json):fmt>")
+    def report_b_chart(name, fmt):
+        """Einzelner Chart von Report B als PNG, SVG oder JSON (mit ETag/Last-Modified)"""
+        if name not in ReportB.CHARTS:
+            abort(404)
+        days = request.args.get("tage", default=30, type=int)
+        since = _report_since(days)
+        service = app.warehouse_service
+
+        # Validierung über neueste Bewegung und Änderungszähler, ohne Produkte zu laden
+        latest = service.get_movements(limit=1, newest_first=True)
+        last_modified = latest[0].timestamp if latest else None
+        movement_chart = name in ReportB.MOVEMENT_CHARTS
+        # Bestandscharts ändern sich auch durch Produktänderungen ohne Bewegung (z.B. Preis)
+        data_version = None if movement_chart else service.get_data_version()
+
+        validator = "|".join(
+            str(part)
+            for part in (
+                CHART_STYLE_VERSION, name, fmt, since,
+                latest[0].id if latest else None, last_modified, data_version,
+            )
+        )
+        etag = hashlib.sha256(validator.encode()).hexdigest()[:32]
+        last_modified_utc = (
+            last_modified.astimezone(timezone.utc).replace(microsecond=0) if last_modified else None
+        )
+
+        # Bestandscharts nur per ETag: ihr Stand hängt nicht allein an der Zeit der neuesten Bewegung
+        if not is_resource_modified(
+            request.environ,
+            etag=etag,
+            last_modified=last_modified_utc if movement_chart else None,
+        ):
+            response = Response(status=304)
+        else:
+            if movement_chart:
+                report_generator = ReportB(
+                    [], [], since=since, columns=service.get_movement_columns(since=since),
+                    chart_cache=app.chart_cache,
+                )
+            else:
+                report_generator = ReportB(
+                    [], service.get_products_with_totals(), chart_cache=app.chart_cache
+                )
+            if fmt == "svg":
+                # SVG und JSON kommen ohne matplotlib aus
+                content, mimetype = report_generator.chart_svg(name), "image/svg+xml"
+            elif fmt == "json":
+                data = report_generator.chart_json(name)
+                content, mimetype = (json.dumps(data) if data else None), "application/json"
+            else:
+                content, mimetype = report_generator.chart_png(name), "image/png"
+            if content is None:
+                abort(404)
+            response = Response(content, mimetype=mimetype)
+
+        response.set_etag(etag)
+        if last_modified_utc:
+            response.last_modified = last_modified_utc
+        # Browser darf speichern, muss aber vor jeder Nutzung nachfragen (304)
+        response.cache_control.no_cache = True
+        return response
+
+    # ===== EXPORT (gestreamt) =====
+
+    def _export_response(chunks, filename: str, mimetype: str) -> Response:
+        """Textblöcke als Download streamen, auf Wunsch gzip-komprimiert"""
+        compress = request.args.get("gzip", type=int) == 1 or request.accept_encodings["gzip"] > 0
+        body = gzip_chunks(chunks) if compress else chunks
+        response = Response(body, mimetype=mimetype)
+        response.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+        if compress:
+            response.headers["Content-Encoding"] = "gzip"
+        response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+    def _export_window():
+        """Zeitfenster aus ?since=...&until=... (ISO-Datum/-Zeit, beide optional)"""
+        try:
+            return tuple(
+                datetime.fromisoformat(request.args[key]) if request.args.get(key) else None
+                for key in ("since", "until")
+            )
+        except ValueError:
+            abort(400, description="since/until müssen ISO-Datum oder -Zeit sein")
+
+    @app.route("/export/inventory.txt")
+    def export_inventory():
+        """Lagerbestandsbericht als Textdatei (gestreamt)"""
+        return _export_response(
+            app.warehouse_service.iter_inventory_report(), "inventory.txt", "text/plain"
+        )
+
+    @app.route("/export/movements.csv")
+    def export_movements_csv():
+        """Bewegungsprotokoll als CSV (gestreamt, optional ?since=&until=)"""
+        since, until = _export_window()
+        movements = app.warehouse_service.iter_movements(since=since, until=until)
+        return _export_response(iter_movements_csv(movements), "movements.csv", "text/csv")
+
+    @app.route("/export/movements.jsonl")
+    def export_movements_jsonl():
+        """Bewegungsprotokoll als JSON Lines (gestreamt, optional ?since=&until=)"""
+        since, until = _export_window()
+        movements = app.warehouse_service.iter_movements(since=since, until=until)
+        return _export_response(
+            iter_movements_jsonl(movements), "movements.jsonl", "application/x-ndjson"
+        )
+
+    # ===== API =====
+
+    @app.route("/api/products")
+    def api_products():
+        """
+        Produkte seitenweise als JSON (Keyset-Pagination)
+
+        Parameter: limit, cursor (next_cursor der vorigen Seite), fields (kommagetrennt),
+        sort (Feld, mit "-" davor absteigend), category, low_stock=1, q (Suchtext)
+        """
+        args = request.args
+        limit = args.get("limit", default=DEFAULT_PAGE_SIZE, type=int)
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            return jsonify(error=f"limit muss zwischen 1 und {MAX_PAGE_SIZE} liegen"), 400
+        sort = args.get("sort", "id")
+        fields = [field for field in args.get("fields", "").split(",") if field] or None
+        try:
+            page = app.warehouse_service.get_products_page(
+                limit=limit,
+                cursor=args.get("cursor") or None,
+                sort=sort.lstrip("-"),
+                descending=sort.startswith("-"),
+                category=args.get("category") or None,
+                low_stock=args.get("low_stock", type=int) == 1,
+                query=args.get("q") or None,
+                fields=fields,
+            )
+        except ValueError as exc:
+            return jsonify(error=str(exc)), 400
+
+        for item in page["items"]:
+            for key in ("created_at", "updated_at"):
+                if isinstance(item.get(key), datetime):
+                    item[key] = item[key].isoformat()
+        return jsonify(page)
+
+    @app.route("/api/batch", methods=["POST"])
+    def api_batch():
+        """
+        Viele Verkäufe, Einkäufe und Transfers in einer Anfrage buchen (Kassen, Scanner)
+
+        Body: Liste von Operationen oder {"operations": [...], "atomic": true}
+        Antwort: {"applied": n, "errors": [{"index", "error"}]};
+        422, wenn atomic und mindestens eine Operation fehlerhaft ist (nichts gebucht);
+        409, wenn sich der Bestand während einer atomaren Buchung geändert hat
+        """
+        payload = request.get_json(silent=True)
+        if isinstance(payload, list):
+            operations, atomic = payload, True
+        elif isinstance(payload, dict) and isinstance(payload.get("operations"), list):
+            operations, atomic = payload["operations"], payload.get("atomic", True)
+        else:
+            return jsonify(error='JSON-Liste oder {"operations": [...]} erwartet'), 400
+        if not isinstance(atomic, bool):
+            return jsonify(error="atomic muss true oder false sein"), 400
+        if len(operations) > MAX_BATCH_OPERATIONS:
+            return jsonify(error=f"Höchstens {MAX_BATCH_OPERATIONS} Operationen pro Anfrage"), 413
+
+        try:
+            result = app.warehouse_service.apply_operations(
+                operations, atomic=atomic, performed_by="api"
+            )
+        except ValueError as exc:
+            # Bestand hat sich während der Buchung geändert; nichts gebucht, erneut versuchen
+            return jsonify(error=str(exc)), 409
+        status = 422 if atomic and result["errors"] else 200
+        return jsonify(result), status
 
     @app.route("/bestellung", methods=["GET", "POST"])
     def bestellung():
@@ -197,5 +473,5 @@ def create_app(db_path: str = "warehouse.db") -> Flask:
 
 
 if __name__ == "__main__":
-    app = create_app()
+    app = create_app(totals_reconcile_interval=300.0)
     app.run(debug=True, host="127.0.0.1", port=5000)
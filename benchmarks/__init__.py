@@ -0,0 +1 @@
+"""Benchmarks - Performance-Messungen (Ausführung z.B. mit python -m benchmarks.bench_repository)"""
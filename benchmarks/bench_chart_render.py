@@ -0,0 +1,71 @@
+"""Benchmark: Report-B-Charts nacheinander vs. im Prozesspool
+
+Misst generate_full_report (vier Charts, ohne Chart-Cache):
+    vorher:  Charts nacheinander im selben Prozess
+    nachher: ChartRenderPool mit vorgewärmten Workern
+    SVG:     handgebaute SVG-Charts ohne matplotlib (chart_format="svg")
+Zum Vergleich die Renderzeit des langsamsten einzelnen Charts.
+
+Ausführung:
+    python -m benchmarks.bench_chart_render [anzahl_tage]
+"""
+
+import sys
+import time
+from datetime import datetime, timedelta
+
+from src.domain.warehouse import Movement
+from src.reports.chart_pool import ChartRenderPool
+from src.reports.charts import render_png
+from src.reports.report_b import ReportB
+
+_TYPES = ["IN", "SOLD", "TO_SHOP", "FROM_SHOP", "CORRECTION"]
+
+
+def _best_of(func, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(days: int = 365) -> None:
+    """Laufzeiten ausgeben"""
+    start = datetime(2025, 1, 1)
+    movements = [
+        Movement.from_storage(
+            f"M{i}", f"P{i % 40:02d}", "Produkt", 3 if i % 3 else -2, _TYPES[i % 5],
+            None, start + timedelta(hours=6 * i), "system",
+        )
+        for i in range(days * 4)
+    ]
+    products = [
+        {"id": f"P{i:02d}", "name": f"Produkt {i}", "category": f"Kategorie {i % 8}", "price": 1.0 + i,
+         "warehouse_qty": 10, "shop_qty": 3, "available_total": 13, "is_low_stock": False}
+        for i in range(40)
+    ]
+
+    report = ReportB(movements, products)
+    names = ["movement_timeline", "movement_types", "inventory_value", "warehouse_vs_shop"]
+    series = {name: report.chart_series(name) for name in names}
+    slowest = max(_best_of(lambda n=name: render_png(n, series[n])) for name in names)
+
+    serial = _best_of(lambda: ReportB(movements, products).generate_full_report())
+    svg = _best_of(lambda: ReportB(movements, products).generate_full_report(chart_format="svg"))
+    pool = ChartRenderPool(max_workers=len(names))
+    try:
+        pooled = _best_of(lambda: ReportB(movements, products, render_pool=pool).generate_full_report())
+    finally:
+        pool.shutdown()
+
+    print(f"{days} Tage, {len(movements):,} Bewegungen")
+    print(f"{'nacheinander':<28}{serial * 1000:>8.0f} ms")
+    print(f"{'Prozesspool (4 Worker)':<28}{pooled * 1000:>8.0f} ms")
+    print(f"{'langsamster Einzelchart':<28}{slowest * 1000:>8.0f} ms")
+    print(f"{'SVG ohne matplotlib':<28}{svg * 1000:>8.0f} ms")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 365)
@@ -0,0 +1,42 @@
+"""Benchmark: Einzel-Speichern vs. save_products (executemany, eine Transaktion)
+
+Ausführung:
+    python -m benchmarks.bench_import [anzahl_produkte]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.adapters.repository import SQLiteRepository
+from src.domain.product import Product
+
+
+def _products(count: int):
+    for i in range(count):
+        yield Product(id=f"P{i:06d}", name=f"Produkt {i}", description="Import", price=1.0 + i)
+
+
+def run(count: int = 5000) -> None:
+    """Produkte pro Sekunde für beide Varianten messen"""
+    with tempfile.TemporaryDirectory() as tmp:
+        repository = SQLiteRepository(str(Path(tmp) / "single.db"), pool_size=1)
+        start = time.perf_counter()
+        for product in _products(count):
+            repository.save_product(product)
+        single = count / (time.perf_counter() - start)
+        repository.close()
+
+        repository = SQLiteRepository(str(Path(tmp) / "bulk.db"), pool_size=1)
+        start = time.perf_counter()
+        repository.save_products(_products(count))
+        bulk = count / (time.perf_counter() - start)
+        repository.close()
+
+    print(f"save_product einzeln:  {single:>10.0f} Produkte/s")
+    print(f"save_products (Bulk):  {bulk:>10.0f} Produkte/s  ({bulk / single:.0f}x)")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,104 @@
+"""Benchmark: Speicher pro Objekt - Dataclass mit __dict__ vs. slots=True + from_storage
+
+Misst den Speicher, den eine geladene Bewegungshistorie belegt:
+    vorher:  @dataclass mit __dict__, Konstruktor mit datetime.now(), Texte je Zeile neu
+    nachher: Movement (slots=True) über from_storage, wiederkehrende Texte per intern()
+
+Ausführung:
+    python -m benchmarks.bench_memory [anzahl_bewegungen]
+"""
+
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+from src.adapters.repository import SQLiteRepository
+from src.domain.product import Product
+from src.domain.warehouse import Movement
+
+
+@dataclass
+class _DictMovement:
+    """Movement wie vor der Umstellung (ohne slots)"""
+
+    id: str
+    product_id: str
+    product_name: str
+    quantity_change: int
+    movement_type: str
+    reason: Optional[str] = None
+    timestamp: datetime = field(default_factory=datetime.now)
+    performed_by: str = "system"
+
+
+def _legacy_load(repository: SQLiteRepository) -> list:
+    """Bewegungen laden wie vor der Umstellung"""
+    with repository._connect() as conn:
+        rows = conn.execute("SELECT * FROM movements ORDER BY timestamp, rowid").fetchall()
+    movements = []
+    for row in rows:
+        mv = _DictMovement(
+            id=row["id"],
+            product_id=row["product_id"],
+            product_name=row["product_name"] or "",
+            quantity_change=int(row["quantity_change"]),
+            movement_type=row["movement_type"],
+            reason=row["reason"],
+            performed_by=row["performed_by"] or "system",
+        )
+        if row["timestamp"]:
+            mv.timestamp = datetime.fromisoformat(row["timestamp"])
+        movements.append(mv)
+    return movements
+
+
+def _measure(load) -> tuple:
+    """Belegten Speicher (nur das Ergebnis) und Laufzeit einer Ladefunktion messen"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = load()
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(result), size, elapsed
+
+
+def run(count: int = 100_000) -> None:
+    """Bytes pro Bewegung für beide Varianten ausgeben"""
+    with tempfile.TemporaryDirectory() as tmp:
+        repository = SQLiteRepository(str(Path(tmp) / "memory.db"), profile="throughput")
+        repository.save_products(
+            Product(id=f"P{i:03d}", name=f"Produkt {i}", description="", price=1.0) for i in range(50)
+        )
+        start = datetime(2026, 1, 1)
+        with repository.transaction():
+            for i in range(count):
+                repository.save_movement(
+                    Movement(
+                        id=f"M{i:07d}",
+                        product_id=f"P{i % 50:03d}",
+                        product_name=f"Produkt {i % 50}",
+                        quantity_change=1,
+                        movement_type="SOLD" if i % 3 else "IN",
+                        timestamp=start + timedelta(minutes=i),
+                    )
+                )
+
+        results = {
+            "vorher (dict, now())": _measure(lambda: _legacy_load(repository)),
+            "nachher (slots, intern)": _measure(repository.load_movements),
+        }
+        repository.close()
+
+    print(f"{'Variante':<26}{'Bytes/Bewegung':>16}{'gesamt MB':>12}{'Laden s':>10}")
+    for name, (loaded, size, elapsed) in results.items():
+        print(f"{name:<26}{size / loaded:>16.0f}{size / 1e6:>12.1f}{elapsed:>10.2f}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
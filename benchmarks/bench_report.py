@@ -0,0 +1,88 @@
+"""Benchmark: Report-B-Auswertung - Schleife über Movement-Objekte vs. NumPy über Bewegungsspalten
+
+Misst die Aggregation (Zusammenfassung + Tagesreihen), nicht das Laden:
+    vorher:  Schleife über Movement-Objekte (strftime pro Bewegung)
+    nachher: ReportB mit MovementColumns (bincount über Tages-Offsets)
+
+Die Objekt-Schleife läuft auf einer kleineren Menge und wird hochgerechnet.
+
+Ausführung:
+    python -m benchmarks.bench_report [anzahl_bewegungen]
+"""
+
+import sys
+import time
+from array import array
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+from src.domain.movement_columns import MovementColumns, to_epoch_us
+from src.domain.warehouse import Movement
+from src.reports.report_b import ReportB
+
+_TYPES = ["IN", "SOLD", "TRANSFER", "CORRECTION"]
+_START = datetime(2024, 1, 1)
+
+
+def _columns(count: int) -> MovementColumns:
+    """Synthetische Spalten: eine Bewegung alle 10 Sekunden, 500 Produkte"""
+    start_us = to_epoch_us(_START)
+    return MovementColumns(
+        timestamps=array("q", range(start_us, start_us + count * 10_000_000, 10_000_000)),
+        product_codes=array("i", (i % 500 for i in range(count))),
+        quantities=array("q", (5 if i % 4 == 0 else -1 for i in range(count))),
+        type_codes=array("h", (i % 4 for i in range(count))),
+        product_ids=[f"P{i:03d}" for i in range(500)],
+        movement_types=list(_TYPES),
+    )
+
+
+def _movements(count: int) -> list:
+    return [
+        Movement.from_storage(
+            f"M{i}", f"P{i % 500:03d}", "Produkt", 5 if i % 4 == 0 else -1, _TYPES[i % 4],
+            None, _START + timedelta(seconds=10 * i), "system",
+        )
+        for i in range(count)
+    ]
+
+
+def _legacy_summary(movements: list) -> dict:
+    """Zusammenfassung wie vor der Umstellung (eine Python-Schleife pro Kennzahl)"""
+    movement_types = Counter()
+    by_date = defaultdict(int)
+    quantities = defaultdict(int)
+    total_in = total_out = 0
+    for movement in movements:
+        movement_types[movement.movement_type] += 1
+        date_str = movement.timestamp.strftime("%Y-%m-%d")
+        by_date[date_str] += 1
+        quantities[date_str] += movement.quantity_change
+        if movement.quantity_change > 0:
+            total_in += movement.quantity_change
+        else:
+            total_out += abs(movement.quantity_change)
+    return {"by_type": dict(movement_types), "by_date": dict(sorted(by_date.items()))}
+
+
+def run(count: int = 5_000_000) -> None:
+    """Laufzeit der Aggregation für beide Varianten ausgeben"""
+    sample = min(count, 200_000)
+    movements = _movements(sample)
+    start = time.perf_counter()
+    _legacy_summary(movements)
+    legacy = (time.perf_counter() - start) * count / sample
+
+    columns = _columns(count)
+    report = ReportB(movements=[], products=[], columns=columns)
+    start = time.perf_counter()
+    report.get_movement_summary()
+    vectorized = time.perf_counter() - start
+
+    print(f"{count:,} Bewegungen")
+    print(f"{'vorher (Objekt-Schleife, hochgerechnet)':<42}{legacy:>8.2f} s")
+    print(f"{'nachher (NumPy über Spalten)':<42}{vectorized:>8.2f} s")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000)
@@ -0,0 +1,86 @@
+"""Benchmark: Durchläufe von Report B über Bewegungen und Produkte
+
+Zählt, wie oft generate_full_report die Bewegungen (neuer Iterator aus der
+Quelle) und die Produkte (products.values()) durchläuft, und misst die
+Laufzeit ohne Charts. Erwartet: je genau ein Durchlauf.
+
+Ausführung:
+    python -m benchmarks.bench_report_passes [anzahl_bewegungen]
+"""
+
+import sys
+import time
+from datetime import datetime, timedelta
+
+from src.domain.warehouse import Movement
+from src.reports.report_b import ReportB
+
+_TYPES = ["IN", "SOLD", "TO_SHOP", "CORRECTION"]
+
+
+class _CountingProducts(dict):
+    """Produkt-Dict, das jeden Durchlauf über values() zählt"""
+
+    passes = 0
+
+    def values(self):
+        self.passes += 1
+        return super().values()
+
+
+def count_passes(movements: list, products: list, charts: bool = True) -> tuple:
+    """
+    Vollständigen Report erzeugen und Durchläufe zählen
+
+    Returns:
+        (Durchläufe über Bewegungen, Durchläufe über Produkte, Laufzeit in s)
+    """
+    movement_passes = 0
+
+    def source():
+        nonlocal movement_passes
+        movement_passes += 1
+        return iter(movements)
+
+    report = ReportB(source, [])
+    report.products = _CountingProducts({p["id"]: p for p in products})
+
+    start = time.perf_counter()
+    if charts:
+        report.generate_full_report()
+    else:
+        report.get_movement_summary()
+        report.get_inventory_statistics()
+        report.get_category_statistics()
+        report.get_movement_details(limit=50)
+        # Nicht Teil des Reports, nutzt aber denselben Durchlauf
+        report.get_movements_by_product()
+    elapsed = time.perf_counter() - start
+    return movement_passes, report.products.passes, elapsed
+
+
+def run(count: int = 200_000) -> None:
+    """Durchläufe und Laufzeit ausgeben"""
+    start = datetime(2026, 1, 1)
+    movements = [
+        Movement.from_storage(
+            f"M{i}", f"P{i % 200:03d}", "Produkt", 5 if i % 4 == 0 else -1, _TYPES[i % 4],
+            None, start + timedelta(minutes=i), "system",
+        )
+        for i in range(count)
+    ]
+    products = [
+        {"id": f"P{i:03d}", "name": f"Produkt {i}", "category": f"K{i % 7}", "price": 1.5,
+         "warehouse_qty": 10, "shop_qty": 2, "available_total": 12, "is_low_stock": i % 5 == 0}
+        for i in range(200)
+    ]
+
+    movement_passes, product_passes, elapsed = count_passes(movements, products, charts=False)
+    print(f"{count:,} Bewegungen, {len(products)} Produkte")
+    print(f"Durchläufe Bewegungen: {movement_passes} (erwartet 1)")
+    print(f"Durchläufe Produkte:   {product_passes} (erwartet 1)")
+    print(f"Auswertung ohne Charts: {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,63 @@
+"""Benchmark: SQLiteRepository mit und ohne Connection-Pool bzw. PRAGMA-Profil
+
+Ausführung:
+    python -m benchmarks.bench_repository [anzahl_operationen]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.adapters.repository import SQLiteRepository
+from src.domain.product import Product
+from src.services import WarehouseService
+
+
+def _seed(repository: SQLiteRepository, count: int = 100) -> None:
+    """Testprodukte anlegen"""
+    for i in range(count):
+        repository.save_product(
+            Product(
+                id=f"P{i:04d}",
+                name=f"Produkt {i}",
+                description="Benchmark",
+                price=1.0 + i,
+                warehouse_qty=1_000_000,
+                shop_qty=0,
+            )
+        )
+
+
+def _ops_per_second(func, operations: int) -> float:
+    start = time.perf_counter()
+    for i in range(operations):
+        func(i)
+    return operations / (time.perf_counter() - start)
+
+
+def run(operations: int = 2000) -> None:
+    """Operationen pro Sekunde für verschiedene Pool-Größen und Profile messen"""
+    print(f"{'Modus':<28}{'load_product':>15}{'save_product':>15}{'transfer':>15}")
+    for pool_size, profile in ((0, "safe"), (4, "safe"), (4, "throughput")):
+        with tempfile.TemporaryDirectory() as tmp:
+            repository = SQLiteRepository(
+                str(Path(tmp) / "bench.db"), pool_size=pool_size, profile=profile
+            )
+            service = WarehouseService(repository)
+            _seed(repository)
+
+            product = repository.load_product("P0000")
+            load = _ops_per_second(lambda i: repository.load_product(f"P{i % 100:04d}"), operations)
+            save = _ops_per_second(lambda i: repository.save_product(product), operations)
+            transfer = _ops_per_second(
+                lambda i: service.transfer_to_shop(f"P{i % 100:04d}", 1), operations
+            )
+            repository.close()
+
+        label = ("ohne Pool" if pool_size == 0 else f"Pool ({pool_size})") + f", {profile}"
+        print(f"{label:<28}{load:>13.0f}/s{save:>13.0f}/s{transfer:>13.0f}/s")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
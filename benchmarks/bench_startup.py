@@ -0,0 +1,90 @@
+"""Benchmark: Startzeit von create_app (python -X importtime)
+
+Startet einen frischen Interpreter, der app importiert und create_app()
+aufruft, und wertet die Ausgabe von -X importtime aus:
+    - gesamte Importzeit von app
+    - Laufzeit von create_app() (Datenbank anlegen, Services, Routen)
+    - die teuersten Module
+    - ob matplotlib geladen wurde (soll erst beim ersten Chart passieren)
+
+Überschreitet die Startzeit (Import + create_app) das Budget oder wird
+matplotlib geladen, endet das Skript mit Exit-Code 1 (z.B. für CI).
+
+Ausführung:
+    python -m benchmarks.bench_startup [budget_ms]
+"""
+
+import re
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Startzeit (Import von app + create_app) in Millisekunden (ohne matplotlib gemessen: ~350 ms)
+STARTUP_BUDGET_MS = 600
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+_SCRIPT = """
+import sys
+import time
+from app import create_app
+start = time.perf_counter()
+create_app(db_path=sys.argv[1], pool_size=0)
+print((time.perf_counter() - start) * 1000, "matplotlib" in sys.modules)
+"""
+
+
+def measure() -> dict:
+    """
+    create_app in einem neuen Prozess ausführen
+
+    Returns:
+        Dict mit "total_ms" (Importzeit von app), "create_app_ms" (Laufzeit von
+        create_app), "modules" (Name -> kumulierte ms) und "matplotlib" (True,
+        wenn matplotlib geladen wurde)
+    """
+    root = Path(__file__).resolve().parent.parent
+    with tempfile.TemporaryDirectory() as tmp:
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", _SCRIPT, str(Path(tmp) / "startup.db")],
+            cwd=root,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            modules[match.group(4)] = int(match.group(2)) / 1000
+    create_app_ms, matplotlib = result.stdout.strip().splitlines()[-1].split()
+    return {
+        "total_ms": modules.get("app", 0.0),
+        "create_app_ms": float(create_app_ms),
+        "modules": modules,
+        "matplotlib": matplotlib == "True",
+    }
+
+
+def run(budget_ms: float = STARTUP_BUDGET_MS) -> bool:
+    """Startzeit ausgeben und gegen das Budget prüfen"""
+    startup = measure()
+    slowest = sorted(startup["modules"].items(), key=lambda item: item[1], reverse=True)
+
+    startup_ms = startup["total_ms"] + startup["create_app_ms"]
+    print(f"Importzeit app: {startup['total_ms']:.0f} ms")
+    print(f"create_app():   {startup['create_app_ms']:.0f} ms")
+    print(f"Startzeit:      {startup_ms:.0f} ms (Budget {budget_ms:.0f} ms)")
+    print(f"matplotlib geladen: {'ja' if startup['matplotlib'] else 'nein'}")
+    print("Teuerste Module (kumuliert):")
+    for name, ms in slowest[1:11]:
+        print(f"  {name:<40}{ms:>8.0f} ms")
+
+    return startup_ms <= budget_ms and not startup["matplotlib"]
+
+
+if __name__ == "__main__":
+    ok = run(float(sys.argv[1]) if len(sys.argv) > 1 else STARTUP_BUDGET_MS)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,90 @@
+"""Benchmark: Bewegungsprotokoll als Text - String-Verkettung vs. gestreamte Blöcke
+
+    vorher:  report += ... (wie vor der Umstellung), ganzer Bericht als ein String
+    nachher: ConsoleReportAdapter.write_movement_report in eine Datei,
+             Bewegungen per iter_movements aus SQLite
+
+Gemessen werden Laufzeit und Spitzenspeicher (tracemalloc).
+
+Ausführung:
+    python -m benchmarks.bench_text_report [anzahl_bewegungen]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from src.adapters.report import ConsoleReportAdapter
+from src.adapters.repository import SQLiteRepository
+from src.domain.product import Product
+from src.domain.warehouse import Movement
+
+
+def _legacy_report(movements) -> str:
+    """Bewegungsprotokoll wie vor der Umstellung"""
+    report = "=" * 80 + "\n"
+    report += "BEWEGUNGSPROTOKOLL\n"
+    report += "=" * 80 + "\n\n"
+    count = 0
+    for movement in movements:
+        count += 1
+        report += f"[{movement.timestamp.strftime('%Y-%m-%d %H:%M:%S')}]\n"
+        report += f"  Produkt: {movement.product_name} (ID: {movement.product_id})\n"
+        report += f"  Typ: {movement.movement_type}\n"
+        report += f"  Menge: {movement.quantity_change:+d}\n"
+        if movement.reason:
+            report += f"  Grund: {movement.reason}\n"
+        report += f"  Durchgeführt von: {movement.performed_by}\n\n"
+    report += "=" * 80 + "\n"
+    report += f"Gesamtbewegungen: {count}\n"
+    report += "=" * 80 + "\n"
+    return report
+
+
+def _measure(func) -> tuple:
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def run(count: int = 200_000) -> None:
+    """Laufzeit und Spitzenspeicher für beide Varianten ausgeben"""
+    with tempfile.TemporaryDirectory() as tmp:
+        repository = SQLiteRepository(str(Path(tmp) / "report.db"), profile="throughput")
+        repository.save_product(Product(id="P001", name="Ordner", description="", price=1.0))
+        start = datetime(2026, 1, 1)
+        with repository.transaction():
+            for i in range(count):
+                repository.save_movement(
+                    Movement(id=f"M{i:07d}", product_id="P001", product_name="Ordner", quantity_change=1,
+                             movement_type="IN", reason="Lieferung" if i % 5 == 0 else None,
+                             timestamp=start + timedelta(seconds=i))
+                )
+
+        def legacy():
+            with open(os.devnull, "w") as out:
+                out.write(_legacy_report(repository.iter_movements()))
+
+        def streamed():
+            with open(os.devnull, "w") as out:
+                ConsoleReportAdapter(repository=repository).write_movement_report(out)
+
+        results = {"vorher (report +=)": _measure(legacy), "nachher (gestreamt)": _measure(streamed)}
+        repository.close()
+
+    print(f"{count:,} Bewegungen")
+    print(f"{'Variante':<24}{'Laufzeit s':>12}{'Spitze MB':>12}")
+    for name, (elapsed, peak) in results.items():
+        print(f"{name:<24}{elapsed:>12.2f}{peak / 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
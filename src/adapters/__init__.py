@@ -1,6 +1,7 @@
 """Adapters - Konkrete Implementierungen der Ports"""
 
 from .repository import InMemoryRepository, RepositoryFactory
+from .caching_repository import CachingRepository
 from .report import ConsoleReportAdapter
 
-__all__ = ["InMemoryRepository", "RepositoryFactory", "ConsoleReportAdapter"]
+__all__ = ["InMemoryRepository", "RepositoryFactory", "CachingRepository", "ConsoleReportAdapter"]
@@ -0,0 +1,459 @@
+"""Caching-Repository - Produkt-Cache (Identity Map) vor einem anderen Repository"""
+
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from ..domain.movement_columns import MovementColumns
+from ..domain.product import Product
+from ..domain.warehouse import Movement
+from ..ports import RepositoryPort
+
+T = TypeVar("T")
+
+
+class CachingRepository(RepositoryPort):
+    """
+    Read-Through-Cache für Produkte vor einem beliebigen Repository.
+
+    Geladene Produkte landen in einer Identity Map (Produkt-ID -> Product):
+    wiederholte Zugriffe liefern dasselbe Objekt, ohne die Datenbank zu fragen.
+    Schreibzugriffe gehen immer an das innere Repository durch und
+    aktualisieren den Cache (Write-Through).
+
+    Jede Änderung erhöht einen Generationszähler. load_all_products und die
+    abgeleiteten Abfragen (Kennzahlen, Kategorien, Low-Stock) liefern ihr
+    Ergebnis aus dem Cache, solange sich die Generation nicht geändert hat.
+    Die gelieferten Dicts/Listen werden geteilt und dürfen nicht verändert
+    werden.
+
+    Mit max_size wird nur eine begrenzte Anzahl Produkte gehalten (LRU);
+    load_all_products geht dann immer an das innere Repository.
+
+    Schreiben weitere Prozesse in dieselbe Datenbank, muss vor jedem Request
+    refresh() aufgerufen werden: der Cache vergleicht dann den Änderungszähler
+    des inneren Repositorys und leert sich, wenn jemand anderes geschrieben hat.
+    Innerhalb einer Transaktion wird der Cache umgangen (gelesen wird der
+    Stand der Transaktion); Änderungen werden erst nach dem Commit übernommen.
+
+    Zu jedem gecachten Produkt merkt sich der Cache das updated_at des
+    geladenen Datensatzes. save_product weist ein gecachtes Objekt ab, wenn
+    der Datensatz inzwischen anderweitig geändert wurde (veraltete Bestände).
+
+    Zugriffe auf das innere Repository laufen außerhalb des Cache-Locks
+    (sonst könnte ein Thread, der auf die Schreibsperre der Datenbank wartet,
+    alle anderen blockieren).
+    """
+
+    def __init__(self, inner: RepositoryPort, max_size: Optional[int] = None):
+        """
+        Args:
+            inner: Repository, das die Daten tatsächlich speichert
+            max_size: Maximale Anzahl gecachter Produkte (None = ganzer Katalog)
+
+        Raises:
+            ValueError: wenn max_size kleiner als 1 ist
+        """
+        if max_size is not None and max_size < 1:
+            raise ValueError("max_size muss mindestens 1 sein")
+        self.inner = inner
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+        self._products: "OrderedDict[str, Product]" = OrderedDict()
+        # updated_at des Datensatzes, aus dem das gecachte Objekt stammt (Produkt-ID -> Zeitpunkt)
+        self._stored_at: Dict[str, datetime] = {}
+        # True, wenn _products den kompletten Katalog enthält (nur ohne max_size)
+        self._complete = False
+        self._generation = 0
+        self._all_snapshot: Optional[Dict[str, Product]] = None
+        self._all_generation = -1
+        # Ergebnisse abgeleiteter Abfragen, gültig für _memo_generation
+        self._memo: Dict[Hashable, object] = {}
+        self._memo_generation = -1
+        # Änderungszähler des inneren Repositorys beim letzten refresh()
+        self._data_version = inner.load_data_version()
+        # Pro Thread: Cache-Änderungen, die erst nach dem Commit gelten (None = keine Transaktion)
+        self._local = threading.local()
+
+    # ===== Cache-Verwaltung =====
+
+    def _remember(self, product: Product) -> None:
+        """Produkt in die Identity Map übernehmen (bei LRU ggf. ältestes verdrängen)"""
+        self._products[product.id] = product
+        self._products.move_to_end(product.id)
+        self._stored_at[product.id] = product.updated_at
+        if self.max_size is not None and len(self._products) > self.max_size:
+            evicted, _ = self._products.popitem(last=False)
+            del self._stored_at[evicted]
+
+    def _forget(self, product_id: str) -> None:
+        """Produkt aus der Identity Map entfernen"""
+        self._products.pop(product_id, None)
+        self._stored_at.pop(product_id, None)
+
+    def _changed(self) -> None:
+        self._generation += 1
+
+    def _in_transaction(self) -> bool:
+        return getattr(self._local, "pending", None) is not None
+
+    def _after_commit(self, action: Callable[[], None]) -> None:
+        """action sofort ausführen oder, in einer Transaktion, erst nach deren Commit"""
+        pending = getattr(self._local, "pending", None)
+        if pending is not None:
+            pending.append(action)
+            return
+        with self._lock:
+            action()
+
+    def _memoized(self, key: Hashable, load: Callable[[], T]) -> T:
+        """Ergebnis von load() bis zur nächsten Änderung zwischenspeichern"""
+        if self._in_transaction():
+            # Sieht ungespeicherte Änderungen der Transaktion: weder aus dem Cache noch hinein
+            return load()
+        with self._lock:
+            if self._memo_generation != self._generation:
+                self._memo.clear()
+                self._memo_generation = self._generation
+            elif key in self._memo:
+                return self._memo[key]
+            generation = self._generation
+
+        result = load()
+        with self._lock:
+            if generation == self._generation:
+                self._memo[key] = result
+        return result
+
+    def _identity(self, products: List[Product]) -> List[Product]:
+        """Bereits gecachte Objekte statt frisch geladener Kopien liefern"""
+        if self._in_transaction():
+            return products
+        with self._lock:
+            return [self._products.get(product.id, product) for product in products]
+
+    def _merge_stock(self, product: Product) -> None:
+        """Neue Bestände in das bereits ausgegebene Objekt übernehmen (Identity Map)"""
+        cached = self._products.get(product.id)
+        if cached is not None and cached is not product:
+            cached.warehouse_qty = product.warehouse_qty
+            cached.shop_qty = product.shop_qty
+            cached.updated_at = product.updated_at
+            product = cached
+        self._remember(product)
+        self._changed()
+
+    def invalidate(self) -> None:
+        """Cache komplett leeren (z.B. nach Änderungen an der Datenbank von außen)"""
+        with self._lock:
+            self._products.clear()
+            self._stored_at.clear()
+            self._complete = False
+            self._changed()
+
+    def refresh(self) -> bool:
+        """
+        Cache leeren, wenn sich die Datenbank seit dem letzten Aufruf geändert hat
+
+        Auch eigene Schreibzugriffe erhöhen den Zähler; der nächste Aufruf
+        leert den Cache dann einmal mehr als nötig.
+
+        Returns:
+            True, wenn der Cache geleert wurde
+        """
+        version = self.inner.load_data_version()
+        with self._lock:
+            if version is None or version == self._data_version:
+                return False
+            self._data_version = version
+            self.invalidate()
+            return True
+
+    def load_data_version(self) -> Optional[int]:
+        return self.inner.load_data_version()
+
+    def cache_info(self) -> Dict:
+        """Trefferstatistik und Füllstand des Caches"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._products),
+                "max_size": self.max_size,
+                "generation": self._generation,
+            }
+
+    # ===== Produkte =====
+
+    def save_product(self, product: Product) -> None:
+        """
+        Produkt speichern
+
+        Raises:
+            ValueError: wenn product aus dem Cache stammt und der Datensatz seit
+                dem Laden geändert wurde (z.B. Verkauf über einen anderen Prozess)
+        """
+        with self._lock:
+            cached = self._products.get(product.id) is product
+            stored_at = self._stored_at.get(product.id)
+
+        if not cached:
+            self.inner.save_product(product)
+        else:
+            # Prüfen und schreiben unter derselben Schreibsperre
+            with self.inner.transaction():
+                current = self.inner.load_product(product.id)
+                if current is not product and (
+                    current is None or current.updated_at != stored_at
+                ):
+                    with self._lock:
+                        self._forget(product.id)
+                        self._complete = False
+                        self._changed()
+                    raise ValueError(
+                        f"Produkt {product.id} wurde seit dem Laden geändert, bitte neu laden"
+                    )
+                self.inner.save_product(product)
+
+        with self._lock:
+            self._changed()
+
+        def remember() -> None:
+            self._remember(product)
+            self._changed()
+
+        self._after_commit(remember)
+
+    def save_products(self, products: Iterable[Product]) -> int:
+        saved: List[Product] = []
+
+        def collect():
+            for product in products:
+                saved.append(product)
+                yield product
+
+        count = self.inner.save_products(collect())
+        with self._lock:
+            # Nicht übernehmen: ein großer Import soll den LRU-Cache nicht verdrängen
+            for product in saved:
+                self._forget(product.id)
+            self._complete = False
+            self._changed()
+        return count
+
+    def load_product(self, product_id: str) -> Optional[Product]:
+        if self._in_transaction():
+            # In einer Transaktion immer den Stand der Transaktion lesen
+            return self.inner.load_product(product_id)
+        with self._lock:
+            product = self._products.get(product_id)
+            if product is not None:
+                self.hits += 1
+                self._products.move_to_end(product_id)
+                return product
+            self.misses += 1
+            if self._complete:
+                # Vollständiger Katalog im Cache: Produkt existiert nicht
+                return None
+            generation = self._generation
+
+        product = self.inner.load_product(product_id)
+        with self._lock:
+            # Nur übernehmen, wenn inzwischen nichts geschrieben wurde
+            if product is not None and generation == self._generation:
+                self._remember(product)
+        return product
+
+    def load_all_products(self) -> Dict[str, Product]:
+        if self._in_transaction():
+            return self.inner.load_all_products()
+        with self._lock:
+            complete = self._complete and self.max_size is None
+            if complete:
+                self.hits += 1
+            else:
+                self.misses += 1
+            generation = self._generation
+
+        if not complete:
+            loaded = self.inner.load_all_products()
+            with self._lock:
+                if self.max_size is not None or generation != self._generation:
+                    return loaded
+                # Bereits ausgegebene Objekte behalten (Identity Map)
+                self._products = OrderedDict(
+                    (product_id, self._products.get(product_id, product))
+                    for product_id, product in loaded.items()
+                )
+                self._stored_at = {
+                    product_id: self._stored_at.get(product_id, product.updated_at)
+                    for product_id, product in loaded.items()
+                }
+                self._complete = True
+                self._all_generation = -1
+
+        with self._lock:
+            if self._all_generation != self._generation:
+                self._all_snapshot = dict(self._products)
+                self._all_generation = self._generation
+            return self._all_snapshot
+
+    def search_products(self, query: str, limit: Optional[int] = None) -> List[Product]:
+        # Suche läuft über den Index des inneren Repositorys, Treffer über die Identity Map
+        return self._identity(self.inner.search_products(query, limit))
+
+    def load_products_page(
+        self,
+        limit: int = 50,
+        after_cursor: Optional[str] = None,
+        sort: str = "id",
+        descending: bool = False,
+        category: Optional[str] = None,
+        low_stock: bool = False,
+        query: Optional[str] = None,
+    ) -> List[Product]:
+        # Seiten gehen an die Keyset-Abfrage des inneren Repositorys, Treffer über die Identity Map
+        return self._identity(
+            self.inner.load_products_page(
+                limit, after_cursor, sort, descending, category, low_stock, query
+            )
+        )
+
+    def load_products_by_category(self, category: str) -> List[Product]:
+        return self._memoized(
+            ("category", category),
+            lambda: self._identity(self.inner.load_products_by_category(category)),
+        )
+
+    def load_categories(self) -> List[str]:
+        return self._memoized("categories", self.inner.load_categories)
+
+    def load_inventory_stats(self) -> Dict:
+        return self._memoized("stats", self.inner.load_inventory_stats)
+
+    def load_inventory_totals(self) -> Dict:
+        return self._memoized("totals", self.inner.load_inventory_totals)
+
+    def reconcile_inventory_totals(self) -> Dict:
+        result = self.inner.reconcile_inventory_totals()
+        if result["warehouse_drift"] or result["shop_drift"]:
+            # Nur bei Abweichung: sonst bleiben alle zwischengespeicherten Ergebnisse gültig
+            with self._lock:
+                self._changed()
+        return result
+
+    def load_low_stock_products(self, limit: Optional[int] = None) -> List[Product]:
+        return self._memoized(
+            ("low_stock", limit),
+            lambda: self._identity(self.inner.load_low_stock_products(limit)),
+        )
+
+    def count_low_stock_products(self) -> int:
+        return self._memoized("low_stock_count", self.inner.count_low_stock_products)
+
+    def delete_product(self, product_id: str) -> None:
+        self.inner.delete_product(product_id)
+        with self._lock:
+            self._forget(product_id)
+            self._changed()
+
+    # ===== Bewegungen (nicht gecacht) =====
+
+    def save_movement(self, movement: Movement) -> None:
+        self.inner.save_movement(movement)
+
+    def save_movements(self, movements: Iterable[Movement]) -> int:
+        return self.inner.save_movements(movements)
+
+    def load_movements(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        product_id: Optional[str] = None,
+        movement_type: Optional[str] = None,
+        limit: Optional[int] = None,
+        after_cursor: Optional[str] = None,
+        newest_first: bool = False,
+    ) -> List[Movement]:
+        return self.inner.load_movements(
+            since, until, product_id, movement_type, limit, after_cursor, newest_first
+        )
+
+    def iter_movements(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        product_id: Optional[str] = None,
+        movement_type: Optional[str] = None,
+        limit: Optional[int] = None,
+        after_cursor: Optional[str] = None,
+        newest_first: bool = False,
+    ) -> Iterator[Movement]:
+        return self.inner.iter_movements(
+            since, until, product_id, movement_type, limit, after_cursor, newest_first
+        )
+
+    def load_movement_columns(
+        self, since: Optional[datetime] = None, until: Optional[datetime] = None
+    ) -> MovementColumns:
+        return self.inner.load_movement_columns(since, until)
+
+    # ===== Transaktionen =====
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Transaktion des inneren Repositorys
+
+        Cache-Änderungen aus dem Block werden erst nach dem Commit übernommen;
+        nach einem Rollback wird der Cache geleert.
+        """
+        if self._in_transaction():
+            # Verschachtelt: Teil der äußeren Transaktion
+            with self.inner.transaction():
+                yield
+            return
+
+        self._local.pending = pending = []
+        try:
+            with self.inner.transaction():
+                yield
+        except BaseException:
+            self._local.pending = None
+            # Auch Lesezugriffe aus der Transaktion können veraltete Daten gecacht haben
+            self.invalidate()
+            raise
+        self._local.pending = None
+        with self._lock:
+            for action in pending:
+                action()
+
+    def adjust_stock(
+        self, product_id: str, warehouse_delta: int = 0, shop_delta: int = 0
+    ) -> Optional[Product]:
+        product = self.inner.adjust_stock(product_id, warehouse_delta, shop_delta)
+        if product is not None:
+            with self._lock:
+                self._changed()
+            self._after_commit(lambda: self._merge_stock(product))
+        return product
+
+    def adjust_stocks(self, deltas: Dict[str, Tuple[int, int]]) -> Optional[Dict[str, Product]]:
+        products = self.inner.adjust_stocks(deltas)
+        if products is not None:
+            with self._lock:
+                self._changed()
+
+            def merge() -> None:
+                for product in products.values():
+                    self._merge_stock(product)
+
+            self._after_commit(merge)
+        return products
+
+    def close(self) -> None:
+        self.inner.close()
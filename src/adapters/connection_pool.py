@@ -0,0 +1,130 @@
+"""Connection-Pool für SQLite - wiederverwendbare Datenbankverbindungen"""
+
+import queue
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional, Set, Tuple
+
+
+class SQLiteConnectionPool:
+    """
+    Begrenzter Pool von SQLite-Verbindungen.
+
+    Verbindungen werden erst bei Bedarf geöffnet (höchstens ``size`` Stück)
+    und nach Gebrauch wieder in den Pool gelegt, statt geschlossen zu werden.
+    Eine Verbindung, die länger als ``health_check_interval`` Sekunden
+    unbenutzt war, wird vor der Ausgabe mit ``SELECT 1`` geprüft und bei
+    einem Fehler durch eine neue ersetzt.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], sqlite3.Connection],
+        size: int = 5,
+        timeout: float = 30.0,
+        health_check_interval: float = 30.0,
+    ):
+        """
+        Args:
+            factory: Funktion, die eine neue, fertig konfigurierte Verbindung öffnet
+            size: Maximale Anzahl gleichzeitig offener Verbindungen
+            timeout: Wartezeit in Sekunden, wenn alle Verbindungen vergeben sind
+            health_check_interval: Leerlaufzeit in Sekunden, ab der geprüft wird
+        """
+        if size < 1:
+            raise ValueError("Pool-Größe muss mindestens 1 sein")
+        self.size = size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self._factory = factory
+        self._idle: "queue.LifoQueue[Tuple[sqlite3.Connection, float]]" = queue.LifoQueue()
+        self._connections: Set[sqlite3.Connection] = set()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def acquire(self) -> sqlite3.Connection:
+        """
+        Freie Verbindung ausleihen (oder eine neue öffnen)
+
+        Raises:
+            RuntimeError: wenn der Pool bereits geschlossen wurde
+            TimeoutError: wenn innerhalb von ``timeout`` keine Verbindung frei wird
+        """
+        if self._closed:
+            raise RuntimeError("Connection-Pool ist geschlossen")
+
+        try:
+            conn, released_at = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._open_if_below_limit()
+            if conn is not None:
+                return conn
+            try:
+                conn, released_at = self._idle.get(timeout=self.timeout)
+            except queue.Empty:
+                raise TimeoutError(
+                    f"Keine freie Datenbankverbindung nach {self.timeout:.1f}s"
+                ) from None
+
+        if time.monotonic() - released_at >= self.health_check_interval and not self._is_healthy(conn):
+            self._discard(conn)
+            return self._open()
+        return conn
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Verbindung in den Pool zurücklegen"""
+        if self._closed:
+            self._discard(conn)
+            return
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put((conn, time.monotonic()))
+
+    def close(self) -> None:
+        """Alle Verbindungen schließen; ausgeliehene werden bei der Rückgabe geschlossen"""
+        self._closed = True
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+    @property
+    def open_connections(self) -> int:
+        """Anzahl aktuell offener Verbindungen (ausgeliehen + frei)"""
+        with self._lock:
+            return len(self._connections)
+
+    # --- intern ---
+
+    def _open_if_below_limit(self) -> Optional[sqlite3.Connection]:
+        with self._lock:
+            if len(self._connections) >= self.size:
+                return None
+            conn = self._factory()
+            self._connections.add(conn)
+        return conn
+
+    def _open(self) -> sqlite3.Connection:
+        conn = self._factory()
+        with self._lock:
+            self._connections.add(conn)
+        return conn
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            self._connections.discard(conn)
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    @staticmethod
+    def _is_healthy(conn: sqlite3.Connection) -> bool:
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
@@ -0,0 +1,103 @@
+"""Export - Bewegungen und Berichte als gestreamte Textblöcke (CSV, JSON Lines, gzip)"""
+
+import csv
+import io
+import json
+import zlib
+from typing import Iterable, Iterator, List
+
+from ..domain.warehouse import Movement
+
+# Zielgröße der gelieferten Textblöcke (Zeichen) beim Streamen
+CHUNK_SIZE = 64 * 1024
+
+MOVEMENT_FIELDS = [
+    "id",
+    "timestamp",
+    "product_id",
+    "product_name",
+    "quantity_change",
+    "movement_type",
+    "reason",
+    "performed_by",
+]
+
+
+def chunked(parts: Iterable[str], size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Kleine Textstücke zu Blöcken von etwa size Zeichen zusammenfassen"""
+    buffer: List[str] = []
+    length = 0
+    for part in parts:
+        buffer.append(part)
+        length += len(part)
+        if length >= size:
+            yield "".join(buffer)
+            buffer.clear()
+            length = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def _movement_row(movement: Movement) -> list:
+    return [
+        movement.id,
+        movement.timestamp.isoformat(),
+        movement.product_id,
+        movement.product_name,
+        movement.quantity_change,
+        movement.movement_type,
+        movement.reason or "",
+        movement.performed_by,
+    ]
+
+
+def iter_movements_csv(movements: Iterable[Movement], size: int = CHUNK_SIZE) -> Iterator[str]:
+    """
+    Bewegungen als CSV (mit Kopfzeile), in Blöcken von etwa size Zeichen
+
+    Args:
+        movements: Bewegungen, z.B. repository.iter_movements()
+        size: Zielgröße eines Blocks
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(MOVEMENT_FIELDS)
+    for movement in movements:
+        writer.writerow(_movement_row(movement))
+        if buffer.tell() >= size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def iter_movements_jsonl(movements: Iterable[Movement], size: int = CHUNK_SIZE) -> Iterator[str]:
+    """
+    Bewegungen als JSON Lines (ein Objekt pro Zeile), in Blöcken von etwa size Zeichen
+
+    Args:
+        movements: Bewegungen, z.B. repository.iter_movements()
+        size: Zielgröße eines Blocks
+    """
+    lines = (
+        json.dumps(dict(zip(MOVEMENT_FIELDS, _movement_row(movement))), ensure_ascii=False) + "\n"
+        for movement in movements
+    )
+    return chunked(lines, size)
+
+
+def gzip_chunks(chunks: Iterable[str], level: int = 6) -> Iterator[bytes]:
+    """
+    Textblöcke fortlaufend als gzip-Datenstrom komprimieren (UTF-8)
+
+    Args:
+        chunks: Textblöcke
+        level: Kompressionsstufe (1 = schnell, 9 = klein)
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
@@ -1,16 +1,144 @@
 """Report Adapter - Report-Generierung"""
 
-from typing import Dict
+from itertools import chain
+from typing import Dict, Iterable, Iterator, Optional, Tuple
 
-from ..ports import ReportPort
+from ..domain.product import Product
+from ..ports import ReportPort, RepositoryPort
+from .export import chunked
+
+# Produkte pro Seite, wenn der Lagerbestand aus dem Repository gelesen wird
+PRODUCT_PAGE_SIZE = 500
 
 
 class ConsoleReportAdapter(ReportPort):
     """Report-Adapter für Konsolenausgabe"""
 
-    def __init__(self, products: Dict = None, movements: list = None):
+    def __init__(
+        self,
+        products: Dict = None,
+        movements: list = None,
+        repository: Optional[RepositoryPort] = None,
+    ):
+        """
+        Args:
+            products: Produkte (Dict ID -> Product)
+            movements: Liste von Bewegungen
+            repository: Wenn gesetzt, wird das Bewegungsprotokoll per
+                iter_movements direkt aus dem Repository gelesen, ohne
+                products auch der Lagerbestand (seitenweise per
+                load_products_page, nach ID sortiert)
+        """
         self.products = products or {}
         self.movements = movements or []
+        self.repository = repository
+
+    def _iter_movements(self) -> Iterable:
+        """Bewegungen chronologisch - aus dem Repository gestreamt oder aus der Liste"""
+        if self.repository is not None:
+            return self.repository.iter_movements()
+        return sorted(self.movements, key=lambda m: m.timestamp)
+
+    def _iter_products(self) -> Iterable[Tuple[str, Product]]:
+        """(ID, Produkt)-Paare - seitenweise aus dem Repository oder aus dem Dict"""
+        if self.products or self.repository is None:
+            return self.products.items()
+        return self._iter_product_pages()
+
+    def _iter_product_pages(self) -> Iterator[Tuple[str, Product]]:
+        """Katalog per Keyset-Cursor durchlaufen; im Speicher ist höchstens eine Seite"""
+        cursor = None
+        while True:
+            page = self.repository.load_products_page(
+                limit=PRODUCT_PAGE_SIZE, after_cursor=cursor
+            )
+            for product in page:
+                yield product.id, product
+            if len(page) < PRODUCT_PAGE_SIZE:
+                return
+            cursor = self.repository.product_cursor(page[-1])
+
+    def iter_inventory_report(self) -> Iterator[str]:
+        """
+        Lagerbestandsbericht als Folge von Textstücken
+
+        Mit repository werden die Produkte seitenweise gelesen; der
+        Speicherbedarf bleibt unabhängig von der Größe des Katalogs.
+
+        Returns:
+            Iterator über Teile des Berichts (zusammengefügt = generate_inventory_report)
+        """
+        products = iter(self._iter_products())
+        first = next(products, None)
+        if first is None:
+            yield "Lager ist leer.\n"
+            return
+
+        def lines() -> Iterator[str]:
+            yield "=" * 60 + "\n"
+            yield "LAGERBESTANDSBERICHT\n"
+            yield "=" * 60 + "\n\n"
+
+            total_value = 0
+            for product_id, product in chain((first,), products):
+                value = product.get_total_value()
+                total_value += value
+                yield (
+                    f"ID: {product_id}\n"
+                    f"  Name: {product.name}\n"
+                    f"  Kategorie: {product.category}\n"
+                    f"  Lagerbestand: {product.warehouse_qty}\n"
+                    f"  Shopbestand: {product.shop_qty}\n"
+                    f"  Gesamtbestand: {product.get_total_qty()}\n"
+                    f"  Preis: {product.price:.2f} €\n"
+                    f"  Gesamtwert: {value:.2f} €\n\n"
+                )
+
+            yield "-" * 60 + "\n"
+            yield f"Gesamtwert Lager: {total_value:.2f} €\n"
+            yield "=" * 60 + "\n"
+
+        yield from chunked(lines())
+
+    def iter_movement_report(self) -> Iterator[str]:
+        """
+        Bewegungsprotokoll als Folge von Textstücken
+
+        Bewegungen werden einzeln gelesen und formatiert; mit repository
+        bleibt der Speicherbedarf unabhängig von der Länge des Protokolls.
+
+        Returns:
+            Iterator über Teile des Berichts (zusammengefügt = generate_movement_report)
+        """
+        movements = iter(self._iter_movements())
+        first = next(movements, None)
+        if first is None:
+            yield "Keine Lagerbewegungen vorhanden.\n"
+            return
+
+        def lines() -> Iterator[str]:
+            yield "=" * 80 + "\n"
+            yield "BEWEGUNGSPROTOKOLL\n"
+            yield "=" * 80 + "\n\n"
+
+            count = 0
+            for movement in chain((first,), movements):
+                count += 1
+                reason = f"  Grund: {movement.reason}\n" if movement.reason else ""
+                yield (
+                    f"[{movement.timestamp.strftime('%Y-%m-%d %H:%M:%S')}]\n"
+                    f"  Produkt: {movement.product_name} (ID: {movement.product_id})\n"
+                    f"  Typ: {movement.movement_type}\n"
+                    f"  Menge: {movement.quantity_change:+d}\n"
+                    f"{reason}"
+                    f"  Durchgeführt von: {movement.performed_by}\n\n"
+                )
+
+            yield "=" * 80 + "\n"
+            yield f"Gesamtbewegungen: {count}\n"
+            yield "=" * 80 + "\n"
+
+        yield from chunked(lines())
 
     def generate_inventory_report(self) -> str:
         """
@@ -19,31 +147,7 @@ class ConsoleReportAdapter(ReportPort):
         Returns:
             Formatierter Bericht
         """
-        if not self.products:
-            return "Lager ist leer.\n"
-
-        report = "=" * 60 + "\n"
-        report += "LAGERBESTANDSBERICHT\n"
-        report += "=" * 60 + "\n\n"
-
-        total_value = 0
-        for product_id, product in self.products.items():
-            value = product.get_total_value()
-            total_value += value
-            report += f"ID: {product_id}\n"
-            report += f"  Name: {product.name}\n"
-            report += f"  Kategorie: {product.category}\n"
-            report += f"  Lagerbestand: {product.warehouse_qty}\n"
-            report += f"  Shopbestand: {product.shop_qty}\n"
-            report += f"  Gesamtbestand: {product.get_total_qty()}\n"
-            report += f"  Preis: {product.price:.2f} €\n"
-            report += f"  Gesamtwert: {value:.2f} €\n\n"
-
-        report += "-" * 60 + "\n"
-        report += f"Gesamtwert Lager: {total_value:.2f} €\n"
-        report += "=" * 60 + "\n"
-
-        return report
+        return "".join(self.iter_inventory_report())
 
     def generate_movement_report(self) -> str:
         """
@@ -52,24 +156,5 @@ class ConsoleReportAdapter(ReportPort):
         Returns:
             Formatierter Bericht
         """
-        if not self.movements:
-            return "Keine Lagerbewegungen vorhanden.\n"
-
-        report = "=" * 80 + "\n"
-        report += "BEWEGUNGSPROTOKOLL\n"
-        report += "=" * 80 + "\n\n"
-
-        for movement in sorted(self.movements, key=lambda m: m.timestamp):
-            report += f"[{movement.timestamp.strftime('%Y-%m-%d %H:%M:%S')}]\n"
-            report += f"  Produkt: {movement.product_name} (ID: {movement.product_id})\n"
-            report += f"  Typ: {movement.movement_type}\n"
-            report += f"  Menge: {movement.quantity_change:+d}\n"
-            if movement.reason:
-                report += f"  Grund: {movement.reason}\n"
-            report += f"  Durchgeführt von: {movement.performed_by}\n\n"
-
-        report += "=" * 80 + "\n"
-        report += f"Gesamtbewegungen: {len(self.movements)}\n"
-        report += "=" * 80 + "\n"
-
-        return report
+        return "".join(self.iter_movement_report())
+
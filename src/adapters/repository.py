@@ -1,13 +1,198 @@
 """Repository Adapter - In-Memory und persistente Implementierungen"""
 
+import heapq
 import sqlite3
+import threading
+from bisect import bisect_left, bisect_right, insort_right
+from contextlib import contextmanager
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Optional
+from sys import intern
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
+from ..domain.movement_columns import MovementColumns
 from ..domain.product import Product
 from ..domain.warehouse import Movement
-from ..ports import RepositoryPort
+from ..ports import PRODUCT_SORT_FIELDS, RepositoryPort
+from .connection_pool import SQLiteConnectionPool
+from .search_index import SEARCH_FIELD_WEIGHTS, TrigramIndex
+from .sqlite_profile import SQLiteProfile, resolve_profile
+
+
+_INSERT_MOVEMENT_SQL = """
+    INSERT INTO movements (
+        id, product_id, product_name, quantity_change, movement_type, reason, timestamp, performed_by
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Größtmögliche rowid (Platzhalter für eine nicht vorhandene Cursor-Bewegung)
+_MAX_ROWID = 2**63 - 1
+
+# Höchstzahl gebundener Parameter pro IN-Liste (SQLite-Grenze ältere Versionen: 999)
+_IN_CHUNK = 500
+
+_UPSERT_PRODUCT_SQL = """
+    INSERT INTO products (
+        id, name, description, price, warehouse_qty, shop_qty, sku, category, notes, created_at, updated_at, min_stock_level
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        name=excluded.name,
+        description=excluded.description,
+        price=excluded.price,
+        warehouse_qty=excluded.warehouse_qty,
+        shop_qty=excluded.shop_qty,
+        sku=excluded.sku,
+        category=excluded.category,
+        notes=excluded.notes,
+        created_at=excluded.created_at,
+        updated_at=excluded.updated_at,
+        min_stock_level=excluded.min_stock_level
+"""
+
+# Sekundärindizes (Name -> Definition); werden in _init_db angelegt, falls sie fehlen
+_SCHEMA_INDEXES = {
+    # rowid ist implizit letzte Indexspalte (Sortierung timestamp, rowid ohne Extra-Schritt)
+    "idx_movements_timestamp": "movements(timestamp)",
+    "idx_movements_product_timestamp": "movements(product_id, timestamp)",
+    "idx_movements_type": "movements(movement_type, timestamp)",
+    "idx_products_category": "products(category)",
+    "idx_products_sku": "products(sku)",
+    # Keyset-Pagination nach Name bzw. Preis (load_products_page)
+    "idx_products_name": "products(name, id)",
+    "idx_products_price": "products(price, id)",
+    # Partieller Index: enthält nur Produkte unter Mindestbestand
+    "idx_products_low_stock": "products(warehouse_qty) WHERE warehouse_qty < min_stock_level",
+}
+
+# Laufende Summen der Bestandswerte: genau eine Zeile (id = 1), von Triggern fortgeschrieben
+_TOTALS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS inventory_totals (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        warehouse_value REAL NOT NULL,
+        shop_value REAL NOT NULL
+    )
+"""
+
+_TOTALS_TRIGGERS = {
+    "inventory_totals_insert": """
+        AFTER INSERT ON products BEGIN
+            UPDATE inventory_totals SET
+                warehouse_value = warehouse_value + new.price * new.warehouse_qty,
+                shop_value = shop_value + new.price * new.shop_qty
+            WHERE id = 1;
+        END
+    """,
+    "inventory_totals_delete": """
+        AFTER DELETE ON products BEGIN
+            UPDATE inventory_totals SET
+                warehouse_value = warehouse_value - old.price * old.warehouse_qty,
+                shop_value = shop_value - old.price * old.shop_qty
+            WHERE id = 1;
+        END
+    """,
+    # Nur bei Änderung von Preis oder Beständen (auch beim Upsert über ON CONFLICT)
+    "inventory_totals_update": """
+        AFTER UPDATE OF price, warehouse_qty, shop_qty ON products BEGIN
+            UPDATE inventory_totals SET
+                warehouse_value = warehouse_value + new.price * new.warehouse_qty
+                    - old.price * old.warehouse_qty,
+                shop_value = shop_value + new.price * new.shop_qty - old.price * old.shop_qty
+            WHERE id = 1;
+        END
+    """,
+}
+
+# Änderungszähler für Produkte (eine Zeile), erkennt auch Schreibzugriffe anderer Prozesse
+_DATA_VERSION_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS data_version (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        version INTEGER NOT NULL
+    )
+"""
+
+_DATA_VERSION_TRIGGERS = {
+    f"data_version_{event.lower()}": f"""
+        AFTER {event} ON products BEGIN
+            UPDATE data_version SET version = version + 1 WHERE id = 1;
+        END
+    """
+    for event in ("INSERT", "UPDATE", "DELETE")
+}
+
+_RECOMPUTE_TOTALS_SQL = """
+    SELECT TOTAL(price * warehouse_qty), TOTAL(price * shop_qty) FROM products
+"""
+
+# Volltextindex für die Produktsuche: Trigramme finden jeden Teilstring ab 3 Zeichen.
+# External Content: der Index speichert nur Trigramme, Texte bleiben in products.
+_SEARCH_TABLE_SQL = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+        name, sku, description,
+        content='products', content_rowid='rowid', tokenize='trigram'
+    )
+"""
+
+# Trigger halten den Index bei jedem INSERT/UPDATE/DELETE auf products synchron
+_SEARCH_TRIGGERS = {
+    "products_fts_insert": """
+        AFTER INSERT ON products BEGIN
+            INSERT INTO products_fts(rowid, name, sku, description)
+            VALUES (new.rowid, new.name, new.sku, new.description);
+        END
+    """,
+    "products_fts_delete": """
+        AFTER DELETE ON products BEGIN
+            INSERT INTO products_fts(products_fts, rowid, name, sku, description)
+            VALUES ('delete', old.rowid, old.name, old.sku, old.description);
+        END
+    """,
+    # Nur bei Änderung der Suchfelder (Bestandsänderungen lassen den Index in Ruhe)
+    "products_fts_update": """
+        AFTER UPDATE OF name, sku, description ON products BEGIN
+            INSERT INTO products_fts(products_fts, rowid, name, sku, description)
+            VALUES ('delete', old.rowid, old.name, old.sku, old.description);
+            INSERT INTO products_fts(rowid, name, sku, description)
+            VALUES (new.rowid, new.name, new.sku, new.description);
+        END
+    """,
+}
+
+
+def _timestamp(movement: Movement) -> datetime:
+    return movement.timestamp
+
+
+def _check_sort(sort: str) -> None:
+    if sort not in PRODUCT_SORT_FIELDS:
+        raise ValueError(f"Unbekanntes Sortierfeld: {sort}")
+
+
+def _like_pattern(needle: str) -> str:
+    """Suchtext als LIKE-Muster (Platzhalterzeichen maskiert, Escape-Zeichen \\)"""
+    escaped = needle.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _fts_phrase(needle: str) -> str:
+    """Suchtext als FTS5-Phrase: Trigramme müssen direkt aufeinander folgen"""
+    return '"' + needle.replace('"', '""') + '"'
+
+
+def _empty_inventory_stats() -> Dict:
+    """Kennzahlen eines leeren Sortiments (Format von load_inventory_stats)"""
+    return {
+        "total_products": 0,
+        "total_warehouse_value": 0.0,
+        "total_shop_value": 0.0,
+        "warehouse_product_count": 0,
+        "shop_product_count": 0,
+        "low_stock_count": 0,
+        "categories": {},
+        "most_valuable_product_id": None,
+    }
 
 
 class InMemoryRepository(RepositoryPort):
@@ -16,10 +201,103 @@ class InMemoryRepository(RepositoryPort):
     def __init__(self):
         self.products: Dict[str, Product] = {}
         self.movements: List[Movement] = []
+        # Dieselben Bewegungen spaltenweise, gleiche Reihenfolge wie self.movements
+        self._columns = MovementColumns()
+        self._search_index = TrigramIndex()
+        # Kategorie -> Produkt-IDs und Produkt-ID -> Kategorie
+        self._category_index: Dict[str, Set[str]] = {}
+        self._product_categories: Dict[str, str] = {}
+        # Laufende Nummer beim ersten Speichern (Reihenfolge wie rowid bei SQLite)
+        self._insert_order: Dict[str, int] = {}
+        self._next_insert = 0
+        # Produkte unter Mindestbestand, sortiert nach (warehouse_qty, Einfügereihenfolge, ID)
+        self._low_stock: List[Tuple[int, int, str]] = []
+        self._low_stock_keys: Dict[str, Tuple[int, int, str]] = {}
+        # Laufende Summen der Bestandswerte und Beitrag jedes Produkts (Lager, Shop)
+        self._warehouse_value = 0.0
+        self._shop_value = 0.0
+        self._values: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.RLock()
+        # Rückgängig-Aktionen der laufenden Transaktion (None = keine Transaktion)
+        self._undo_log: Optional[List[Callable[[], None]]] = None
+
+    def _record_undo(self, undo: Callable[[], None]) -> None:
+        if self._undo_log is not None:
+            self._undo_log.append(undo)
+
+    def _index_product(self, product: Product) -> None:
+        """Such- und Kategorieindex für ein gespeichertes Produkt aktualisieren"""
+        self._search_index.add(product)
+        if product.id not in self._insert_order:
+            self._insert_order[product.id] = self._next_insert
+            self._next_insert += 1
+        if self._product_categories.get(product.id) != product.category:
+            self._unindex_category(product.id)
+            self._product_categories[product.id] = product.category
+            self._category_index.setdefault(product.category, set()).add(product.id)
+        self._update_low_stock(product)
+        self._update_value(product)
+
+    def _unindex_product(self, product_id: str) -> None:
+        self._search_index.remove(product_id)
+        self._unindex_category(product_id)
+        self._drop_low_stock(product_id)
+        self._drop_value(product_id)
+        self._insert_order.pop(product_id, None)
+
+    def _update_low_stock(self, product: Product) -> None:
+        """Eintrag in der Low-Stock-Liste an den aktuellen Lagerbestand anpassen"""
+        self._drop_low_stock(product.id)
+        if product.is_low_stock():
+            key = (product.warehouse_qty, self._insert_order[product.id], product.id)
+            insort_right(self._low_stock, key)
+            self._low_stock_keys[product.id] = key
+
+    def _drop_low_stock(self, product_id: str) -> None:
+        key = self._low_stock_keys.pop(product_id, None)
+        if key is not None:
+            del self._low_stock[bisect_left(self._low_stock, key)]
+
+    def _update_value(self, product: Product) -> None:
+        """Laufende Summen um die Wertänderung des Produkts fortschreiben"""
+        # Alter Beitrag aus _values: das Produktobjekt kann bereits verändert sein
+        self._drop_value(product.id)
+        value = (product.price * product.warehouse_qty, product.price * product.shop_qty)
+        self._values[product.id] = value
+        self._warehouse_value += value[0]
+        self._shop_value += value[1]
+
+    def _drop_value(self, product_id: str) -> None:
+        value = self._values.pop(product_id, None)
+        if value is not None:
+            self._warehouse_value -= value[0]
+            self._shop_value -= value[1]
+
+    def _unindex_category(self, product_id: str) -> None:
+        category = self._product_categories.pop(product_id, None)
+        if category is None:
+            return
+        ids = self._category_index[category]
+        ids.discard(product_id)
+        if not ids:
+            del self._category_index[category]
 
     def save_product(self, product: Product) -> None:
         """Produkt im Memory speichern"""
-        self.products[product.id] = product
+        with self._lock:
+            previous = self.products.get(product.id)
+            self.products[product.id] = product
+            self._index_product(product)
+            self._record_undo(lambda: self._restore_product(product.id, previous))
+
+    def save_products(self, products: Iterable[Product]) -> int:
+        """Mehrere Produkte speichern; bei einem Fehler wird nichts übernommen"""
+        count = 0
+        with self.transaction():
+            for product in products:
+                self.save_product(product)
+                count += 1
+        return count
 
     def load_product(self, product_id: str) -> Optional[Product]:
         """Produkt aus Memory laden"""
@@ -29,36 +307,397 @@ class InMemoryRepository(RepositoryPort):
         """Alle Produkte aus Memory laden"""
         return self.products.copy()
 
+    def load_products_by_category(self, category: str) -> List[Product]:
+        """Produkte einer Kategorie über den Kategorieindex"""
+        with self._lock:
+            ids = sorted(self._category_index.get(category, ()), key=self._insert_order.__getitem__)
+            return [self.products[pid] for pid in ids]
+
+    def load_categories(self) -> List[str]:
+        """Kategorien direkt aus dem Kategorieindex"""
+        with self._lock:
+            return sorted(category for category in self._category_index if category)
+
+    def search_products(self, query: str, limit: Optional[int] = None) -> List[Product]:
+        """Produktsuche über den Trigramm-Index"""
+        with self._lock:
+            return [self.products[pid] for pid in self._search_index.search(query, limit)]
+
+    def load_products_page(
+        self,
+        limit: int = 50,
+        after_cursor: Optional[str] = None,
+        sort: str = "id",
+        descending: bool = False,
+        category: Optional[str] = None,
+        low_stock: bool = False,
+        query: Optional[str] = None,
+    ) -> List[Product]:
+        """Gefilterte Produkte nach dem Cursor; sortiert werden nur die limit kleinsten"""
+        _check_sort(sort)
+        after = None if after_cursor is None else self.parse_product_cursor(after_cursor, sort)
+
+        def key(product: Product) -> tuple:
+            return getattr(product, sort), product.id
+
+        with self._lock:
+            # Kleinste Kandidatenmenge aus Suchindex bzw. Kategorieindex
+            if query and query.strip():
+                ids = self._search_index.search(query)
+                if category is not None:
+                    ids = [pid for pid in ids if self._product_categories.get(pid) == category]
+            elif category is not None:
+                ids = self._category_index.get(category, ())
+            else:
+                ids = None
+            if ids is None:
+                candidates = self.products.values()
+            else:
+                candidates = (self.products[pid] for pid in ids)
+            if low_stock:
+                candidates = (p for p in candidates if p.id in self._low_stock_keys)
+            if after is not None:
+                if descending:
+                    candidates = (p for p in candidates if key(p) < after)
+                else:
+                    candidates = (p for p in candidates if key(p) > after)
+            pick = heapq.nlargest if descending else heapq.nsmallest
+            return pick(limit, candidates, key=key)
+
+    def load_inventory_stats(self) -> Dict:
+        """Kennzahlen in einem Durchlauf über die Produkte (ohne Kopie)"""
+        stats = _empty_inventory_stats()
+        categories: Dict[str, int] = {}
+        max_value = None
+        for product in self.products.values():
+            stats["total_products"] += 1
+            stats["total_warehouse_value"] += product.price * product.warehouse_qty
+            stats["total_shop_value"] += product.price * product.shop_qty
+            stats["warehouse_product_count"] += product.warehouse_qty > 0
+            stats["shop_product_count"] += product.shop_qty > 0
+            stats["low_stock_count"] += product.is_low_stock()
+            if product.category:
+                categories[product.category] = categories.get(product.category, 0) + 1
+            value = product.get_total_value()
+            if max_value is None or value > max_value:
+                max_value = value
+                stats["most_valuable_product_id"] = product.id
+        stats["categories"] = categories
+        return stats
+
+    def load_inventory_totals(self) -> Dict:
+        """Laufende Summen der Bestandswerte"""
+        with self._lock:
+            return {
+                "total_warehouse_value": self._warehouse_value,
+                "total_shop_value": self._shop_value,
+            }
+
+    def reconcile_inventory_totals(self) -> Dict:
+        """Bestandswerte aus den Produkten neu berechnen und die laufenden Summen zurücksetzen"""
+        with self._lock:
+            self._values = {
+                product.id: (
+                    product.price * product.warehouse_qty,
+                    product.price * product.shop_qty,
+                )
+                for product in self.products.values()
+            }
+            warehouse_value = sum(value[0] for value in self._values.values())
+            shop_value = sum(value[1] for value in self._values.values())
+            result = {
+                "total_warehouse_value": warehouse_value,
+                "total_shop_value": shop_value,
+                "warehouse_drift": self._warehouse_value - warehouse_value,
+                "shop_drift": self._shop_value - shop_value,
+            }
+            self._warehouse_value = warehouse_value
+            self._shop_value = shop_value
+            return result
+
+    def load_low_stock_products(self, limit: Optional[int] = None) -> List[Product]:
+        """Produkte unter Mindestbestand aus der (laufend sortierten) Low-Stock-Liste"""
+        with self._lock:
+            keys = self._low_stock if limit is None else self._low_stock[:limit]
+            return [self.products[product_id] for _, _, product_id in keys]
+
+    def count_low_stock_products(self) -> int:
+        """Anzahl Produkte unter Mindestbestand (Länge der Low-Stock-Liste)"""
+        return len(self._low_stock)
+
     def delete_product(self, product_id: str) -> None:
         """Produkt aus Memory löschen"""
-        if product_id in self.products:
-            del self.products[product_id]
+        with self._lock:
+            if product_id in self.products:
+                previous = self.products.pop(product_id)
+                self._unindex_product(product_id)
+                self._record_undo(lambda: self._restore_product(product_id, previous))
 
     def save_movement(self, movement: Movement) -> None:
         """Bewegung im Memory speichern"""
-        self.movements.append(movement)
+        with self._lock:
+            # Liste bleibt nach Zeitstempel sortiert (Normalfall: neueste Bewegung hinten anfügen)
+            if self.movements and movement.timestamp < self.movements[-1].timestamp:
+                index = bisect_right(self.movements, movement.timestamp, key=_timestamp)
+                self.movements.insert(index, movement)
+                self._columns.insert(index, movement)
+            else:
+                self.movements.append(movement)
+                self._columns.append(movement)
+            self._record_undo(lambda: self._remove_movement(movement))
+
+    def save_movements(self, movements: Iterable[Movement]) -> int:
+        """Mehrere Bewegungen speichern; bei einem Fehler wird nichts übernommen"""
+        count = 0
+        with self.transaction():
+            for movement in movements:
+                self.save_movement(movement)
+                count += 1
+        return count
 
-    def load_movements(self) -> List[Movement]:
-        """Alle Bewegungen aus Memory laden"""
-        return self.movements.copy()
+    def _remove_movement(self, movement: Movement) -> None:
+        low = bisect_left(self.movements, movement.timestamp, key=_timestamp)
+        index = next(i for i in range(low, len(self.movements)) if self.movements[i] is movement)
+        del self.movements[index]
+        self._columns.delete(index)
+
+    def load_movement_columns(
+        self, since: Optional[datetime] = None, until: Optional[datetime] = None
+    ) -> MovementColumns:
+        """Zeitfenster aus den mitgeführten Spalten ausschneiden (ohne Movement-Objekte)"""
+        with self._lock:
+            start = 0 if since is None else bisect_left(self.movements, since, key=_timestamp)
+            stop = (
+                len(self.movements)
+                if until is None
+                else bisect_left(self.movements, until, key=_timestamp)
+            )
+            return self._columns.slice(start, stop)
+
+    def load_movements(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        product_id: Optional[str] = None,
+        movement_type: Optional[str] = None,
+        limit: Optional[int] = None,
+        after_cursor: Optional[str] = None,
+        newest_first: bool = False,
+    ) -> List[Movement]:
+        """Bewegungen aus Memory filtern und seitenweise liefern"""
+        return list(
+            self.iter_movements(
+                since, until, product_id, movement_type, limit, after_cursor, newest_first
+            )
+        )
+
+    def iter_movements(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        product_id: Optional[str] = None,
+        movement_type: Optional[str] = None,
+        limit: Optional[int] = None,
+        after_cursor: Optional[str] = None,
+        newest_first: bool = False,
+    ) -> Iterator[Movement]:
+        """Bewegungen direkt aus der (sortierten) Liste liefern, ohne sie zu kopieren"""
+        movements = self.movements
+        start = 0 if since is None else bisect_left(movements, since, key=_timestamp)
+        stop = len(movements) if until is None else bisect_left(movements, until, key=_timestamp)
+
+        if after_cursor is not None:
+            timestamp, movement_id = self.parse_movement_cursor(after_cursor)
+            low = bisect_left(movements, timestamp, key=_timestamp)
+            high = bisect_right(movements, timestamp, key=_timestamp)
+            # Position der Cursor-Bewegung unter den Bewegungen mit gleichem Zeitstempel
+            position = next(
+                (i for i in range(low, high) if movements[i].id == movement_id), None
+            )
+            if newest_first:
+                stop = min(stop, low if position is None else position)
+            else:
+                start = max(start, high if position is None else position + 1)
+
+        indices = range(stop - 1, start - 1, -1) if newest_first else range(start, stop)
+        count = 0
+        for index in indices:
+            if limit is not None and count >= limit:
+                return
+            movement = movements[index]
+            if product_id is not None and movement.product_id != product_id:
+                continue
+            if movement_type is not None and movement.movement_type != movement_type:
+                continue
+            count += 1
+            yield movement
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Unit of Work: bei einer Exception werden alle Änderungen zurückgenommen"""
+        with self._lock:
+            if self._undo_log is not None:
+                # Verschachtelt: Teil der äußeren Transaktion
+                yield
+                return
+
+            self._undo_log = []
+            try:
+                yield
+            except BaseException:
+                for undo in reversed(self._undo_log):
+                    undo()
+                raise
+            finally:
+                self._undo_log = None
+
+    def adjust_stock(
+        self, product_id: str, warehouse_delta: int = 0, shop_delta: int = 0
+    ) -> Optional[Product]:
+        """Bestände prüfen und ändern, ohne dass ein anderer Thread dazwischenkommt"""
+        with self._lock:
+            product = self.products.get(product_id)
+            if product is None:
+                return None
+            if product.warehouse_qty + warehouse_delta < 0 or product.shop_qty + shop_delta < 0:
+                return None
+
+            previous = (product.warehouse_qty, product.shop_qty, product.updated_at)
+            product.warehouse_qty += warehouse_delta
+            product.shop_qty += shop_delta
+            product.updated_at = datetime.now()
+            self._update_low_stock(product)
+            self._update_value(product)
+            self._record_undo(lambda: self._restore_stock(product, previous))
+            return product
+
+    def adjust_stocks(self, deltas: Dict[str, Tuple[int, int]]) -> Optional[Dict[str, Product]]:
+        """Erst alle Bestände prüfen, dann alle ändern (unter einem Lock)"""
+        with self._lock:
+            for product_id, (warehouse_delta, shop_delta) in deltas.items():
+                product = self.products.get(product_id)
+                if product is None:
+                    return None
+                if product.warehouse_qty + warehouse_delta < 0 or product.shop_qty + shop_delta < 0:
+                    return None
+            with self.transaction():
+                return {
+                    product_id: self.adjust_stock(product_id, warehouse_delta, shop_delta)
+                    for product_id, (warehouse_delta, shop_delta) in deltas.items()
+                }
+
+    def _restore_product(self, product_id: str, previous: Optional[Product]) -> None:
+        if previous is None:
+            self.products.pop(product_id, None)
+            self._unindex_product(product_id)
+        else:
+            self.products[product_id] = previous
+            self._index_product(previous)
+
+    def _restore_stock(self, product: Product, previous: tuple) -> None:
+        product.warehouse_qty, product.shop_qty, product.updated_at = previous
+        self._update_low_stock(product)
+        self._update_value(product)
 
 
 class SQLiteRepository(RepositoryPort):
     """SQLite Repository - persistente Speicherung in warehouse.db"""
 
-    def __init__(self, db_path: str = "warehouse.db"):
+    def __init__(
+        self,
+        db_path: str = "warehouse.db",
+        pool_size: int = 0,
+        profile: Union[str, SQLiteProfile] = "safe",
+    ):
+        """
+        Args:
+            db_path: Pfad zur SQLite-Datenbank
+            pool_size: Anzahl wiederverwendeter Verbindungen (0 = pro Zugriff neu öffnen)
+            profile: PRAGMA-Profil ("safe", "throughput" oder eigenes SQLiteProfile)
+        """
         self.db_path = str(Path(db_path))
+        self.pool_size = pool_size
+        self.profile = resolve_profile(profile)
+        self._local = threading.local()
+        self._pool: Optional[SQLiteConnectionPool] = (
+            SQLiteConnectionPool(self._open_connection, size=pool_size) if pool_size > 0 else None
+        )
         self._init_db()
 
-    def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path)
+    def _open_connection(self) -> sqlite3.Connection:
+        """Neue Verbindung öffnen und konfigurieren"""
+        # Gepoolte Verbindungen wandern zwischen Threads (immer nur von einem genutzt)
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.profile.busy_timeout / 1000,
+            check_same_thread=self._pool is None,
+        )
         conn.row_factory = sqlite3.Row
         conn.execute("PRAGMA foreign_keys = ON;")
+        self.profile.apply_connection(conn)
         return conn
 
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        Verbindung für einen Zugriff bereitstellen.
+
+        Verschachtelte Aufrufe im selben Thread teilen sich die Verbindung;
+        der äußerste Aufruf committet (bzw. rollt zurück) und gibt sie an den
+        Pool zurück oder schließt sie.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            yield conn
+            return
+
+        conn = self._pool.acquire() if self._pool else self._open_connection()
+        self._local.conn = conn
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self._local.conn = None
+            if self._pool:
+                self._pool.release(conn)
+            else:
+                conn.close()
+
+    @contextmanager
+    def _read_connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Eigene Verbindung für lang laufende Lesezugriffe (Generatoren).
+
+        Anders als _connect wird sie nicht als Thread-Verbindung registriert:
+        ein nicht zu Ende gelesener Generator soll keine späteren Schreibzugriffe
+        im selben Thread an sich binden. Sie kommt auch nicht aus dem Pool:
+        ein gestreamter Export hält sie, bis die Antwort gesendet ist, und
+        langsame Downloads sollen den Pool nicht für andere Requests leeren.
+        In einer Transaktion wird deren Verbindung verwendet.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            yield conn
+            return
+
+        conn = self._open_connection()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def close(self) -> None:
+        """Gepoolte Verbindungen schließen (z.B. beim Herunterfahren der App)"""
+        if self._pool:
+            self._pool.close()
+
     def _init_db(self) -> None:
         """Tabellen anlegen, wenn sie fehlen."""
         with self._connect() as conn:
+            self.profile.apply_database(conn)
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS products (
@@ -92,7 +731,51 @@ class SQLiteRepository(RepositoryPort):
                 )
                 """
             )
-            conn.commit()
+            for name, definition in _SCHEMA_INDEXES.items():
+                conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {definition}")
+            self._init_inventory_totals(conn)
+            self._init_data_version(conn)
+            self._fts_enabled = self._init_search_index(conn)
+
+    @staticmethod
+    def _init_inventory_totals(conn: sqlite3.Connection) -> None:
+        """Summentabelle und Trigger anlegen; bestehende Datenbank einmal aus products füllen"""
+        conn.execute(_TOTALS_TABLE_SQL)
+        conn.execute(
+            f"INSERT OR IGNORE INTO inventory_totals (id, warehouse_value, shop_value) "
+            f"SELECT 1, * FROM ({_RECOMPUTE_TOTALS_SQL})"
+        )
+        for name, body in _TOTALS_TRIGGERS.items():
+            conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+
+    @staticmethod
+    def _init_data_version(conn: sqlite3.Connection) -> None:
+        """Änderungszähler und Trigger anlegen"""
+        conn.execute(_DATA_VERSION_TABLE_SQL)
+        conn.execute("INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 0)")
+        for name, body in _DATA_VERSION_TRIGGERS.items():
+            conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+
+    @staticmethod
+    def _init_search_index(conn: sqlite3.Connection) -> bool:
+        """
+        FTS5-Suchindex und Trigger anlegen; bestehende Produkte beim ersten Mal indexieren
+
+        Returns:
+            False, wenn SQLite ohne FTS5/Trigramm-Tokenizer (ab 3.34) gebaut ist
+        """
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'products_fts'"
+        ).fetchone()
+        try:
+            conn.execute(_SEARCH_TABLE_SQL)
+        except sqlite3.OperationalError:
+            return False
+        for name, body in _SEARCH_TRIGGERS.items():
+            conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+        if not exists:
+            conn.execute("INSERT INTO products_fts(products_fts) VALUES ('rebuild')")
+        return True
 
     # --- helper: datetime <-> text ---
     @staticmethod
@@ -103,45 +786,73 @@ class SQLiteRepository(RepositoryPort):
     def _text_to_dt(value: str) -> datetime:
         return datetime.fromisoformat(value)
 
+    @classmethod
+    def _product_params(cls, product: Product) -> tuple:
+        return (
+            product.id,
+            product.name,
+            product.description,
+            float(product.price),
+            int(product.warehouse_qty),
+            int(product.shop_qty),
+            product.sku,
+            product.category,
+            product.notes,
+            cls._dt_to_text(product.created_at),
+            cls._dt_to_text(product.updated_at),
+            int(product.min_stock_level),
+        )
+
+    @classmethod
+    def _row_to_product(cls, row: sqlite3.Row) -> Product:
+        return Product.from_storage(
+            id=row["id"],
+            name=row["name"],
+            description=row["description"] or "",
+            price=float(row["price"]),
+            warehouse_qty=int(row["warehouse_qty"]),
+            shop_qty=int(row["shop_qty"]),
+            sku=row["sku"] or "",
+            category=intern(row["category"] or ""),
+            notes=row["notes"],
+            min_stock_level=int(row["min_stock_level"]) if row["min_stock_level"] else 10,
+            created_at=cls._text_to_dt(row["created_at"]) if row["created_at"] else None,
+            updated_at=cls._text_to_dt(row["updated_at"]) if row["updated_at"] else None,
+        )
+
+    @classmethod
+    def _row_to_movement(cls, row: sqlite3.Row) -> Movement:
+        # Wiederkehrende Texte (Typ, Produkt, Benutzer) teilen sich per intern() ein Objekt
+        return Movement.from_storage(
+            id=row["id"],
+            product_id=intern(row["product_id"]),
+            product_name=intern(row["product_name"] or ""),
+            quantity_change=int(row["quantity_change"]),
+            movement_type=intern(row["movement_type"]),
+            reason=row["reason"],
+            timestamp=cls._text_to_dt(row["timestamp"]) if row["timestamp"] else None,
+            performed_by=intern(row["performed_by"] or "system"),
+        )
+
     # --- RepositoryPort Implementierung ---
 
     def save_product(self, product: Product) -> None:
         with self._connect() as conn:
-            conn.execute(
-                """
-                INSERT INTO products (
-                    id, name, description, price, warehouse_qty, shop_qty, sku, category, notes, created_at, updated_at, min_stock_level
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(id) DO UPDATE SET
-                    name=excluded.name,
-                    description=excluded.description,
-                    price=excluded.price,
-                    warehouse_qty=excluded.warehouse_qty,
-                    shop_qty=excluded.shop_qty,
-                    sku=excluded.sku,
-                    category=excluded.category,
-                    notes=excluded.notes,
-                    created_at=excluded.created_at,
-                    updated_at=excluded.updated_at,
-                    min_stock_level=excluded.min_stock_level
-                """,
-                (
-                    product.id,
-                    product.name,
-                    product.description,
-                    float(product.price),
-                    int(product.warehouse_qty),
-                    int(product.shop_qty),
-                    product.sku,
-                    product.category,
-                    product.notes,
-                    self._dt_to_text(product.created_at),
-                    self._dt_to_text(product.updated_at),
-                    int(product.min_stock_level),
-                ),
-            )
-            conn.commit()
+            conn.execute(_UPSERT_PRODUCT_SQL, self._product_params(product))
+
+    def save_products(self, products: Iterable[Product], chunk_size: int = 1000) -> int:
+        """Produkte blockweise per executemany in einer einzigen Transaktion speichern"""
+        iterator = iter(products)
+        count = 0
+        with self.transaction():
+            with self._connect() as conn:
+                while True:
+                    chunk = [self._product_params(p) for p in islice(iterator, chunk_size)]
+                    if not chunk:
+                        break
+                    conn.executemany(_UPSERT_PRODUCT_SQL, chunk)
+                    count += len(chunk)
+        return count
 
     def load_product(self, product_id: str) -> Optional[Product]:
         with self._connect() as conn:
@@ -153,25 +864,7 @@ class SQLiteRepository(RepositoryPort):
         if not row:
             return None
 
-        p = Product(
-            id=row["id"],
-            name=row["name"],
-            description=row["description"] or "",
-            price=float(row["price"]),
-            warehouse_qty=int(row["warehouse_qty"]),
-            shop_qty=int(row["shop_qty"]),
-            sku=row["sku"] or "",
-            category=row["category"] or "",
-            notes=row["notes"],
-            min_stock_level=int(row["min_stock_level"]) if row["min_stock_level"] else 10,
-        )
-
-        if row["created_at"]:
-            p.created_at = self._text_to_dt(row["created_at"])
-        if row["updated_at"]:
-            p.updated_at = self._text_to_dt(row["updated_at"])
-
-        return p
+        return self._row_to_product(row)
 
     def load_all_products(self) -> Dict[str, Product]:
         with self._connect() as conn:
@@ -179,75 +872,442 @@ class SQLiteRepository(RepositoryPort):
 
         products: Dict[str, Product] = {}
         for row in rows:
-            p = Product(
-                id=row["id"],
-                name=row["name"],
-                description=row["description"] or "",
-                price=float(row["price"]),
-                warehouse_qty=int(row["warehouse_qty"]),
-                shop_qty=int(row["shop_qty"]),
-                sku=row["sku"] or "",
-                category=row["category"] or "",
-                notes=row["notes"],
-                min_stock_level=int(row["min_stock_level"]) if row["min_stock_level"] else 10,
-            )
-            if row["created_at"]:
-                p.created_at = self._text_to_dt(row["created_at"])
-            if row["updated_at"]:
-                p.updated_at = self._text_to_dt(row["updated_at"])
+            p = self._row_to_product(row)
             products[p.id] = p
 
         return products
 
+    def load_products_by_category(self, category: str) -> List[Product]:
+        # idx_products_category liefert die Zeilen bereits in rowid-Reihenfolge
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM products WHERE category = ?", (category,)).fetchall()
+        return [self._row_to_product(row) for row in rows]
+
+    def load_categories(self) -> List[str]:
+        # Läuft nur über den Index (covering), ohne die Tabelle zu lesen
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT DISTINCT category FROM products WHERE category <> '' ORDER BY category"
+            ).fetchall()
+        return [row["category"] for row in rows]
+
+    def search_products(self, query: str, limit: Optional[int] = None) -> List[Product]:
+        needle = query.strip()
+        if not needle:
+            return []
+
+        if self._fts_enabled and len(needle) >= 3:
+            # Phrase in Anführungszeichen: Trigramme müssen direkt aufeinander folgen
+            weights = ", ".join(str(weight) for weight in SEARCH_FIELD_WEIGHTS.values())
+            sql = f"""
+                SELECT p.* FROM products_fts
+                JOIN products p ON p.rowid = products_fts.rowid
+                WHERE products_fts MATCH ?
+                ORDER BY instr(lower(p.name), lower(?)) = 1 DESC,
+                         bm25(products_fts, {weights}), p.name
+            """
+            params: list = [_fts_phrase(needle), needle]
+        else:
+            # Unter 3 Zeichen gibt es keine Trigramme: Suche per LIKE
+            pattern = _like_pattern(needle)
+            sql = """
+                SELECT * FROM products
+                WHERE name LIKE ? ESCAPE '\\' OR sku LIKE ? ESCAPE '\\'
+                   OR description LIKE ? ESCAPE '\\'
+                ORDER BY instr(lower(name), lower(?)) = 1 DESC, name
+            """
+            params = [pattern, pattern, pattern, needle]
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [self._row_to_product(row) for row in rows]
+
+    def load_products_page(
+        self,
+        limit: int = 50,
+        after_cursor: Optional[str] = None,
+        sort: str = "id",
+        descending: bool = False,
+        category: Optional[str] = None,
+        low_stock: bool = False,
+        query: Optional[str] = None,
+    ) -> List[Product]:
+        _check_sort(sort)
+        conditions: List[str] = []
+        params: list = []
+        if category is not None:
+            conditions.append("category = ?")
+            params.append(category)
+        if low_stock:
+            conditions.append("warehouse_qty < min_stock_level")
+        needle = (query or "").strip()
+        if needle and self._fts_enabled and len(needle) >= 3:
+            conditions.append(
+                "rowid IN (SELECT rowid FROM products_fts WHERE products_fts MATCH ?)"
+            )
+            params.append(_fts_phrase(needle))
+        elif needle:
+            conditions.append(
+                "(name LIKE ? ESCAPE '\\' OR sku LIKE ? ESCAPE '\\'"
+                " OR description LIKE ? ESCAPE '\\')"
+            )
+            params.extend([_like_pattern(needle)] * 3)
+
+        # Keyset statt OFFSET: Zeilenwert-Vergleich auf (sort, id) nutzt den passenden Index
+        columns = ["id"] if sort == "id" else [sort, "id"]
+        if after_cursor is not None:
+            value, product_id = self.parse_product_cursor(after_cursor, sort)
+            placeholders = ", ".join("?" * len(columns))
+            operator = "<" if descending else ">"
+            conditions.append(f"({', '.join(columns)}) {operator} ({placeholders})")
+            params.extend([value, product_id] if sort != "id" else [product_id])
+
+        direction = "DESC" if descending else "ASC"
+        sql = "SELECT * FROM products"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY " + ", ".join(f"{column} {direction}" for column in columns) + " LIMIT ?"
+        params.append(int(limit))
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [self._row_to_product(row) for row in rows]
+
+    def load_inventory_stats(self) -> Dict:
+        # Eine Abfrage, eine Zeile pro Kategorie; Summen über alle Kategorien in Python.
+        # Nackte Spalte id neben MAX(): SQLite liefert die id der Zeile mit dem Maximum.
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT
+                    category,
+                    COUNT(*) AS products,
+                    TOTAL(price * warehouse_qty) AS warehouse_value,
+                    TOTAL(price * shop_qty) AS shop_value,
+                    SUM(warehouse_qty > 0) AS warehouse_products,
+                    SUM(shop_qty > 0) AS shop_products,
+                    SUM(warehouse_qty < min_stock_level) AS low_stock,
+                    id AS most_valuable_id,
+                    MAX(price * (warehouse_qty + shop_qty)) AS most_valuable_value
+                FROM products
+                GROUP BY category
+                """
+            ).fetchall()
+
+        stats = _empty_inventory_stats()
+        max_value = None
+        for row in rows:
+            stats["total_products"] += row["products"]
+            stats["total_warehouse_value"] += row["warehouse_value"]
+            stats["total_shop_value"] += row["shop_value"]
+            stats["warehouse_product_count"] += row["warehouse_products"]
+            stats["shop_product_count"] += row["shop_products"]
+            stats["low_stock_count"] += row["low_stock"]
+            if row["category"]:
+                stats["categories"][row["category"]] = row["products"]
+            if max_value is None or row["most_valuable_value"] > max_value:
+                max_value = row["most_valuable_value"]
+                stats["most_valuable_product_id"] = row["most_valuable_id"]
+        return stats
+
+    def load_inventory_totals(self) -> Dict:
+        # Eine Zeile aus inventory_totals statt SUM über alle Produkte
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT warehouse_value, shop_value FROM inventory_totals WHERE id = 1"
+            ).fetchone()
+        return {"total_warehouse_value": row[0], "total_shop_value": row[1]}
+
+    def reconcile_inventory_totals(self) -> Dict:
+        # In einer Transaktion, damit kein Schreiber zwischen Neuberechnung und Zurücksetzen kommt
+        with self.transaction(), self._connect() as conn:
+            running = conn.execute(
+                "SELECT warehouse_value, shop_value FROM inventory_totals WHERE id = 1"
+            ).fetchone()
+            warehouse_value, shop_value = conn.execute(_RECOMPUTE_TOTALS_SQL).fetchone()
+            if tuple(running) != (warehouse_value, shop_value):
+                conn.execute(
+                    "UPDATE inventory_totals SET warehouse_value = ?, shop_value = ? WHERE id = 1",
+                    (warehouse_value, shop_value),
+                )
+        return {
+            "total_warehouse_value": warehouse_value,
+            "total_shop_value": shop_value,
+            "warehouse_drift": running[0] - warehouse_value,
+            "shop_drift": running[1] - shop_value,
+        }
+
+    def load_low_stock_products(self, limit: Optional[int] = None) -> List[Product]:
+        # Bedingung und Sortierung passen zum partiellen Index idx_products_low_stock
+        sql = "SELECT * FROM products WHERE warehouse_qty < min_stock_level ORDER BY warehouse_qty"
+        params: list = []
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [self._row_to_product(row) for row in rows]
+
+    def count_low_stock_products(self) -> int:
+        # Zählt nur die Einträge des partiellen Index (k statt n Zeilen)
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM products WHERE warehouse_qty < min_stock_level"
+            ).fetchone()[0]
+
+    def load_data_version(self) -> Optional[int]:
+        with self._connect() as conn:
+            return conn.execute("SELECT version FROM data_version WHERE id = 1").fetchone()[0]
+
     def delete_product(self, product_id: str) -> None:
         with self._connect() as conn:
             conn.execute("DELETE FROM products WHERE id = ?", (product_id,))
-            conn.commit()
+
+    @classmethod
+    def _movement_params(cls, movement: Movement) -> tuple:
+        return (
+            movement.id,
+            movement.product_id,
+            movement.product_name,
+            int(movement.quantity_change),
+            movement.movement_type,
+            movement.reason,
+            cls._dt_to_text(movement.timestamp),
+            movement.performed_by,
+        )
 
     def save_movement(self, movement: Movement) -> None:
         with self._connect() as conn:
-            conn.execute(
+            conn.execute(_INSERT_MOVEMENT_SQL, self._movement_params(movement))
+
+    def save_movements(self, movements: Iterable[Movement], chunk_size: int = 1000) -> int:
+        """Bewegungen blockweise per executemany in einer einzigen Transaktion speichern"""
+        iterator = iter(movements)
+        count = 0
+        with self.transaction():
+            with self._connect() as conn:
+                while True:
+                    chunk = [self._movement_params(m) for m in islice(iterator, chunk_size)]
+                    if not chunk:
+                        break
+                    conn.executemany(_INSERT_MOVEMENT_SQL, chunk)
+                    count += len(chunk)
+        return count
+
+    def _movement_query(
+        self,
+        since: Optional[datetime],
+        until: Optional[datetime],
+        product_id: Optional[str],
+        movement_type: Optional[str],
+        limit: Optional[int],
+        after_cursor: Optional[str],
+        newest_first: bool,
+    ) -> Tuple[str, list]:
+        """SELECT für gefilterte Bewegungen in (timestamp, rowid)-Reihenfolge bauen"""
+        clauses: List[str] = []
+        params: list = []
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(self._dt_to_text(since))
+        if until is not None:
+            clauses.append("timestamp < ?")
+            params.append(self._dt_to_text(until))
+        if product_id is not None:
+            clauses.append("product_id = ?")
+            params.append(product_id)
+        if movement_type is not None:
+            clauses.append("movement_type = ?")
+            params.append(movement_type)
+        if after_cursor is not None:
+            timestamp, movement_id = self.parse_movement_cursor(after_cursor)
+            # Keyset statt OFFSET: direkt hinter der letzten Bewegung weiterlesen.
+            # Gibt es die Cursor-Bewegung nicht (mehr), geht es hinter allen Bewegungen
+            # mit ihrem Zeitstempel weiter (wie InMemoryRepository)
+            clauses.append(
+                f"(timestamp, rowid) {'<' if newest_first else '>'} "
+                "(?, COALESCE((SELECT rowid FROM movements WHERE id = ?), ?))"
+            )
+            params.extend([
+                self._dt_to_text(timestamp),
+                movement_id,
+                -1 if newest_first else _MAX_ROWID,
+            ])
+
+        sql = "SELECT * FROM movements"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        direction = "DESC" if newest_first else "ASC"
+        sql += f" ORDER BY timestamp {direction}, rowid {direction}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        return sql, params
+
+    def load_movements(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        product_id: Optional[str] = None,
+        movement_type: Optional[str] = None,
+        limit: Optional[int] = None,
+        after_cursor: Optional[str] = None,
+        newest_first: bool = False,
+    ) -> List[Movement]:
+        sql, params = self._movement_query(
+            since, until, product_id, movement_type, limit, after_cursor, newest_first
+        )
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+
+        return [self._row_to_movement(row) for row in rows]
+
+    def iter_movements(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        product_id: Optional[str] = None,
+        movement_type: Optional[str] = None,
+        limit: Optional[int] = None,
+        after_cursor: Optional[str] = None,
+        newest_first: bool = False,
+        batch_size: int = 500,
+    ) -> Iterator[Movement]:
+        """Bewegungen blockweise per fetchmany lesen und einzeln liefern"""
+        sql, params = self._movement_query(
+            since, until, product_id, movement_type, limit, after_cursor, newest_first
+        )
+        with self._read_connection() as conn:
+            cursor = conn.execute(sql, params)
+            try:
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield self._row_to_movement(row)
+            finally:
+                cursor.close()
+
+    def load_movement_columns(
+        self, since: Optional[datetime] = None, until: Optional[datetime] = None
+    ) -> MovementColumns:
+        """Nur die vier Analysespalten lesen; Zeitstempel rechnet SQLite in µs um"""
+        clauses: List[str] = []
+        params: list = []
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(self._dt_to_text(since))
+        if until is not None:
+            clauses.append("timestamp < ?")
+            params.append(self._dt_to_text(until))
+        # ISO-Text -> Sekunden (strftime) + Mikrosekunden (Stellen 21-26, fehlen bei .000000)
+        sql = """
+            SELECT CAST(strftime('%s', timestamp) AS INTEGER) * 1000000
+                       + CAST(substr(timestamp, 21, 6) AS INTEGER),
+                   product_id, quantity_change, movement_type
+            FROM movements
+        """
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY timestamp, rowid"
+
+        columns = MovementColumns()
+        append = columns.append_values
+        with self._connect() as conn:
+            cursor = conn.execute(sql, params)
+            # Tupel statt sqlite3.Row: spart pro Zeile ein Objekt
+            cursor.row_factory = None
+            for timestamp_us, product_id, quantity, movement_type in cursor:
+                append(timestamp_us, product_id, quantity, movement_type)
+        return columns
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Unit of Work: eine Verbindung, ein BEGIN IMMEDIATE, ein Commit.
+
+        Alle Repository-Aufrufe im Block (im selben Thread) laufen über
+        diese Verbindung und werden erst am Ende gemeinsam committet.
+        """
+        if getattr(self._local, "conn", None) is not None:
+            # Verschachtelt: Teil der äußeren Transaktion
+            yield
+            return
+
+        with self._connect() as conn:
+            # Schreibsperre sofort holen, damit parallele Schreiber warten statt abzubrechen
+            conn.execute("BEGIN IMMEDIATE")
+            yield
+
+    def adjust_stock(
+        self, product_id: str, warehouse_delta: int = 0, shop_delta: int = 0
+    ) -> Optional[Product]:
+        with self._connect() as conn:
+            # Bedingtes UPDATE: Prüfung und Änderung in einer Anweisung (kein Lost Update)
+            cursor = conn.execute(
                 """
-                INSERT INTO movements (
-                    id, product_id, product_name, quantity_change, movement_type, reason, timestamp, performed_by
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                UPDATE products SET
+                    warehouse_qty = warehouse_qty + ?,
+                    shop_qty = shop_qty + ?,
+                    updated_at = ?
+                WHERE id = ? AND warehouse_qty >= ? AND shop_qty >= ?
                 """,
                 (
-                    movement.id,
-                    movement.product_id,
-                    movement.product_name,
-                    int(movement.quantity_change),
-                    movement.movement_type,
-                    movement.reason,
-                    self._dt_to_text(movement.timestamp),
-                    movement.performed_by,
+                    int(warehouse_delta),
+                    int(shop_delta),
+                    self._dt_to_text(datetime.now()),
+                    product_id,
+                    max(0, -int(warehouse_delta)),
+                    max(0, -int(shop_delta)),
                 ),
             )
-            conn.commit()
+            if cursor.rowcount == 0:
+                return None
+            row = conn.execute("SELECT * FROM products WHERE id = ?", (product_id,)).fetchone()
 
-    def load_movements(self) -> List[Movement]:
-        with self._connect() as conn:
-            rows = conn.execute(
-                "SELECT * FROM movements ORDER BY timestamp"
-            ).fetchall()
+        return self._row_to_product(row)
 
-        movements: List[Movement] = []
-        for row in rows:
-            mv = Movement(
-                id=row["id"],
-                product_id=row["product_id"],
-                product_name=row["product_name"] or "",
-                quantity_change=int(row["quantity_change"]),
-                movement_type=row["movement_type"],
-                reason=row["reason"],
-                performed_by=row["performed_by"] or "system",
-            )
-            if row["timestamp"]:
-                mv.timestamp = self._text_to_dt(row["timestamp"])
-            movements.append(mv)
+    def _select_products(
+        self, conn: sqlite3.Connection, product_ids: List[str]
+    ) -> Dict[str, Product]:
+        """Produkte per IN-Liste laden (blockweise)"""
+        products: Dict[str, Product] = {}
+        for start in range(0, len(product_ids), _IN_CHUNK):
+            chunk = product_ids[start:start + _IN_CHUNK]
+            placeholders = ", ".join("?" * len(chunk))
+            for row in conn.execute(f"SELECT * FROM products WHERE id IN ({placeholders})", chunk):
+                products[row["id"]] = self._row_to_product(row)
+        return products
 
-        return movements
+    def adjust_stocks(self, deltas: Dict[str, Tuple[int, int]]) -> Optional[Dict[str, Product]]:
+        # Prüfen und ändern unter der Schreibsperre (BEGIN IMMEDIATE), Änderung per executemany
+        product_ids = list(deltas)
+        now = self._dt_to_text(datetime.now())
+        with self.transaction(), self._connect() as conn:
+            current = self._select_products(conn, product_ids)
+            for product_id, (warehouse_delta, shop_delta) in deltas.items():
+                product = current.get(product_id)
+                if product is None:
+                    return None
+                if product.warehouse_qty + warehouse_delta < 0 or product.shop_qty + shop_delta < 0:
+                    return None
+            conn.executemany(
+                """
+                UPDATE products SET
+                    warehouse_qty = warehouse_qty + ?,
+                    shop_qty = shop_qty + ?,
+                    updated_at = ?
+                WHERE id = ?
+                """,
+                [
+                    (int(warehouse_delta), int(shop_delta), now, product_id)
+                    for product_id, (warehouse_delta, shop_delta) in deltas.items()
+                ],
+            )
+            return self._select_products(conn, product_ids)
 
 
 class RepositoryFactory:
@@ -0,0 +1,90 @@
+"""Suchindex - Trigramm-Index für die Produktsuche im Speicher"""
+
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from ..domain.product import Product
+
+# Gewichtung der Felder beim Ranking (gleiche Reihenfolge wie im FTS5-Index von SQLite)
+SEARCH_FIELD_WEIGHTS = {"name": 10.0, "sku": 5.0, "description": 1.0}
+
+
+def trigrams(text: str) -> Set[str]:
+    """Alle Dreiergruppen aufeinanderfolgender Zeichen (Text bereits kleingeschrieben)"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """
+    Invertierter Index: Trigramm -> IDs der Produkte, die es enthalten.
+
+    Findet wie die bisherige Suche jeden Teilstring von Name, SKU oder
+    Beschreibung (ohne Groß-/Kleinschreibung). Kandidaten kommen aus der
+    Schnittmenge der Trigramm-Listen und werden danach exakt geprüft.
+    Anfragen unter 3 Zeichen prüfen alle Produkte.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Set[str]] = defaultdict(set)
+        # Produkt-ID -> kleingeschriebene Felder (name, sku, description)
+        self._documents: Dict[str, Tuple[str, str, str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(self, product: Product) -> None:
+        """Produkt (neu) indexieren"""
+        self.remove(product.id)
+        fields = (
+            product.name.lower(),
+            (product.sku or "").lower(),
+            (product.description or "").lower(),
+        )
+        self._documents[product.id] = fields
+        for gram in trigrams("\n".join(fields)):
+            self._postings[gram].add(product.id)
+
+    def remove(self, product_id: str) -> None:
+        """Produkt aus dem Index entfernen (unbekannte IDs werden ignoriert)"""
+        fields = self._documents.pop(product_id, None)
+        if fields is None:
+            return
+        for gram in trigrams("\n".join(fields)):
+            ids = self._postings[gram]
+            ids.discard(product_id)
+            if not ids:
+                del self._postings[gram]
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[str]:
+        """
+        Produkt-IDs passend zur Anfrage, beste Treffer zuerst
+
+        Ranking: Summe der Feldgewichte aller Felder mit Treffer, Treffer am
+        Feldanfang zählen doppelt. Gleichstand nach Name.
+        """
+        needle = query.lower().strip()
+        if not needle:
+            return []
+
+        if len(needle) < 3:
+            candidates = self._documents.keys()
+        else:
+            postings = sorted((self._postings.get(gram, set()) for gram in trigrams(needle)), key=len)
+            candidates = set.intersection(*postings) if postings[0] else set()
+
+        scored = []
+        for product_id in candidates:
+            fields = self._documents[product_id]
+            score = 0.0
+            for value, weight in zip(fields, SEARCH_FIELD_WEIGHTS.values()):
+                position = value.find(needle)
+                if position == 0:
+                    score += 2 * weight
+                elif position > 0:
+                    score += weight
+            if score:
+                scored.append((-score, fields[0], product_id))
+
+        scored.sort()
+        ids = [product_id for _, _, product_id in scored]
+        return ids if limit is None else ids[:limit]
@@ -0,0 +1,79 @@
+"""SQLite-Profile - PRAGMA-Einstellungen für Dauerhaftigkeit und Performance"""
+
+import sqlite3
+from dataclasses import dataclass
+from typing import Dict, Union
+
+JOURNAL_MODES = ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF")
+SYNCHRONOUS_LEVELS = ("OFF", "NORMAL", "FULL", "EXTRA")
+TEMP_STORES = ("DEFAULT", "FILE", "MEMORY")
+
+
+@dataclass(frozen=True)
+class SQLiteProfile:
+    """
+    PRAGMA-Profil für SQLiteRepository.
+    Siehe docs/architecture.md (Abschnitt SQLite-Profile) für die Presets.
+    """
+
+    journal_mode: str = "WAL"
+    synchronous: str = "FULL"
+    cache_size: int = -2000  # negativ = KiB, positiv = Seiten
+    mmap_size: int = 0  # Bytes, 0 = kein Memory-Mapping
+    temp_store: str = "DEFAULT"
+    busy_timeout: int = 5000  # Millisekunden
+
+    def __post_init__(self):
+        """Validierung - die Werte landen direkt in PRAGMA-Anweisungen."""
+        if self.journal_mode.upper() not in JOURNAL_MODES:
+            raise ValueError(f"Ungültiger journal_mode: {self.journal_mode}")
+        if self.synchronous.upper() not in SYNCHRONOUS_LEVELS:
+            raise ValueError(f"Ungültiger synchronous-Level: {self.synchronous}")
+        if self.temp_store.upper() not in TEMP_STORES:
+            raise ValueError(f"Ungültiger temp_store: {self.temp_store}")
+        if self.mmap_size < 0:
+            raise ValueError("mmap_size kann nicht negativ sein")
+        if self.busy_timeout < 0:
+            raise ValueError("busy_timeout kann nicht negativ sein")
+
+    def apply_database(self, conn: sqlite3.Connection) -> None:
+        """Datenbankweite Einstellungen setzen (bleiben in der Datei erhalten)"""
+        conn.execute(f"PRAGMA journal_mode = {self.journal_mode.upper()};")
+
+    def apply_connection(self, conn: sqlite3.Connection) -> None:
+        """Einstellungen setzen, die pro Verbindung gelten"""
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout)};")
+        conn.execute(f"PRAGMA synchronous = {self.synchronous.upper()};")
+        conn.execute(f"PRAGMA cache_size = {int(self.cache_size)};")
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)};")
+        conn.execute(f"PRAGMA temp_store = {self.temp_store.upper()};")
+
+
+SQLITE_PROFILES: Dict[str, SQLiteProfile] = {
+    # Jeder Commit wird sofort auf die Platte geschrieben; WAL erlaubt Lesen während Schreiben
+    "safe": SQLiteProfile(),
+    # Commits ohne fsync auf die WAL-Datei, großer Cache, Memory-Mapping
+    "throughput": SQLiteProfile(
+        journal_mode="WAL",
+        synchronous="NORMAL",
+        cache_size=-64000,
+        mmap_size=256 * 1024 * 1024,
+        temp_store="MEMORY",
+        busy_timeout=10000,
+    ),
+}
+
+
+def resolve_profile(profile: Union[str, SQLiteProfile]) -> SQLiteProfile:
+    """
+    Profil-Namen oder Profil-Objekt in ein SQLiteProfile auflösen
+
+    Raises:
+        ValueError: bei unbekanntem Profil-Namen
+    """
+    if isinstance(profile, SQLiteProfile):
+        return profile
+    try:
+        return SQLITE_PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"Unbekanntes SQLite-Profil: {profile}") from None
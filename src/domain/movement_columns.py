@@ -0,0 +1,115 @@
+"""Spaltenweise Bewegungsdaten - kompakte Arrays für Auswertungen über viele Bewegungen"""
+
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List
+
+from .warehouse import Movement
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECONDS_PER_DAY = 86_400_000_000
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+def to_epoch_us(timestamp: datetime) -> int:
+    """Zeitstempel (naive Ortszeit) in Mikrosekunden seit 1970-01-01"""
+    return (timestamp - EPOCH) // _ONE_MICROSECOND
+
+
+def from_epoch_us(value: int) -> datetime:
+    """Mikrosekunden seit 1970-01-01 zurück in einen Zeitstempel"""
+    return EPOCH + timedelta(microseconds=int(value))
+
+
+@dataclass
+class MovementColumns:
+    """
+    Bewegungen als parallele Arrays statt als Movement-Objekte.
+
+    Zeile i besteht aus timestamps[i], product_codes[i], quantities[i]
+    und type_codes[i]. Produkt-IDs und Bewegungstypen sind als Codes
+    gespeichert (Index in product_ids bzw. movement_types).
+
+    Die Arrays (Modul array) lassen sich ohne Kopie als NumPy-Arrays
+    lesen: numpy.frombuffer(columns.timestamps, dtype=numpy.int64).
+    """
+
+    timestamps: array = field(default_factory=lambda: array("q"))  # µs seit 1970
+    product_codes: array = field(default_factory=lambda: array("i"))
+    quantities: array = field(default_factory=lambda: array("q"))
+    type_codes: array = field(default_factory=lambda: array("h"))
+    product_ids: List[str] = field(default_factory=list)
+    movement_types: List[str] = field(default_factory=list)
+    _product_lookup: Dict[str, int] = field(default_factory=dict, repr=False, compare=False)
+    _type_lookup: Dict[str, int] = field(default_factory=dict, repr=False, compare=False)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @classmethod
+    def from_movements(cls, movements: Iterable[Movement]) -> "MovementColumns":
+        """Spalten in einem Durchlauf aus Movement-Objekten aufbauen"""
+        columns = cls()
+        for movement in movements:
+            columns.append(movement)
+        return columns
+
+    def _product_code(self, product_id: str) -> int:
+        code = self._product_lookup.get(product_id)
+        if code is None:
+            code = self._product_lookup[product_id] = len(self.product_ids)
+            self.product_ids.append(product_id)
+        return code
+
+    def _type_code(self, movement_type: str) -> int:
+        code = self._type_lookup.get(movement_type)
+        if code is None:
+            code = self._type_lookup[movement_type] = len(self.movement_types)
+            self.movement_types.append(movement_type)
+        return code
+
+    def append_values(
+        self, timestamp_us: int, product_id: str, quantity: int, movement_type: str
+    ) -> None:
+        """Eine Zeile aus Rohwerten anhängen (z.B. direkt aus einer Datenbankzeile)"""
+        self.timestamps.append(timestamp_us)
+        self.product_codes.append(self._product_code(product_id))
+        self.quantities.append(quantity)
+        self.type_codes.append(self._type_code(movement_type))
+
+    def append(self, movement: Movement) -> None:
+        """Bewegung als neue letzte Zeile anhängen"""
+        self.append_values(
+            to_epoch_us(movement.timestamp),
+            movement.product_id,
+            movement.quantity_change,
+            movement.movement_type,
+        )
+
+    def insert(self, index: int, movement: Movement) -> None:
+        """Bewegung an Position index einfügen (für nachträglich gespeicherte ältere Bewegungen)"""
+        self.timestamps.insert(index, to_epoch_us(movement.timestamp))
+        self.product_codes.insert(index, self._product_code(movement.product_id))
+        self.quantities.insert(index, movement.quantity_change)
+        self.type_codes.insert(index, self._type_code(movement.movement_type))
+
+    def delete(self, index: int) -> None:
+        """Zeile index entfernen (Codes bleiben vergeben)"""
+        del self.timestamps[index]
+        del self.product_codes[index]
+        del self.quantities[index]
+        del self.type_codes[index]
+
+    def slice(self, start: int, stop: int) -> "MovementColumns":
+        """Kopie der Zeilen start..stop-1 (Arrays werden per memcpy kopiert)"""
+        return MovementColumns(
+            timestamps=self.timestamps[start:stop],
+            product_codes=self.product_codes[start:stop],
+            quantities=self.quantities[start:stop],
+            type_codes=self.type_codes[start:stop],
+            product_ids=list(self.product_ids),
+            movement_types=list(self.movement_types),
+            _product_lookup=dict(self._product_lookup),
+            _type_lookup=dict(self._type_lookup),
+        )
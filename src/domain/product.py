@@ -5,11 +5,14 @@ from datetime import datetime
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Product:
     """
     Basis-Produktklasse für die Lagerverwaltung.
     Siehe docs/DATACLASS_ERKLAERT.md für Erklärung der @dataclass.
+
+    slots=True: feste Attribute statt __dict__ pro Objekt (deutlich weniger
+    Speicher bei großen Katalogen; neue Attribute können nicht angehängt werden).
     """
 
     id: str
@@ -36,6 +39,47 @@ class Product:
         if self.shop_qty < 0:
             raise ValueError("Shopbestand kann nicht negativ sein")
 
+    @classmethod
+    def from_storage(
+        cls,
+        id: str,
+        name: str,
+        description: str,
+        price: float,
+        warehouse_qty: int,
+        shop_qty: int,
+        sku: str,
+        category: str,
+        notes: Optional[str],
+        min_stock_level: int,
+        created_at: Optional[datetime] = None,
+        updated_at: Optional[datetime] = None,
+    ) -> "Product":
+        """
+        Produkt aus bereits gespeicherten (gültigen) Werten erstellen
+
+        Für das Laden vieler Zeilen: überspringt die Validierung und ruft
+        datetime.now() nur auf, wenn kein Zeitstempel gespeichert ist.
+        """
+        product = object.__new__(cls)
+        product.id = id
+        product.name = name
+        product.description = description
+        product.price = price
+        product.warehouse_qty = warehouse_qty
+        product.shop_qty = shop_qty
+        product.sku = sku
+        product.category = category
+        product.notes = notes
+        product.min_stock_level = min_stock_level
+        if created_at is None or updated_at is None:
+            now = datetime.now()
+            created_at = created_at or now
+            updated_at = updated_at or now
+        product.created_at = created_at
+        product.updated_at = updated_at
+        return product
+
     def update_warehouse_qty(self, amount: int) -> None:
         """
         Lagerbestand aktualisieren
@@ -7,9 +7,9 @@ from typing import Dict, Optional
 from .product import Product
 
 
-@dataclass
+@dataclass(slots=True)
 class Movement:
-    """Bewegungsprotokoll-Eintrag für Lagerbestände"""
+    """Bewegungsprotokoll-Eintrag für Lagerbestände (slots=True: kein __dict__ pro Eintrag)"""
 
     id: str
     product_id: str
@@ -20,6 +20,30 @@ class Movement:
     timestamp: datetime = field(default_factory=datetime.now)
     performed_by: str = "system"
 
+    @classmethod
+    def from_storage(
+        cls,
+        id: str,
+        product_id: str,
+        product_name: str,
+        quantity_change: int,
+        movement_type: str,
+        reason: Optional[str],
+        timestamp: Optional[datetime],
+        performed_by: str,
+    ) -> "Movement":
+        """Bewegung aus gespeicherten Werten erstellen (datetime.now() nur ohne Zeitstempel)"""
+        movement = object.__new__(cls)
+        movement.id = id
+        movement.product_id = product_id
+        movement.product_name = product_name
+        movement.quantity_change = quantity_change
+        movement.movement_type = movement_type
+        movement.reason = reason
+        movement.timestamp = timestamp or datetime.now()
+        movement.performed_by = performed_by
+        return movement
+
 
 class Warehouse:
     """Verwaltungsklasse für das Lager"""
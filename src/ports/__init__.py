@@ -1,12 +1,20 @@
 """Ports - Schnittstellen für externe Abhängigkeiten (Abstraktion)"""
 
+import base64
+import json
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from datetime import datetime
+from typing import ContextManager, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
 
+from ..domain.movement_columns import MovementColumns
 from ..domain.product import Product
 from ..domain.warehouse import Movement
 
 
+# Erlaubte Sortierfelder für load_products_page (Reihenfolge bei Gleichstand: Produkt-ID)
+PRODUCT_SORT_FIELDS = ("id", "name", "price", "warehouse_qty", "shop_qty")
+
+
 class RepositoryPort(ABC):
     """Port für Datenpersistenz."""
 
@@ -15,6 +23,16 @@ class RepositoryPort(ABC):
         """Produkt speichern"""
         raise NotImplementedError
 
+    @abstractmethod
+    def save_products(self, products: Iterable[Product]) -> int:
+        """
+        Viele Produkte in einer Transaktion speichern (alles oder nichts)
+
+        Returns:
+            Anzahl gespeicherter Produkte
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def load_product(self, product_id: str) -> Optional[Product]:
         """Produkt laden"""
@@ -25,6 +43,131 @@ class RepositoryPort(ABC):
         """Alle Produkte laden"""
         raise NotImplementedError
 
+    @abstractmethod
+    def load_products_page(
+        self,
+        limit: int = 50,
+        after_cursor: Optional[str] = None,
+        sort: str = "id",
+        descending: bool = False,
+        category: Optional[str] = None,
+        low_stock: bool = False,
+        query: Optional[str] = None,
+    ) -> List[Product]:
+        """
+        Eine Seite Produkte, sortiert nach (sort, id), ohne OFFSET:
+        die nächste Seite beginnt nach dem Cursor des letzten Produkts
+        (Keyset-Pagination, siehe product_cursor)
+
+        Args:
+            limit: Maximale Anzahl Produkte
+            after_cursor: Cursor des letzten Produkts der vorigen Seite
+            sort: Sortierfeld aus PRODUCT_SORT_FIELDS
+            descending: Absteigend sortieren
+            category: Nur Produkte dieser Kategorie
+            low_stock: Nur Produkte unter Mindestbestand
+            query: Nur Produkte, deren Name, SKU oder Beschreibung den Text enthält
+
+        Raises:
+            ValueError: bei unbekanntem Sortierfeld oder ungültigem Cursor
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def product_cursor(product: Product, sort: str = "id") -> str:
+        """Cursor für die nächste Seite nach diesem Produkt (URL-tauglich)"""
+        raw = json.dumps([sort, getattr(product, sort), product.id], separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def parse_product_cursor(cursor: str, sort: str = "id") -> Tuple[object, str]:
+        """
+        Cursor in (Wert des Sortierfelds, Produkt-ID) zerlegen
+
+        Raises:
+            ValueError: bei ungültigem Cursor oder Cursor einer anderen Sortierung
+        """
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            cursor_sort, value, product_id = json.loads(raw)
+        except (ValueError, TypeError):
+            raise ValueError(f"Ungültiger Produkt-Cursor: {cursor}") from None
+        if cursor_sort != sort or not isinstance(product_id, str):
+            raise ValueError(f"Cursor passt nicht zur Sortierung {sort}")
+        # Text für id/name, sonst Zahl (Python kann Text und Zahl nicht vergleichen)
+        expected = str if sort in ("id", "name") else (int, float)
+        if not isinstance(value, expected) or isinstance(value, bool):
+            raise ValueError(f"Ungültiger Produkt-Cursor: {cursor}")
+        return value, product_id
+
+    @abstractmethod
+    def load_inventory_stats(self) -> Dict:
+        """
+        Kennzahlen des Sortiments in einem Durchlauf berechnen, ohne alle
+        Produkte als Product-Objekte zu laden
+
+        Returns:
+            Dict mit total_products, total_warehouse_value, total_shop_value,
+            warehouse_product_count, shop_product_count, low_stock_count,
+            categories (Kategorie -> Anzahl Produkte, ohne leere Kategorie)
+            und most_valuable_product_id (None bei leerem Sortiment)
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def load_inventory_totals(self) -> Dict:
+        """
+        Laufende Summen der Bestandswerte (werden bei jeder Änderung per Delta
+        fortgeschrieben, kein Durchlauf über die Produkte)
+
+        Returns:
+            Dict mit total_warehouse_value und total_shop_value
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def reconcile_inventory_totals(self) -> Dict:
+        """
+        Laufende Summen gegen eine vollständige Neuberechnung prüfen und auf
+        die neu berechneten Werte zurücksetzen
+
+        Returns:
+            Dict mit total_warehouse_value und total_shop_value (neu berechnet)
+            sowie warehouse_drift und shop_drift (laufende Summe minus Neuberechnung)
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def load_low_stock_products(self, limit: Optional[int] = None) -> List[Product]:
+        """Produkte unter Mindestbestand, kritischste (kleinster Lagerbestand) zuerst"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def count_low_stock_products(self) -> int:
+        """Anzahl Produkte unter Mindestbestand"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def load_products_by_category(self, category: str) -> List[Product]:
+        """Alle Produkte einer Kategorie (in Speicherreihenfolge)"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def load_categories(self) -> List[str]:
+        """Alle vorkommenden Kategorien, alphabetisch (ohne leere Kategorie)"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def search_products(self, query: str, limit: Optional[int] = None) -> List[Product]:
+        """
+        Produkte, deren Name, SKU oder Beschreibung den Suchtext enthält
+        (ohne Groß-/Kleinschreibung), beste Treffer zuerst
+
+        Treffer im Namen zählen mehr als in SKU oder Beschreibung,
+        Treffer am Anfang eines Felds mehr als mittendrin.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def delete_product(self, product_id: str) -> None:
         """Produkt löschen"""
@@ -36,10 +179,139 @@ class RepositoryPort(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def load_movements(self) -> List[Movement]:
-        """Alle Lagerbewegungen laden"""
+    def save_movements(self, movements: Iterable[Movement]) -> int:
+        """
+        Viele Lagerbewegungen in einer Transaktion speichern (alles oder nichts)
+
+        Returns:
+            Anzahl gespeicherter Bewegungen
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def load_movements(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        product_id: Optional[str] = None,
+        movement_type: Optional[str] = None,
+        limit: Optional[int] = None,
+        after_cursor: Optional[str] = None,
+        newest_first: bool = False,
+    ) -> List[Movement]:
+        """
+        Lagerbewegungen laden, sortiert nach Zeitstempel (bei Gleichstand in Speicherreihenfolge)
+
+        Args:
+            since: Nur Bewegungen ab diesem Zeitpunkt (inklusive)
+            until: Nur Bewegungen vor diesem Zeitpunkt (exklusive)
+            product_id: Nur Bewegungen dieses Produkts
+            movement_type: Nur Bewegungen dieses Typs (z.B. "SOLD")
+            limit: Maximale Anzahl (eine Seite)
+            after_cursor: Cursor der letzten Bewegung der vorherigen Seite (Keyset-Pagination)
+            newest_first: Neueste Bewegungen zuerst
+
+        Returns:
+            Liste von Movement-Objekten
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def iter_movements(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        product_id: Optional[str] = None,
+        movement_type: Optional[str] = None,
+        limit: Optional[int] = None,
+        after_cursor: Optional[str] = None,
+        newest_first: bool = False,
+    ) -> Iterator[Movement]:
+        """
+        Wie load_movements, liefert die Bewegungen aber einzeln (Generator),
+        sodass auch sehr lange Historien mit konstantem Speicher verarbeitet werden
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def load_movement_columns(
+        self, since: Optional[datetime] = None, until: Optional[datetime] = None
+    ) -> MovementColumns:
+        """
+        Bewegungen im Zeitfenster spaltenweise (Zeitstempel, Produkt, Menge, Typ)
+        für Auswertungen, ohne Movement-Objekte zu erzeugen
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def movement_cursor(movement: Movement) -> str:
+        """Cursor für die nächste Seite nach dieser Bewegung"""
+        return f"{movement.timestamp.isoformat()}|{movement.id}"
+
+    @staticmethod
+    def parse_movement_cursor(cursor: str) -> Tuple[datetime, str]:
+        """
+        Cursor in (Zeitstempel, Bewegungs-ID) zerlegen
+
+        Raises:
+            ValueError: bei ungültigem Cursor
+        """
+        try:
+            timestamp, movement_id = cursor.split("|", 1)
+            return datetime.fromisoformat(timestamp), movement_id
+        except ValueError:
+            raise ValueError(f"Ungültiger Bewegungs-Cursor: {cursor}") from None
+
+    @abstractmethod
+    def transaction(self) -> ContextManager[None]:
+        """
+        Unit of Work: alle Zugriffe im with-Block werden gemeinsam
+        übernommen oder bei einer Exception komplett verworfen
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def adjust_stock(
+        self, product_id: str, warehouse_delta: int = 0, shop_delta: int = 0
+    ) -> Optional[Product]:
+        """
+        Lager- und Shopbestand atomar um die angegebenen Mengen ändern
+
+        Returns:
+            Aktualisiertes Produkt oder None, wenn das Produkt fehlt
+            oder ein Bestand negativ würde (dann bleibt alles unverändert)
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def adjust_stocks(self, deltas: Dict[str, Tuple[int, int]]) -> Optional[Dict[str, Product]]:
+        """
+        Bestände mehrerer Produkte atomar ändern (alles oder nichts)
+
+        Args:
+            deltas: Produkt-ID -> (Änderung Lagerbestand, Änderung Shopbestand)
+
+        Returns:
+            Produkt-ID -> aktualisiertes Produkt, oder None, wenn ein Produkt
+            fehlt oder ein Bestand negativ würde (dann bleibt alles unverändert)
+        """
         raise NotImplementedError
 
+    def load_data_version(self) -> Optional[int]:
+        """
+        Zähler, der sich bei jeder committeten Änderung an Produkten ändert
+
+        Auch Änderungen anderer Prozesse an derselben Datenbank zählen mit;
+        Caches erkennen daran veraltete Einträge.
+
+        Returns:
+            Aktueller Stand oder None, wenn das Repository keinen Zähler führt
+        """
+        return None
+
+    def close(self) -> None:
+        """Offene Ressourcen (z.B. Datenbankverbindungen) freigeben"""
+
 
 class ReportPort(ABC):
     """Port für Report-Generierung"""
@@ -53,3 +325,23 @@ class ReportPort(ABC):
     def generate_movement_report(self) -> str:
         """Bewegungsprotokoll generieren"""
         raise NotImplementedError
+
+    @abstractmethod
+    def iter_inventory_report(self) -> Iterator[str]:
+        """Lagerbestandsbericht stückweise generieren (zusammengefügt = generate_inventory_report)"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def iter_movement_report(self) -> Iterator[str]:
+        """Bewegungsprotokoll stückweise generieren (zusammengefügt = generate_movement_report)"""
+        raise NotImplementedError
+
+    def write_inventory_report(self, stream: TextIO) -> None:
+        """Lagerbestandsbericht direkt in eine Datei o.ä. schreiben"""
+        for chunk in self.iter_inventory_report():
+            stream.write(chunk)
+
+    def write_movement_report(self, stream: TextIO) -> None:
+        """Bewegungsprotokoll direkt in eine Datei o.ä. schreiben"""
+        for chunk in self.iter_movement_report():
+            stream.write(chunk)
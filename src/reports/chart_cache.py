@@ -0,0 +1,163 @@
+"""Chart-Cache - gerenderte Charts nach Fingerabdruck der Datenreihen"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple, Union
+
+# Erhöhen, wenn sich das Aussehen der Charts ändert (macht alte Einträge ungültig)
+CHART_STYLE_VERSION = 1
+
+
+def chart_fingerprint(name: str, series) -> str:
+    """
+    Fingerabdruck eines Charts aus Name und aggregierten Datenreihen
+
+    Args:
+        name: Name des Charts (z.B. "movement_timeline")
+        series: JSON-serialisierbare Datenreihen, aus denen der Chart gezeichnet wird
+
+    Returns:
+        SHA-256 als Hex-String
+    """
+    payload = json.dumps([CHART_STYLE_VERSION, name, series], separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ChartCache:
+    """
+    Cache für gerenderte Charts (PNG-Bytes) nach Fingerabdruck.
+
+    Schlüssel ist chart_fingerprint(name, series): gleiche Datenreihen
+    ergeben denselben Chart, egal wie viele Bewegungen dahinterstehen.
+    Im Speicher werden höchstens max_entries Charts gehalten (LRU),
+    Einträge älter als ttl Sekunden werden verworfen.
+
+    Mit directory werden die Charts zusätzlich als <fingerabdruck>.png
+    abgelegt und überstehen so einen Neustart; auch dort gelten
+    max_entries und ttl (Alter nach Änderungszeit der Datei).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 64,
+        ttl: Optional[float] = None,
+        directory: Optional[Union[str, Path]] = None,
+    ):
+        """
+        Args:
+            max_entries: Maximale Anzahl Charts (im Speicher und auf der Platte)
+            ttl: Lebensdauer eines Eintrags in Sekunden (None = unbegrenzt)
+            directory: Verzeichnis für den Platten-Cache (None = nur im Speicher)
+
+        Raises:
+            ValueError: wenn max_entries kleiner als 1 oder ttl nicht positiv ist
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries muss mindestens 1 sein")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl muss positiv sein")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.directory = Path(directory) if directory is not None else None
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # Fingerabdruck -> (PNG-Bytes, Zeitpunkt des Renderns per time.time())
+        self._entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+
+    def _expired(self, created: float) -> bool:
+        return self.ttl is not None and time.time() - created > self.ttl
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.png"
+
+    def _load_from_disk(self, key: str) -> Optional[Tuple[bytes, float]]:
+        path = self._path(key)
+        try:
+            created = path.stat().st_mtime
+            if self._expired(created):
+                path.unlink(missing_ok=True)
+                return None
+            return path.read_bytes(), created
+        except FileNotFoundError:
+            return None
+
+    def _store_on_disk(self, key: str, png: bytes) -> None:
+        # Erst in eine temporäre Datei schreiben, damit parallele Leser nie halbe Dateien sehen
+        temporary = self._path(key).with_suffix(f".{threading.get_ident()}.tmp")
+        temporary.write_bytes(png)
+        temporary.replace(self._path(key))
+
+        files = sorted(self.directory.glob("*.png"), key=lambda p: p.stat().st_mtime)
+        for path in files[: max(0, len(files) - self.max_entries)]:
+            path.unlink(missing_ok=True)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Gecachten Chart liefern (None bei Fehlzugriff oder abgelaufenem Eintrag)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry[1]):
+                del self._entries[key]
+                entry = None
+            if entry is None and self.directory is not None:
+                entry = self._load_from_disk(key)
+                if entry is not None:
+                    self._remember(key, entry)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: str, png: bytes) -> None:
+        """Gerenderten Chart speichern (verdrängt ggf. den ältesten Eintrag)"""
+        with self._lock:
+            self._remember(key, (png, time.time()))
+            if self.directory is not None:
+                self._store_on_disk(key, png)
+
+    def _remember(self, key: str, entry: Tuple[bytes, float]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get_or_render(self, key: str, render: Callable[[], bytes]) -> bytes:
+        """
+        Chart aus dem Cache oder frisch gerendert
+
+        render läuft außerhalb des Locks; rendern zwei Threads denselben
+        Chart gleichzeitig, gewinnt der zuletzt gespeicherte (gleicher Inhalt).
+        """
+        png = self.get(key)
+        if png is None:
+            png = render()
+            self.put(key, png)
+        return png
+
+    def clear(self) -> None:
+        """Alle Einträge verwerfen (auch auf der Platte)"""
+        with self._lock:
+            self._entries.clear()
+            if self.directory is not None:
+                for path in self.directory.glob("*.png"):
+                    path.unlink(missing_ok=True)
+
+    def cache_info(self) -> Dict:
+        """Trefferstatistik und Füllstand des Caches"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "directory": str(self.directory) if self.directory is not None else None,
+            }
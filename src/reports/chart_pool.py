@@ -0,0 +1,113 @@
+"""Chart-Pool - Report-Charts parallel in Worker-Prozessen rendern"""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from threading import BrokenBarrierError
+from typing import Dict, Optional
+
+
+# Barriere zum Start aller Worker und Wartezeit daran (werden im Worker vom Initializer gesetzt)
+_start_barrier = None
+_start_timeout = None
+
+
+def _warm_worker(barrier, timeout: float) -> None:
+    """Initializer: matplotlib mit Agg-Backend laden und einmal rendern (Font-Cache)"""
+    global _start_barrier, _start_timeout
+    _start_barrier = barrier
+    _start_timeout = timeout
+    from . import charts
+
+    charts.render_png("warehouse_vs_shop", [1, 1])
+
+
+def _worker_started() -> int:
+    """Warten, bis alle Worker aufgewärmt sind (jeder Worker übernimmt genau einen Aufruf)"""
+    _start_barrier.wait(_start_timeout)
+    return os.getpid()
+
+
+def _render(name: str, series) -> bytes:
+    from . import charts
+
+    return charts.render_png(name, series)
+
+
+class ChartRenderPool:
+    """
+    Prozesspool zum parallelen Rendern von Report-Charts.
+
+    matplotlib hält beim Zeichnen den GIL, Threads bringen daher nichts.
+    Die Worker importieren matplotlib beim Start (Agg-Backend) und
+    rendern einmal zum Aufwärmen; an sie gehen nur Chart-Name und die
+    aggregierten Datenreihen, zurück kommen die PNG-Bytes.
+
+    Standardmäßig werden Worker per "spawn" gestartet, damit kein Zustand
+    (Datenbankverbindungen, Locks anderer Threads) in die Kindprozesse
+    kopiert wird.
+
+    Lohnt sich nur, wenn mehrere Charts auf einmal gerendert werden
+    (ReportB.render_charts/generate_full_report mit PNG-Charts); die
+    Web-App rendert einzelne Charts pro Request und nutzt keinen Pool.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        start_method: Optional[str] = "spawn",
+        start_timeout: float = 60.0,
+    ):
+        """
+        Args:
+            max_workers: Anzahl Worker-Prozesse
+            start_method: multiprocessing-Startmethode (None = Standard der Plattform)
+            start_timeout: Sekunden, bis alle Worker gestartet und aufgewärmt sein müssen
+
+        Raises:
+            ValueError: wenn max_workers kleiner als 1 ist
+            RuntimeError: wenn nicht alle Worker rechtzeitig starten (Pool wird beendet)
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers muss mindestens 1 sein")
+        self.max_workers = max_workers
+        context = multiprocessing.get_context(start_method)
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=context,
+            initializer=_warm_worker,
+            initargs=(context.Barrier(max_workers), start_timeout),
+        )
+        # Alle Worker jetzt starten und aufwärmen, nicht erst beim ersten Report
+        futures = [self._executor.submit(_worker_started) for _ in range(max_workers)]
+        deadline = time.monotonic() + start_timeout
+        try:
+            self.worker_pids = {
+                future.result(timeout=max(0.0, deadline - time.monotonic())) for future in futures
+            }
+        except (BrokenBarrierError, BrokenProcessPool, FuturesTimeoutError) as exc:
+            # Ein Worker startet nicht: die übrigen warten sonst für immer an der Barriere
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            raise RuntimeError(
+                f"Chart-Worker nicht innerhalb von {start_timeout:g}s gestartet: {exc!r}"
+            ) from exc
+
+    def render(self, jobs: Dict[str, object]) -> Dict[str, bytes]:
+        """
+        Mehrere Charts gleichzeitig rendern
+
+        Args:
+            jobs: Chart-Name -> aggregierte Datenreihen
+
+        Returns:
+            Chart-Name -> PNG-Bytes
+        """
+        futures = {name: self._executor.submit(_render, name, series) for name, series in jobs.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+    def shutdown(self) -> None:
+        """Worker-Prozesse beenden"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,166 @@
+"""Charts für Report B - Zeichnen aus aggregierten Datenreihen"""
+
+import io
+from typing import Callable, Dict
+
+import matplotlib.pyplot as plt
+from matplotlib import rcParams
+from matplotlib.ticker import MaxNLocator
+
+# Matplotlib auf non-interactive backend setzen für Web-Nutzung
+plt.switch_backend('Agg')
+rcParams['figure.figsize'] = (12, 6)
+rcParams['font.size'] = 9
+
+
+def draw_movement_timeline(series) -> "plt.Figure":
+    """Lagerbewegungen pro Tag (series: [Tage, Anzahl])"""
+    dates, counts = series
+    fig, ax = plt.subplots(figsize=(12, 6))
+
+    # Chart zeichnen
+    ax.plot(dates, counts, marker='o', linestyle='-', linewidth=2, markersize=6, color='steelblue')
+    ax.fill_between(range(len(dates)), counts, alpha=0.3, color='steelblue')
+
+    ax.set_xlabel('Datum', fontweight='bold')
+    ax.set_ylabel('Anzahl Bewegungen', fontweight='bold')
+    ax.set_title('Lagerbewegungen pro Tag', fontweight='bold', fontsize=12)
+    ax.grid(True, alpha=0.3)
+    ax.yaxis.set_major_locator(MaxNLocator(integer=True))
+
+    # X-Achse formatieren
+    if len(dates) > 1:
+        ax.set_xticks(range(0, len(dates), max(1, len(dates) // 10)))
+        ax.set_xticklabels([dates[i] for i in range(0, len(dates), max(1, len(dates) // 10))], rotation=45)
+
+    plt.tight_layout()
+    return fig
+
+
+def draw_movement_types(series) -> "plt.Figure":
+    """Lagerbewegungen nach Typ (series: [Typ-Bezeichnungen, Anzahl])"""
+    types, counts = series
+    fig, ax = plt.subplots(figsize=(10, 6))
+
+    colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A', '#98D8C8', '#F7DC6F']
+
+    bars = ax.bar(types, counts, color=colors[:len(types)], edgecolor='black', linewidth=1.5)
+
+    # Beschriftungen auf Balken
+    for bar, count in zip(bars, counts):
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width() / 2., height,
+               f'{int(count)}',
+               ha='center', va='bottom', fontweight='bold')
+
+    ax.set_ylabel('Anzahl', fontweight='bold')
+    ax.set_title('Lagerbewegungen nach Typ', fontweight='bold', fontsize=12)
+    ax.grid(True, alpha=0.3, axis='y')
+    ax.yaxis.set_major_locator(MaxNLocator(integer=True))
+    plt.xticks(rotation=45, ha='right')
+
+    plt.tight_layout()
+    return fig
+
+
+def draw_movement_quantity(series) -> "plt.Figure":
+    """Kumulierte Bewegungsmengen pro Tag (series: [Tage, kumulierte Menge])"""
+    dates, cumulative = series
+    fig, ax = plt.subplots(figsize=(12, 6))
+
+    ax.plot(dates, cumulative, marker='o', linestyle='-', linewidth=2.5, markersize=6,
+           color='#2ecc71', label='Kumulativ')
+    ax.fill_between(range(len(dates)), cumulative, alpha=0.3, color='#2ecc71')
+
+    # Nulllinie
+    ax.axhline(y=0, color='red', linestyle='--', linewidth=1, alpha=0.5)
+
+    ax.set_xlabel('Datum', fontweight='bold')
+    ax.set_ylabel('Kumulierte Menge', fontweight='bold')
+    ax.set_title('Kumulierte Bestands-Bewegungen', fontweight='bold', fontsize=12)
+    ax.grid(True, alpha=0.3)
+    ax.legend()
+
+    if len(dates) > 1:
+        ax.set_xticks(range(0, len(dates), max(1, len(dates) // 10)))
+        ax.set_xticklabels([dates[i] for i in range(0, len(dates), max(1, len(dates) // 10))], rotation=45)
+
+    plt.tight_layout()
+    return fig
+
+
+def draw_inventory_value(series) -> "plt.Figure":
+    """Bestandswert nach Kategorie (series: [Kategorien, Werte])"""
+    categories, values = series
+    fig, ax = plt.subplots(figsize=(10, 6))
+
+    colors = plt.cm.Set3(range(len(categories)))
+
+    wedges, texts, autotexts = ax.pie(values, labels=categories, autopct='%1.1f%%',
+                                       colors=colors, startangle=90, textprops={'fontsize': 9})
+
+    # Farbliche Hervorhebung anpassen
+    for autotext in autotexts:
+        autotext.set_color('white')
+        autotext.set_fontweight('bold')
+
+    ax.set_title('Bestandswert nach Kategorie', fontweight='bold', fontsize=12)
+
+    plt.tight_layout()
+    return fig
+
+
+def draw_warehouse_vs_shop(series) -> "plt.Figure":
+    """Bestand Lager vs. Shop (series: [Lagermenge, Shopmenge])"""
+    quantities = list(series)
+    fig, ax = plt.subplots(figsize=(8, 6))
+
+    locations = ['Lager', 'Shop']
+    colors = ['#3498db', '#e74c3c']
+
+    bars = ax.bar(locations, quantities, color=colors, edgecolor='black', linewidth=2)
+
+    # Beschriftungen auf Balken
+    for bar, qty in zip(bars, quantities):
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width() / 2., height,
+               f'{int(qty)}',
+               ha='center', va='bottom', fontweight='bold', fontsize=12)
+
+    ax.set_ylabel('Menge', fontweight='bold')
+    ax.set_title('Bestand: Lager vs. Shop', fontweight='bold', fontsize=12)
+    ax.grid(True, alpha=0.3, axis='y')
+
+    plt.tight_layout()
+    return fig
+
+
+# Chart-Name -> Zeichenfunktion
+DRAWERS: Dict[str, Callable] = {
+    "movement_timeline": draw_movement_timeline,
+    "movement_types": draw_movement_types,
+    "movement_quantity": draw_movement_quantity,
+    "inventory_value": draw_inventory_value,
+    "warehouse_vs_shop": draw_warehouse_vs_shop,
+}
+
+
+def fig_to_png(fig) -> bytes:
+    """
+    Matplotlib Figure als PNG rendern und schließen
+
+    Args:
+        fig: Matplotlib Figure-Objekt
+
+    Returns:
+        PNG-Bytes
+    """
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=100, bbox_inches='tight')
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+def render_png(name: str, series) -> bytes:
+    """Chart zeichnen und als PNG liefern (läuft auch in Worker-Prozessen)"""
+    return fig_to_png(DRAWERS[name](series))
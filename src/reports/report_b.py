@@ -1,35 +1,178 @@
 """Report B - Bewegungsprotokoll und Lagerverlauf-Statistiken"""
 
-import io
 import base64
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
-from collections import defaultdict, Counter
+from functools import cached_property
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+from collections import defaultdict, deque
 
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from matplotlib import rcParams
-from matplotlib.ticker import MaxNLocator
+import numpy as np
 
-# Matplotlib auf non-interactive backend setzen für Web-Nutzung
-plt.switch_backend('Agg')
-rcParams['figure.figsize'] = (12, 6)
-rcParams['font.size'] = 9
+from ..domain.movement_columns import MICROSECONDS_PER_DAY, EPOCH, MovementColumns, from_epoch_us
+from .chart_cache import ChartCache, chart_fingerprint
+from .chart_pool import ChartRenderPool
+from .svg_charts import chart_data, render_svg
 
+# So viele neueste Bewegungen merkt sich der Durchlauf für get_movement_details
+DETAIL_TAIL = 50
+
+
+@dataclass
+class _MovementPass:
+    """Ergebnis des einen Durchlaufs über die Bewegungen"""
+
+    columns: MovementColumns  # die durchlaufenen Bewegungen, chronologisch
+    product_names: List[str]  # pro Zeile von columns (für get_movements_by_product)
+    reasons: List[Optional[str]]  # pro Zeile von columns
+    newest: deque  # letzte DETAIL_TAIL Bewegungen, älteste zuerst
 
-class ReportB:
-    """Report B: Bewegungsprotokoll und Lagerverlauf-Statistiken"""
 
-    def __init__(self, movements: List, products: List[Dict]):
+@dataclass
+class _ProductPass:
+    """Ergebnis des einen Durchlaufs über die Produkte"""
+
+    inventory_statistics: Dict
+    category_statistics: List[Dict]
+
+
+class ReportB:
+    """
+    Report B: Bewegungsprotokoll und Lagerverlauf-Statistiken
+
+    Bewegungen und Produkte werden jeweils höchstens einmal durchlaufen:
+    Der erste Zugriff sammelt alle Gruppierungen (Spalten, Namen und Gründe
+    pro Zeile, neueste Bewegungen bzw. Bestands- und Kategoriekennzahlen),
+    alle weiteren Auswertungen und Charts nutzen das gespeicherte Ergebnis;
+    auch get_movements_by_product gruppiert nur die Zeilen dieses Durchlaufs
+    nach ihrem Produkt-Code. Werden Spalten und neueste Bewegungen übergeben,
+    liest der vollständige Report die Bewegungen gar nicht.
+    Die gelieferten Dicts/Listen werden geteilt und dürfen nicht verändert
+    werden.
+    """
+
+    # Chart-Name -> Methode, die ihn als Base64-PNG liefert
+    CHARTS = {
+        "movement_timeline": "generate_movement_chart",
+        "movement_types": "generate_movement_type_chart",
+        "movement_quantity": "generate_movement_quantity_chart",
+        "inventory_value": "generate_inventory_value_chart",
+        "warehouse_vs_shop": "generate_warehouse_vs_shop_chart",
+    }
+    # Charts, die nur aus den Bewegungen gezeichnet werden
+    MOVEMENT_CHARTS = ("movement_timeline", "movement_types", "movement_quantity")
+
+    def __init__(
+        self,
+        movements: Union[List, Callable[[], Iterable]],
+        products: List[Dict],
+        recent_movements: Optional[List] = None,
+        since: Optional[datetime] = None,
+        columns: Optional[MovementColumns] = None,
+        chart_cache: Optional[ChartCache] = None,
+        render_pool: Optional[ChartRenderPool] = None,
+    ):
         """
         Initialisiere Report B
 
         Args:
-            movements: Liste von Movement-Objekten
+            movements: Liste von Movement-Objekten (Zeitfenster des Reports) oder
+                eine Funktion ohne Argumente, die bei jedem Aufruf einen neuen,
+                chronologisch sortierten Iterator liefert (z.B.
+                lambda: service.iter_movements(since=since)). Dann wird die
+                Historie nie komplett in den Speicher geladen.
             products: Liste von Product-Dicts mit Bestandsinformationen
+            recent_movements: Neueste Bewegungen zuerst (z.B. load_movements(limit=50,
+                newest_first=True)); ohne Angabe werden sie aus movements entnommen
+            since: Beginn des Zeitfensters (None = gesamte Historie)
+            columns: Dieselben Bewegungen spaltenweise (load_movement_columns);
+                ohne Angabe werden sie einmalig aus movements aufgebaut
+            chart_cache: Cache für gerenderte Charts (None = immer neu rendern)
+            render_pool: Prozesspool, in dem mehrere Charts gleichzeitig gerendert
+                werden (None = nacheinander in diesem Prozess)
         """
-        self.movements = sorted(movements, key=lambda m: m.timestamp) if movements else []
+        if callable(movements):
+            self._movement_source = movements
+            self.movements = None
+        else:
+            self._movement_source = None
+            self.movements = sorted(movements, key=lambda m: m.timestamp) if movements else []
         self.products = {p['id']: p for p in products} if products else {}
+        self.recent_movements = recent_movements
+        self.since = since
+        self._columns = columns
+        self.chart_cache = chart_cache
+        self.render_pool = render_pool
+
+    def _iter_movements(self) -> Iterable:
+        """Bewegungen chronologisch durchlaufen (gestreamt oder aus der Liste)"""
+        if self._movement_source is not None:
+            return self._movement_source()
+        return self.movements
+
+    @cached_property
+    def _movement_pass(self) -> _MovementPass:
+        """Alle Gruppierungen in einem Durchlauf über die Bewegungen"""
+        columns = MovementColumns()
+        product_names = []
+        reasons = []
+        newest = deque(maxlen=DETAIL_TAIL)
+
+        for movement in self._iter_movements():
+            columns.append(movement)
+            product_names.append(movement.product_name)
+            reasons.append(movement.reason)
+            newest.append(movement)
+
+        return _MovementPass(
+            columns=columns, product_names=product_names, reasons=reasons, newest=newest
+        )
+
+    @cached_property
+    def _column_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, MovementColumns]:
+        """Zeitstempel (µs), Mengen und Typ-Codes als NumPy-Arrays (ohne Kopie)"""
+        columns = self._columns if self._columns is not None else self._movement_pass.columns
+        return (
+            np.frombuffer(columns.timestamps, dtype=np.int64),
+            np.frombuffer(columns.quantities, dtype=np.int64),
+            np.frombuffer(columns.type_codes, dtype=np.int16),
+            columns,
+        )
+
+    @cached_property
+    def _daily_series(self) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """
+        Bewegungen pro Tag gruppieren (vektorisiert)
+
+        Returns:
+            Tage mit Bewegungen ("%Y-%m-%d", aufsteigend), Anzahl und Mengensumme pro Tag
+        """
+        timestamps, quantities, _, _ = self._column_arrays
+        if not len(timestamps):
+            return [], np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+        days = timestamps // MICROSECONDS_PER_DAY
+        first_day = int(days.min())
+        offsets = days - first_day
+        counts = np.bincount(offsets)
+        present = np.flatnonzero(counts)
+        sums = np.bincount(offsets, weights=quantities)[present].astype(np.int64)
+        dates = [
+            (EPOCH + timedelta(days=first_day + int(offset))).strftime("%Y-%m-%d")
+            for offset in present
+        ]
+        return dates, counts[present], sums
+
+    @cached_property
+    def _type_counts(self) -> Dict[str, int]:
+        """Anzahl Bewegungen pro Typ (in Reihenfolge des ersten Auftretens)"""
+        _, _, type_codes, columns = self._column_arrays
+        counts = np.bincount(type_codes, minlength=len(columns.movement_types))
+        return {
+            movement_type: int(count)
+            for movement_type, count in zip(columns.movement_types, counts)
+            if count
+        }
 
     # ===== BEWEGUNGSPROTOKOLL ANALYSEN =====
 
@@ -40,7 +183,14 @@ class ReportB:
         Returns:
             Dictionary mit Bewegungsstatistiken
         """
-        if not self.movements:
+        return self._movement_summary
+
+    @cached_property
+    def _movement_summary(self) -> Dict:
+        timestamps, quantities, _, _ = self._column_arrays
+        total = len(timestamps)
+
+        if total == 0:
             return {
                 "total_movements": 0,
                 "by_type": {},
@@ -50,49 +200,57 @@ class ReportB:
                 "net_flow": 0,
             }
 
-        movement_types = Counter()
-        by_date = defaultdict(int)
-        total_in = 0
-        total_out = 0
-
-        for movement in self.movements:
-            movement_types[movement.movement_type] += 1
-            date_str = movement.timestamp.strftime("%Y-%m-%d")
-            by_date[date_str] += 1
-
-            if movement.quantity_change > 0:
-                total_in += movement.quantity_change
-            else:
-                total_out += abs(movement.quantity_change)
+        total_in = int(quantities[quantities > 0].sum())
+        total_out = int(-quantities[quantities < 0].sum())
+        dates, counts, _ = self._daily_series
 
         return {
-            "total_movements": len(self.movements),
-            "by_type": dict(movement_types),
-            "by_date": dict(sorted(by_date.items())),
+            "total_movements": total,
+            "by_type": self._type_counts,
+            "by_date": dict(zip(dates, counts.tolist())),
             "total_items_in": total_in,
             "total_items_out": total_out,
             "net_flow": total_in - total_out,
-            "first_date": self.movements[0].timestamp if self.movements else None,
-            "last_date": self.movements[-1].timestamp if self.movements else None,
+            "first_date": from_epoch_us(timestamps.min()),
+            "last_date": from_epoch_us(timestamps.max()),
         }
 
     def get_movements_by_product(self) -> Dict[str, List]:
         """
         Lagerbewegungen nach Produkt gruppieren
 
+        Gruppiert die Zeilen des gemeinsamen Durchlaufs nach Produkt-Code;
+        die Dicts pro Bewegung entstehen erst hier (nicht Teil von
+        generate_full_report).
+
         Returns:
             Dictionary mit Produkten und deren Bewegungen
         """
-        grouped = defaultdict(list)
-        for movement in self.movements:
-            grouped[movement.product_id].append({
-                "timestamp": movement.timestamp,
-                "product_name": movement.product_name,
-                "quantity_change": movement.quantity_change,
-                "movement_type": movement.movement_type,
-                "reason": movement.reason,
+        return self._movements_by_product
+
+    @cached_property
+    def _movements_by_product(self) -> Dict[str, List]:
+        movement_pass = self._movement_pass
+        columns = movement_pass.columns
+        # Codes werden beim ersten Auftreten vergeben: Reihenfolge wie bisher
+        groups = [[] for _ in columns.product_ids]
+        rows = zip(
+            columns.product_codes,
+            columns.timestamps,
+            columns.quantities,
+            columns.type_codes,
+            movement_pass.product_names,
+            movement_pass.reasons,
+        )
+        for product_code, timestamp_us, quantity, type_code, product_name, reason in rows:
+            groups[product_code].append({
+                "timestamp": from_epoch_us(timestamp_us),
+                "product_name": product_name,
+                "quantity_change": quantity,
+                "movement_type": columns.movement_types[type_code],
+                "reason": reason,
             })
-        return dict(grouped)
+        return dict(zip(columns.product_ids, groups))
 
     def get_movement_details(self, limit: int = 50) -> List[Dict]:
         """
@@ -104,8 +262,18 @@ class ReportB:
         Returns:
             Liste von Bewegungs-Dicts
         """
+        if self.recent_movements is not None:
+            newest_first = self.recent_movements[:limit]
+        elif self.movements is not None:
+            newest_first = reversed(self.movements[-limit:])
+        elif limit <= DETAIL_TAIL:
+            # Gestreamt: neueste Bewegungen aus dem gemeinsamen Durchlauf
+            newest_first = list(reversed(self._movement_pass.newest))[:limit]
+        else:
+            newest_first = reversed(deque(self._iter_movements(), maxlen=limit))
+
         movements_list = []
-        for movement in reversed(self.movements[-limit:]):
+        for movement in newest_first:
             movements_list.append({
                 "timestamp": movement.timestamp.strftime("%d.%m.%Y %H:%M:%S"),
                 "timestamp_iso": movement.timestamp.isoformat(),
@@ -141,30 +309,7 @@ class ReportB:
         Returns:
             Dictionary mit Lagerverlauf-Daten
         """
-        total_value = 0.0
-        by_category = defaultdict(float)
-        low_stock_count = 0
-
-        if self.products:
-            for product in self.products.values():
-                value = product.get("price", 0) * product.get("available_total", 0)
-                total_value += value
-
-                category = product.get("category", "Unbeantwortet")
-                by_category[category] += value
-
-                if product.get("is_low_stock", False):
-                    low_stock_count += 1
-
-        return {
-            "total_inventory_value": total_value,
-            "total_products": len(self.products),
-            "by_category": dict(sorted(by_category.items(), key=lambda x: x[1], reverse=True)),
-            "low_stock_count": low_stock_count,
-            "categories": list(by_category.keys()),
-            "total_warehouse_qty": sum(p.get("warehouse_qty", 0) for p in self.products.values()) if self.products else 0,
-            "total_shop_qty": sum(p.get("shop_qty", 0) for p in self.products.values()) if self.products else 0,
-        }
+        return self._product_pass.inventory_statistics
 
     def get_category_statistics(self) -> List[Dict]:
         """
@@ -173,77 +318,158 @@ class ReportB:
         Returns:
             Liste von Kategorie-Statistiken
         """
+        return self._product_pass.category_statistics
+
+    @cached_property
+    def _product_pass(self) -> _ProductPass:
+        """Bestands- und Kategoriekennzahlen in einem Durchlauf über die Produkte"""
+        total_value = 0.0
+        total_warehouse_qty = 0
+        total_shop_qty = 0
+        low_stock_count = 0
         by_category = defaultdict(lambda: {
             "count": 0,
             "total_qty": 0,
             "total_value": 0,
-            "products": [],
         })
 
         for product in self.products.values():
-            category = product.get("category", "Unbeantwortet")
-            by_category[category]["count"] += 1
-            by_category[category]["total_qty"] += product.get("available_total", 0)
-            by_category[category]["total_value"] += product.get("price", 0) * product.get("available_total", 0)
-            by_category[category]["products"].append({
-                "id": product.get("id"),
-                "name": product.get("name"),
-                "qty": product.get("available_total", 0),
-                "value": product.get("price", 0) * product.get("available_total", 0),
-            })
+            available = product.get("available_total", 0)
+            value = product.get("price", 0) * available
+            total_value += value
+            total_warehouse_qty += product.get("warehouse_qty", 0)
+            total_shop_qty += product.get("shop_qty", 0)
+
+            if product.get("is_low_stock", False):
+                low_stock_count += 1
+
+            stats = by_category[product.get("category", "Unbeantwortet")]
+            stats["count"] += 1
+            stats["total_qty"] += available
+            stats["total_value"] += value
 
-        result = []
-        for category, stats in sorted(by_category.items(), key=lambda x: x[1]["total_value"], reverse=True):
-            result.append({
+        ranked = sorted(by_category.items(), key=lambda x: x[1]["total_value"], reverse=True)
+
+        inventory_statistics = {
+            "total_inventory_value": total_value,
+            "total_products": len(self.products),
+            "by_category": {category: float(stats["total_value"]) for category, stats in ranked},
+            "low_stock_count": low_stock_count,
+            "categories": list(by_category.keys()),
+            "total_warehouse_qty": total_warehouse_qty,
+            "total_shop_qty": total_shop_qty,
+        }
+        category_statistics = [
+            {
                 "category": category,
                 "product_count": stats["count"],
                 "total_qty": stats["total_qty"],
                 "total_value": stats["total_value"],
                 "avg_value_per_product": stats["total_value"] / stats["count"] if stats["count"] > 0 else 0,
-            })
-
-        return result
+            }
+            for category, stats in ranked
+        ]
+        return _ProductPass(inventory_statistics, category_statistics)
 
     # ===== VISUALISIERUNGEN =====
 
-    def generate_movement_chart(self) -> str:
+    def chart_series(self, name: str) -> Optional[list]:
         """
-        Lagerbewegungen über Zeit visualisieren
+        Aggregierte Datenreihen, aus denen ein Chart gezeichnet wird
+
+        Args:
+            name: Schlüssel aus CHARTS
 
         Returns:
-            Base64 enkodiertes PNG-Chart
+            JSON-serialisierbare Datenreihen oder None, wenn der Chart keine Daten hat
+
+        Raises:
+            KeyError: wenn es keinen Chart mit diesem Namen gibt
         """
-        if not self.movements:
-            return ""
+        if name in ("movement_timeline", "movement_quantity"):
+            dates, daily_counts, daily_quantities = self._daily_series
+            if not dates:
+                return None
+            if name == "movement_timeline":
+                return [dates, daily_counts.tolist()]
+            return [dates, np.cumsum(daily_quantities).tolist()]
+
+        if name == "movement_types":
+            movement_types = self._type_counts
+            if not movement_types:
+                return None
+            return [
+                [self._get_movement_type_display(t) for t in movement_types.keys()],
+                list(movement_types.values()),
+            ]
+
+        if name not in self.CHARTS:
+            raise KeyError(name)
+        stats = self.get_inventory_statistics()
+        if name == "inventory_value":
+            by_category = stats.get("by_category", {})
+            return [list(by_category.keys()), list(by_category.values())] if by_category else None
+        return [stats.get("total_warehouse_qty", 0), stats.get("total_shop_qty", 0)]
+
+    def render_charts(self, names: Iterable[str]) -> Dict[str, bytes]:
+        """
+        Mehrere Charts als PNG-Bytes rendern
+
+        Charts aus dem Chart-Cache werden nicht neu gezeichnet. Mit render_pool
+        werden die übrigen gleichzeitig in Worker-Prozessen gerendert (auch
+        einzelne Charts: der GIL dieses Prozesses bleibt frei), sonst
+        nacheinander in diesem Prozess.
 
-        fig, ax = plt.subplots(figsize=(12, 6))
+        Args:
+            names: Schlüssel aus CHARTS
 
-        # Bewegungen pro Tag gruppieren
-        by_date = defaultdict(int)
-        for movement in self.movements:
-            date_str = movement.timestamp.strftime("%Y-%m-%d")
-            by_date[date_str] += 1
+        Returns:
+            Chart-Name -> PNG-Bytes (b"" für Charts ohne Daten)
+        """
+        rendered: Dict[str, bytes] = {}
+        pending: Dict[str, list] = {}
+        keys: Dict[str, str] = {}
+
+        for name in names:
+            series = self.chart_series(name)
+            if series is None:
+                rendered[name] = b""
+                continue
+            if self.chart_cache is not None:
+                keys[name] = chart_fingerprint(name, series)
+                png = self.chart_cache.get(keys[name])
+                if png is not None:
+                    rendered[name] = png
+                    continue
+            pending[name] = series
+
+        if pending:
+            if self.render_pool is not None:
+                fresh = self.render_pool.render(pending)
+            else:
+                # matplotlib erst beim ersten gerenderten Chart laden
+                from .charts import DRAWERS
 
-        dates = sorted(by_date.keys())
-        counts = [by_date[d] for d in dates]
+                fresh = {name: self._fig_to_png(DRAWERS[name](series)) for name, series in pending.items()}
+            for name, png in fresh.items():
+                if self.chart_cache is not None:
+                    self.chart_cache.put(keys[name], png)
+                rendered[name] = png
 
-        # Chart zeichnen
-        ax.plot(dates, counts, marker='o', linestyle='-', linewidth=2, markersize=6, color='steelblue')
-        ax.fill_between(range(len(dates)), counts, alpha=0.3, color='steelblue')
+        return rendered
 
-        ax.set_xlabel('Datum', fontweight='bold')
-        ax.set_ylabel('Anzahl Bewegungen', fontweight='bold')
-        ax.set_title('Lagerbewegungen pro Tag', fontweight='bold', fontsize=12)
-        ax.grid(True, alpha=0.3)
-        ax.yaxis.set_major_locator(MaxNLocator(integer=True))
+    def _render_chart(self, name: str) -> str:
+        """Einzelnen Chart als Base64-PNG ("" ohne Daten)"""
+        return base64.b64encode(self.render_charts([name])[name]).decode()
 
-        # X-Achse formatieren
-        if len(dates) > 1:
-            ax.set_xticks(range(0, len(dates), max(1, len(dates) // 10)))
-            ax.set_xticklabels([dates[i] for i in range(0, len(dates), max(1, len(dates) // 10))], rotation=45)
+    def generate_movement_chart(self) -> str:
+        """
+        Lagerbewegungen über Zeit visualisieren
 
-        plt.tight_layout()
-        return self._fig_to_base64(fig)
+        Returns:
+            Base64 enkodiertes PNG-Chart
+        """
+        return self._render_chart("movement_timeline")
 
     def generate_movement_type_chart(self) -> str:
         """
@@ -252,36 +478,7 @@ class ReportB:
         Returns:
             Base64 enkodiertes PNG-Chart
         """
-        if not self.movements:
-            return ""
-
-        movement_types = Counter()
-        for movement in self.movements:
-            movement_types[movement.movement_type] += 1
-
-        fig, ax = plt.subplots(figsize=(10, 6))
-
-        types = [self._get_movement_type_display(t) for t in movement_types.keys()]
-        counts = list(movement_types.values())
-        colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A', '#98D8C8', '#F7DC6F']
-
-        bars = ax.bar(types, counts, color=colors[:len(types)], edgecolor='black', linewidth=1.5)
-
-        # Beschriftungen auf Balken
-        for bar, count in zip(bars, counts):
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width() / 2., height,
-                   f'{int(count)}',
-                   ha='center', va='bottom', fontweight='bold')
-
-        ax.set_ylabel('Anzahl', fontweight='bold')
-        ax.set_title('Lagerbewegungen nach Typ', fontweight='bold', fontsize=12)
-        ax.grid(True, alpha=0.3, axis='y')
-        ax.yaxis.set_major_locator(MaxNLocator(integer=True))
-        plt.xticks(rotation=45, ha='right')
-
-        plt.tight_layout()
-        return self._fig_to_base64(fig)
+        return self._render_chart("movement_types")
 
     def generate_inventory_value_chart(self) -> str:
         """
@@ -290,30 +487,7 @@ class ReportB:
         Returns:
             Base64 enkodiertes PNG-Chart
         """
-        stats = self.get_inventory_statistics()
-        by_category = stats.get("by_category", {})
-
-        if not by_category:
-            return ""
-
-        fig, ax = plt.subplots(figsize=(10, 6))
-
-        categories = list(by_category.keys())
-        values = list(by_category.values())
-        colors = plt.cm.Set3(range(len(categories)))
-
-        wedges, texts, autotexts = ax.pie(values, labels=categories, autopct='%1.1f%%',
-                                           colors=colors, startangle=90, textprops={'fontsize': 9})
-
-        # Farbliche Hervorhebung anpassen
-        for autotext in autotexts:
-            autotext.set_color('white')
-            autotext.set_fontweight('bold')
-
-        ax.set_title('Bestandswert nach Kategorie', fontweight='bold', fontsize=12)
-
-        plt.tight_layout()
-        return self._fig_to_base64(fig)
+        return self._render_chart("inventory_value")
 
     def generate_warehouse_vs_shop_chart(self) -> str:
         """
@@ -322,31 +496,7 @@ class ReportB:
         Returns:
             Base64 enkodiertes PNG-Chart
         """
-        stats = self.get_inventory_statistics()
-        warehouse_qty = stats.get("total_warehouse_qty", 0)
-        shop_qty = stats.get("total_shop_qty", 0)
-
-        fig, ax = plt.subplots(figsize=(8, 6))
-
-        locations = ['Lager', 'Shop']
-        quantities = [warehouse_qty, shop_qty]
-        colors = ['#3498db', '#e74c3c']
-
-        bars = ax.bar(locations, quantities, color=colors, edgecolor='black', linewidth=2)
-
-        # Beschriftungen auf Balken
-        for bar, qty in zip(bars, quantities):
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width() / 2., height,
-                   f'{int(qty)}',
-                   ha='center', va='bottom', fontweight='bold', fontsize=12)
-
-        ax.set_ylabel('Menge', fontweight='bold')
-        ax.set_title('Bestand: Lager vs. Shop', fontweight='bold', fontsize=12)
-        ax.grid(True, alpha=0.3, axis='y')
-
-        plt.tight_layout()
-        return self._fig_to_base64(fig)
+        return self._render_chart("warehouse_vs_shop")
 
     def generate_movement_quantity_chart(self) -> str:
         """
@@ -355,86 +505,110 @@ class ReportB:
         Returns:
             Base64 enkodiertes PNG-Chart
         """
-        if not self.movements:
-            return ""
+        return self._render_chart("movement_quantity")
 
-        # Kumuliere Bewegungsmengen pro Tag
-        by_date = defaultdict(int)
-        for movement in self.movements:
-            date_str = movement.timestamp.strftime("%Y-%m-%d")
-            by_date[date_str] += movement.quantity_change
+    @staticmethod
+    def _fig_to_png(fig) -> bytes:
+        """Matplotlib Figure als PNG rendern und schließen"""
+        from .charts import fig_to_png
 
-        dates = sorted(by_date.keys())
-        quantities = [by_date[d] for d in dates]
+        return fig_to_png(fig)
 
-        # Kumulativ berechnen
-        cumulative = []
-        total = 0
-        for qty in quantities:
-            total += qty
-            cumulative.append(total)
+    @staticmethod
+    def _fig_to_base64(fig) -> str:
+        """
+        Matplotlib Figure in Base64 PNG konvertieren
 
-        fig, ax = plt.subplots(figsize=(12, 6))
+        Args:
+            fig: Matplotlib Figure-Objekt
 
-        ax.plot(dates, cumulative, marker='o', linestyle='-', linewidth=2.5, markersize=6,
-               color='#2ecc71', label='Kumulativ')
-        ax.fill_between(range(len(dates)), cumulative, alpha=0.3, color='#2ecc71')
+        Returns:
+            Base64 enkodierter PNG-String
+        """
+        return base64.b64encode(ReportB._fig_to_png(fig)).decode()
 
-        # Nulllinie
-        ax.axhline(y=0, color='red', linestyle='--', linewidth=1, alpha=0.5)
+    def has_chart(self, name: str) -> bool:
+        """Prüfen, ob der Chart Daten hat (ohne ihn zu rendern)"""
+        return self.chart_series(name) is not None
 
-        ax.set_xlabel('Datum', fontweight='bold')
-        ax.set_ylabel('Kumulierte Menge', fontweight='bold')
-        ax.set_title('Kumulierte Bestands-Bewegungen', fontweight='bold', fontsize=12)
-        ax.grid(True, alpha=0.3)
-        ax.legend()
+    def chart_png(self, name: str) -> Optional[bytes]:
+        """
+        Einzelnen Chart als PNG-Bytes (z.B. für eine eigene Bild-URL)
 
-        if len(dates) > 1:
-            ax.set_xticks(range(0, len(dates), max(1, len(dates) // 10)))
-            ax.set_xticklabels([dates[i] for i in range(0, len(dates), max(1, len(dates) // 10))], rotation=45)
+        Args:
+            name: Schlüssel aus CHARTS
 
-        plt.tight_layout()
-        return self._fig_to_base64(fig)
+        Returns:
+            PNG-Bytes oder None, wenn der Chart keine Daten hat
 
-    @staticmethod
-    def _fig_to_base64(fig) -> str:
+        Raises:
+            KeyError: wenn es keinen Chart mit diesem Namen gibt
         """
-        Matplotlib Figure in Base64 PNG konvertieren
+        if name not in self.CHARTS:
+            raise KeyError(name)
+        return self.render_charts([name])[name] or None
 
-        Args:
-            fig: Matplotlib Figure-Objekt
+    def chart_json(self, name: str) -> Optional[Dict]:
+        """
+        Chart als kompakte Datenreihen zum Zeichnen im Browser (ohne matplotlib)
 
         Returns:
-            Base64 enkodierter PNG-String
+            Dict mit Art, Beschriftung, labels und values (siehe svg_charts.chart_data)
+            oder None, wenn der Chart keine Daten hat
+        """
+        series = self.chart_series(name)
+        return chart_data(name, series) if series is not None else None
+
+    def chart_svg(self, name: str) -> Optional[str]:
         """
-        buffer = io.BytesIO()
-        fig.savefig(buffer, format='png', dpi=100, bbox_inches='tight')
-        buffer.seek(0)
-        image_base64 = base64.b64encode(buffer.read()).decode()
-        plt.close(fig)
-        return image_base64
+        Chart als handgebautes SVG (ohne matplotlib)
+
+        Returns:
+            SVG-Dokument oder None, wenn der Chart keine Daten hat
+        """
+        series = self.chart_series(name)
+        return render_svg(name, series) if series is not None else None
 
     # ===== REPORT ZUSAMMENSTELLUNG =====
 
-    def generate_full_report(self) -> Dict:
+    def generate_full_report(self, render_charts: bool = True, chart_format: str = "png") -> Dict:
         """
         Vollständigen Report B mit allen Daten und Visualisierungen generieren
 
+        Args:
+            render_charts: False = Charts nicht rendern, unter "charts" steht dann
+                nur, ob der jeweilige Chart Daten hat (Bilder kommen per chart_png)
+            chart_format: "png" (Base64, matplotlib), "svg" (SVG-Markup) oder
+                "json" (Datenreihen); Charts ohne Daten sind "" bzw. None
+
         Returns:
             Dictionary mit allen Report-Elementen
+
+        Raises:
+            ValueError: bei unbekanntem chart_format
         """
+        chart_names = ("movement_timeline", "movement_types", "inventory_value", "warehouse_vs_shop")
+        if not render_charts:
+            charts = {name: self.has_chart(name) for name in chart_names}
+        elif chart_format == "png":
+            charts = {
+                name: base64.b64encode(png).decode()
+                for name, png in self.render_charts(chart_names).items()
+            }
+        elif chart_format == "svg":
+            charts = {name: self.chart_svg(name) or "" for name in chart_names}
+        elif chart_format == "json":
+            charts = {name: self.chart_json(name) for name in chart_names}
+        else:
+            raise ValueError(f"Unbekanntes Chart-Format: {chart_format}")
+
         return {
             "title": "Report B - Bewegungsprotokoll & Lagerverlauf",
             "generated_at": datetime.now().strftime("%d.%m.%Y %H:%M:%S"),
+            "since": self.since.strftime("%d.%m.%Y") if self.since else None,
             "movement_summary": self.get_movement_summary(),
             "inventory_statistics": self.get_inventory_statistics(),
             "category_statistics": self.get_category_statistics(),
             "movement_details": self.get_movement_details(limit=50),
-            "movements_by_product": self.get_movements_by_product(),
-            "charts": {
-                "movement_timeline": self.generate_movement_chart(),
-                "movement_types": self.generate_movement_type_chart(),
-                "inventory_value": self.generate_inventory_value_chart(),
-                "warehouse_vs_shop": self.generate_warehouse_vs_shop_chart(),
-            },
+            "charts": charts,
         }
@@ -0,0 +1,226 @@
+"""Leichtgewichtige Charts für Report B - JSON-Datenreihen und handgebautes SVG (ohne matplotlib)"""
+
+import math
+from html import escape
+from typing import Dict, List
+
+WIDTH = 720
+HEIGHT = 360
+_MARGIN_LEFT = 64
+_MARGIN_RIGHT = 20
+_MARGIN_TOP = 40
+_MARGIN_BOTTOM = 80
+
+# Farben wie in den matplotlib-Charts (charts.py)
+_TYPE_COLORS = ["#FF6B6B", "#4ECDC4", "#45B7D1", "#FFA07A", "#98D8C8", "#F7DC6F"]
+_SET3 = [
+    "#8dd3c7", "#ffffb3", "#bebada", "#fb8072", "#80b1d3", "#fdb462",
+    "#b3de69", "#fccde5", "#d9d9d9", "#bc80bd", "#ccebc5", "#ffed6f",
+]
+
+# Chart-Name -> Art und Beschriftung
+CHART_SPECS: Dict[str, Dict] = {
+    "movement_timeline": {
+        "kind": "line", "title": "Lagerbewegungen pro Tag",
+        "x_label": "Datum", "y_label": "Anzahl Bewegungen", "colors": ["#4682b4"],
+    },
+    "movement_quantity": {
+        "kind": "line", "title": "Kumulierte Bestands-Bewegungen",
+        "x_label": "Datum", "y_label": "Kumulierte Menge", "colors": ["#2ecc71"],
+    },
+    "movement_types": {
+        "kind": "bar", "title": "Lagerbewegungen nach Typ",
+        "x_label": "", "y_label": "Anzahl", "colors": _TYPE_COLORS,
+    },
+    "inventory_value": {
+        "kind": "pie", "title": "Bestandswert nach Kategorie",
+        "x_label": "", "y_label": "", "colors": _SET3,
+    },
+    "warehouse_vs_shop": {
+        "kind": "bar", "title": "Bestand: Lager vs. Shop",
+        "x_label": "", "y_label": "Menge", "colors": ["#3498db", "#e74c3c"],
+    },
+}
+
+
+def chart_data(name: str, series) -> Dict:
+    """
+    Datenreihen eines Charts als kompaktes, JSON-serialisierbares Dict
+
+    Args:
+        name: Schlüssel aus CHART_SPECS
+        series: Datenreihen aus ReportB.chart_series
+
+    Returns:
+        {"name", "kind", "title", "x_label", "y_label", "colors", "labels", "values"}
+    """
+    spec = CHART_SPECS[name]
+    if name == "warehouse_vs_shop":
+        labels, values = ["Lager", "Shop"], list(series)
+    else:
+        labels, values = series
+    return {"name": name, **spec, "labels": list(labels), "values": list(values)}
+
+
+def render_svg(name: str, series) -> str:
+    """Chart als eigenständiges SVG-Dokument"""
+    data = chart_data(name, series)
+    body = {"line": _line, "bar": _bar, "pie": _pie}[data["kind"]](data)
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {WIDTH} {HEIGHT}" '
+        f'width="{WIDTH}" height="{HEIGHT}" font-family="sans-serif" font-size="11">'
+        f'<rect width="{WIDTH}" height="{HEIGHT}" fill="#ffffff"/>'
+        f'<text x="{WIDTH / 2:.0f}" y="22" text-anchor="middle" font-size="14" font-weight="bold">'
+        f'{escape(data["title"])}</text>'
+        f'{body}</svg>'
+    )
+
+
+def _nice_ticks(low: float, high: float, count: int = 5) -> List[float]:
+    """Runde Achsenwerte zwischen low und high (1, 2, 5 * 10^n)"""
+    if high <= low:
+        high = low + 1
+    raw = (high - low) / count
+    magnitude = 10 ** math.floor(math.log10(raw))
+    step = next(m * magnitude for m in (1, 2, 5, 10) if m * magnitude >= raw)
+    start = math.floor(low / step) * step
+    ticks = []
+    value = start
+    while value <= high + step / 2:
+        ticks.append(value)
+        value += step
+    return ticks
+
+
+def _format(value: float) -> str:
+    return f"{value:.0f}" if float(value).is_integer() else f"{value:.1f}"
+
+
+def _axes(data: Dict, values: List[float]):
+    """Achsen, Gitter und Beschriftungen; liefert Umrechnung Wert -> y-Pixel"""
+    ticks = _nice_ticks(min(0, min(values)), max(values))
+    low, high = ticks[0], ticks[-1]
+    plot_top, plot_bottom = _MARGIN_TOP, HEIGHT - _MARGIN_BOTTOM
+
+    def y(value: float) -> float:
+        return plot_bottom - (value - low) / (high - low) * (plot_bottom - plot_top)
+
+    parts = []
+    for tick in ticks:
+        parts.append(
+            f'<line x1="{_MARGIN_LEFT}" x2="{WIDTH - _MARGIN_RIGHT}" y1="{y(tick):.1f}" y2="{y(tick):.1f}" '
+            f'stroke="#000" stroke-opacity="0.1"/>'
+            f'<text x="{_MARGIN_LEFT - 6}" y="{y(tick) + 4:.1f}" text-anchor="end">{_format(tick)}</text>'
+        )
+    parts.append(
+        f'<line x1="{_MARGIN_LEFT}" x2="{_MARGIN_LEFT}" y1="{plot_top}" y2="{plot_bottom}" stroke="#000"/>'
+        f'<line x1="{_MARGIN_LEFT}" x2="{WIDTH - _MARGIN_RIGHT}" y1="{plot_bottom}" y2="{plot_bottom}" stroke="#000"/>'
+    )
+    if data["y_label"]:
+        parts.append(
+            f'<text transform="translate(16 {(plot_top + plot_bottom) / 2:.0f}) rotate(-90)" '
+            f'text-anchor="middle" font-weight="bold">{escape(data["y_label"])}</text>'
+        )
+    if data["x_label"]:
+        parts.append(
+            f'<text x="{(_MARGIN_LEFT + WIDTH - _MARGIN_RIGHT) / 2:.0f}" y="{HEIGHT - 8}" '
+            f'text-anchor="middle" font-weight="bold">{escape(data["x_label"])}</text>'
+        )
+    return "".join(parts), y
+
+
+def _x_label(x: float, label: str, rotate: bool) -> str:
+    y = HEIGHT - _MARGIN_BOTTOM + 14
+    if rotate:
+        return (
+            f'<text transform="translate({x:.1f} {y}) rotate(-45)" text-anchor="end">{escape(str(label))}</text>'
+        )
+    return f'<text x="{x:.1f}" y="{y}" text-anchor="middle">{escape(str(label))}</text>'
+
+
+def _line(data: Dict) -> str:
+    labels, values = data["labels"], data["values"]
+    color = data["colors"][0]
+    axes, y = _axes(data, values)
+    plot_width = WIDTH - _MARGIN_LEFT - _MARGIN_RIGHT
+    step = plot_width / max(1, len(values) - 1)
+
+    def x(index: int) -> float:
+        return _MARGIN_LEFT + (index * step if len(values) > 1 else plot_width / 2)
+
+    points = " ".join(f"{x(i):.1f},{y(v):.1f}" for i, v in enumerate(values))
+    zero = y(0)
+    area = f"{x(0):.1f},{zero:.1f} {points} {x(len(values) - 1):.1f},{zero:.1f}"
+    parts = [
+        axes,
+        f'<polygon points="{area}" fill="{color}" fill-opacity="0.3"/>',
+        f'<polyline points="{points}" fill="none" stroke="{color}" stroke-width="2"/>',
+    ]
+    if len(values) <= 60:
+        parts.extend(f'<circle cx="{x(i):.1f}" cy="{y(v):.1f}" r="3" fill="{color}"/>' for i, v in enumerate(values))
+    every = max(1, len(labels) // 10)
+    parts.extend(_x_label(x(i), labels[i], True) for i in range(0, len(labels), every))
+    return "".join(parts)
+
+
+def _bar(data: Dict) -> str:
+    labels, values, colors = data["labels"], data["values"], data["colors"]
+    axes, y = _axes(data, values)
+    slot = (WIDTH - _MARGIN_LEFT - _MARGIN_RIGHT) / len(values)
+    zero = y(0)
+    parts = [axes]
+    for i, (label, value) in enumerate(zip(labels, values)):
+        left = _MARGIN_LEFT + i * slot + slot * 0.15
+        top, bottom = sorted((y(value), zero))
+        parts.append(
+            f'<rect x="{left:.1f}" y="{top:.1f}" width="{slot * 0.7:.1f}" height="{bottom - top:.1f}" '
+            f'fill="{colors[i % len(colors)]}" stroke="#000" stroke-width="1.5"/>'
+            f'<text x="{left + slot * 0.35:.1f}" y="{top - 4:.1f}" text-anchor="middle" '
+            f'font-weight="bold">{_format(value)}</text>'
+        )
+        parts.append(_x_label(left + slot * 0.35, label, len(values) > 4))
+    return "".join(parts)
+
+
+def _pie(data: Dict) -> str:
+    labels, colors = data["labels"], data["colors"]
+    values = [max(0.0, float(v)) for v in data["values"]]
+    total = sum(values)
+    cx, cy, radius = WIDTH * 0.38, HEIGHT / 2 + 10, 130
+    if total <= 0:
+        return (
+            f'<circle cx="{cx:.1f}" cy="{cy:.1f}" r="{radius}" fill="none" stroke="#999"/>'
+            f'<text x="{cx:.1f}" y="{cy:.1f}" text-anchor="middle">Kein Bestandswert</text>'
+        )
+
+    parts = []
+    angle = -math.pi / 2  # Start oben, im Uhrzeigersinn
+    for i, (label, value) in enumerate(zip(labels, values)):
+        color = colors[i % len(colors)]
+        share = value / total
+        if share >= 1:
+            parts.append(f'<circle cx="{cx:.1f}" cy="{cy:.1f}" r="{radius}" fill="{color}"/>')
+        elif share > 0:
+            end = angle + share * 2 * math.pi
+            x1, y1 = cx + radius * math.cos(angle), cy + radius * math.sin(angle)
+            x2, y2 = cx + radius * math.cos(end), cy + radius * math.sin(end)
+            large = 1 if share > 0.5 else 0
+            parts.append(
+                f'<path d="M{cx:.1f},{cy:.1f} L{x1:.1f},{y1:.1f} A{radius},{radius} 0 {large} 1 {x2:.1f},{y2:.1f} Z" '
+                f'fill="{color}" stroke="#fff"/>'
+            )
+        if share > 0.03:
+            middle = angle + share * math.pi
+            parts.append(
+                f'<text x="{cx + radius * 0.6 * math.cos(middle):.1f}" y="{cy + radius * 0.6 * math.sin(middle) + 4:.1f}" '
+                f'text-anchor="middle" font-weight="bold">{share * 100:.1f}%</text>'
+            )
+        angle += share * 2 * math.pi
+
+        # Legende rechts neben dem Kreis
+        legend_y = _MARGIN_TOP + 10 + i * 18
+        parts.append(
+            f'<rect x="{WIDTH * 0.7:.0f}" y="{legend_y}" width="12" height="12" fill="{color}"/>'
+            f'<text x="{WIDTH * 0.7 + 18:.0f}" y="{legend_y + 10}">{escape(str(label))}</text>'
+        )
+    return "".join(parts)
@@ -0,0 +1,143 @@
+"""Produkt-Import - JSON/CSV-Streams zeilenweise in Product-Objekte umwandeln"""
+
+import csv
+import json
+import re
+from datetime import datetime
+from typing import Dict, Iterator, TextIO
+
+from ..domain.product import Product
+
+_WHITESPACE = re.compile(r"\s*")
+
+
+def iter_json_records(stream: TextIO, chunk_size: int = 64 * 1024) -> Iterator[Dict]:
+    """
+    Objekte aus einem JSON-Array oder aus JSON Lines lesen.
+
+    Der Stream wird blockweise gelesen, im Speicher liegt immer nur der
+    aktuelle Block plus das gerade dekodierte Objekt. Im Array müssen die
+    Werte durch Kommas getrennt sein, bei JSON Lines durch Zeilenumbrüche.
+
+    Raises:
+        ValueError: bei ungültigem JSON
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+    in_array = None  # None = Format noch unbekannt
+    # Im Array: "first" (Wert oder "]"), "value" (nach Komma) oder "separator" ("," oder "]")
+    expect = "first"
+    # JSON Lines: seit dem letzten Datensatz ein Zeilenumbruch gelesen
+    new_line = True
+
+    while True:
+        end = _WHITESPACE.match(buffer, pos).end()
+        if "\n" in buffer[pos:end]:
+            new_line = True
+        pos = end
+        if pos < len(buffer):
+            char = buffer[pos]
+            if in_array is None and char == "[":
+                in_array = True
+                pos += 1
+                continue
+            if in_array and expect == "separator":
+                if char == ",":
+                    expect = "value"
+                    pos += 1
+                    continue
+                if char == "]":
+                    _check_trailing(stream, buffer[pos + 1:], chunk_size)
+                    return
+                raise ValueError(f"Ungültiges JSON: ',' oder ']' erwartet statt {char!r}")
+            if in_array and char in ",]":
+                if char == "]" and expect == "first":
+                    _check_trailing(stream, buffer[pos + 1:], chunk_size)
+                    return
+                raise ValueError(f"Ungültiges JSON: Wert erwartet statt {char!r}")
+            if in_array is False and not new_line:
+                raise ValueError("Ungültiges JSON Lines: ein Datensatz pro Zeile erwartet")
+            try:
+                record, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as exc:
+                if eof:
+                    raise ValueError(f"Ungültiges JSON: {exc}") from None
+            else:
+                # Endet der Wert genau am Blockende, kann er abgeschnitten sein
+                # (z.B. Zahl 1234|567): erst mit dem nächsten Block bzw. am Dateiende gültig
+                if end < len(buffer) or eof:
+                    pos = end
+                    if in_array is None:
+                        in_array = False  # JSON Lines
+                    expect = "separator"
+                    new_line = False
+                    yield record
+                    continue
+        elif eof:
+            if in_array:
+                raise ValueError("Ungültiges JSON: Array nicht abgeschlossen")
+            return
+
+        # Nächsten Block nachladen, bereits verarbeiteten Teil verwerfen
+        chunk = stream.read(chunk_size)
+        if isinstance(chunk, bytes):
+            chunk = chunk.decode("utf-8")
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+
+def _check_trailing(stream: TextIO, rest: str, chunk_size: int) -> None:
+    """Nach dem Array darf nur noch Leerraum folgen"""
+    while True:
+        if rest.strip():
+            raise ValueError("Ungültiges JSON: Daten nach dem Ende des Arrays")
+        rest = stream.read(chunk_size)
+        if not rest:
+            return
+        if isinstance(rest, bytes):
+            rest = rest.decode("utf-8")
+
+
+def iter_csv_records(stream: TextIO) -> Iterator[Dict]:
+    """Zeilen einer CSV-Datei mit Kopfzeile als Dicts lesen"""
+    return iter(csv.DictReader(stream))
+
+
+def product_from_record(record: Dict) -> Product:
+    """
+    Import-Datensatz in ein Product umwandeln.
+
+    Akzeptiert die Felder von Product sowie "quantity" als Alias für
+    warehouse_qty (Format von sample_data.json). Leere CSV-Felder zählen
+    als nicht angegeben.
+
+    Raises:
+        ValueError: bei fehlenden Pflichtfeldern oder ungültigen Werten
+    """
+    if not isinstance(record, dict):
+        raise ValueError(f"Datensatz muss ein Objekt sein: {record!r}")
+    values = {key: value for key, value in record.items() if value not in (None, "")}
+    for required in ("id", "name", "price"):
+        if required not in values:
+            raise ValueError(f"Pflichtfeld fehlt: {required} (Datensatz: {record})")
+
+    product = Product(
+        id=str(values["id"]),
+        name=str(values["name"]),
+        description=str(values.get("description", "")),
+        price=float(values["price"]),
+        warehouse_qty=int(values.get("warehouse_qty", values.get("quantity", 0))),
+        shop_qty=int(values.get("shop_qty", 0)),
+        sku=str(values.get("sku", "")),
+        category=str(values.get("category", "")),
+        notes=values.get("notes"),
+        min_stock_level=int(values.get("min_stock_level", 10)),
+    )
+    if "created_at" in values:
+        product.created_at = datetime.fromisoformat(values["created_at"])
+    if "updated_at" in values:
+        product.updated_at = datetime.fromisoformat(values["updated_at"])
+    return product
@@ -1,20 +1,62 @@
 """Warehouse Service - Geschäftslogik für Lagerverwaltung"""
 
+import logging
+import threading
 import uuid
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
 
+from ..domain.movement_columns import MovementColumns
 from ..domain.product import Product
 from ..domain.warehouse import Movement
 from ..ports import RepositoryPort, ReportPort
+from .product_import import iter_csv_records, iter_json_records, product_from_record
+
+logger = logging.getLogger(__name__)
+
+
+# Batch-Operation -> (Faktor Lagerbestand, Faktor Shopbestand, Bewegungstyp, Standardgrund)
+BATCH_OPERATIONS = {
+    "sale": (0, -1, "SOLD", "Kundenverkauf"),
+    "purchase": (1, 0, "IN", "Lieferanteneinkauf"),
+    "transfer_to_shop": (-1, 1, "TO_SHOP", "Transfer zum Shop"),
+    "transfer_to_warehouse": (1, -1, "FROM_SHOP", "Rücktransfer vom Shop"),
+}
+
+
+# Felder eines Produkts in Listen (get_products_with_totals, get_products_page)
+PRODUCT_FIELDS = (
+    "id",
+    "name",
+    "description",
+    "price",
+    "warehouse_qty",
+    "shop_qty",
+    "available_total",
+    "category",
+    "sku",
+    "notes",
+    "created_at",
+    "updated_at",
+    "min_stock_level",
+    "is_low_stock",
+    "stock_status",
+)
 
 
 class WarehouseService:
     """Service für Warehouse-Operationen"""
 
     def __init__(self, repository: RepositoryPort, report_adapter: ReportPort = None):
+        """
+        Args:
+            repository: Repository für Produkte und Bewegungen
+            report_adapter: Adapter für Text-Berichte
+        """
         self.repository = repository
         self.report_adapter = report_adapter
+        # Ergebnis des letzten Abgleichs (inkl. Abweichung), None = noch keiner
+        self.last_reconciliation: Optional[Dict] = None
 
     # ===== Produkt-Operationen =====
 
@@ -61,6 +103,33 @@ class WarehouseService:
         self.repository.save_product(product)
         return product
 
+    def import_products(self, stream: TextIO, file_format: str = "json") -> int:
+        """
+        Produkte aus einem JSON- oder CSV-Stream importieren
+
+        Der Stream wird zeilen- bzw. blockweise gelesen und in einer einzigen
+        Transaktion gespeichert; bei einem fehlerhaften Datensatz wird nichts
+        übernommen.
+
+        Args:
+            stream: Geöffneter Text-Stream (JSON-Array, JSON Lines oder CSV mit Kopfzeile)
+            file_format: "json", "jsonl" oder "csv"
+
+        Returns:
+            Anzahl importierter Produkte
+
+        Raises:
+            ValueError: bei unbekanntem Format oder ungültigen Datensätzen
+        """
+        if file_format in ("json", "jsonl"):
+            records = iter_json_records(stream)
+        elif file_format == "csv":
+            records = iter_csv_records(stream)
+        else:
+            raise ValueError(f"Unbekanntes Import-Format: {file_format}")
+
+        return self.repository.save_products(product_from_record(r) for r in records)
+
     def get_all_products(self) -> List[Product]:
         """Alle Produkte abrufen"""
         return list(self.repository.load_all_products().values())
@@ -70,7 +139,13 @@ class WarehouseService:
         return self.repository.load_product(product_id)
 
     def update_product(self, product: Product) -> None:
-        """Produkt aktualisieren"""
+        """
+        Produkt aktualisieren (alle Felder, auch die Bestände)
+
+        Raises:
+            ValueError: wenn product veraltet ist (Produkt-Cache, siehe CachingRepository)
+        """
+        product.updated_at = datetime.now()
         self.repository.save_product(product)
 
     def delete_product(self, product_id: str) -> None:
@@ -91,25 +166,25 @@ class WarehouseService:
         Returns:
             True wenn erfolgreich, False sonst
         """
-        product = self.repository.load_product(product_id)
-        if not product:
-            return False
-
-        if product.warehouse_qty < quantity:
+        if quantity <= 0:
             return False
 
-        product.update_warehouse_qty(-quantity)
-        product.update_shop_qty(quantity)
-        self.repository.save_product(product)
-
-        # Bewegung aufzeichnen
-        self._record_movement(
-            product_id=product_id,
-            product_name=product.name,
-            quantity_change=-quantity,
-            movement_type="TO_SHOP",
-            reason=reason or "Transfer zum Shop",
-        )
+        # Bestandsänderung und Bewegung in einer Transaktion
+        with self.repository.transaction():
+            product = self.repository.adjust_stock(
+                product_id, warehouse_delta=-quantity, shop_delta=quantity
+            )
+            if not product:
+                return False
+
+            # Bewegung aufzeichnen
+            self._record_movement(
+                product_id=product_id,
+                product_name=product.name,
+                quantity_change=-quantity,
+                movement_type="TO_SHOP",
+                reason=reason or "Transfer zum Shop",
+            )
 
         return True
 
@@ -125,25 +200,24 @@ class WarehouseService:
         Returns:
             True wenn erfolgreich, False sonst
         """
-        product = self.repository.load_product(product_id)
-        if not product:
-            return False
-
-        if product.shop_qty < quantity:
+        if quantity <= 0:
             return False
 
-        product.update_shop_qty(-quantity)
-        product.update_warehouse_qty(quantity)
-        self.repository.save_product(product)
-
-        # Bewegung aufzeichnen
-        self._record_movement(
-            product_id=product_id,
-            product_name=product.name,
-            quantity_change=quantity,
-            movement_type="FROM_SHOP",
-            reason=reason or "Rücktransfer vom Shop",
-        )
+        with self.repository.transaction():
+            product = self.repository.adjust_stock(
+                product_id, warehouse_delta=quantity, shop_delta=-quantity
+            )
+            if not product:
+                return False
+
+            # Bewegung aufzeichnen
+            self._record_movement(
+                product_id=product_id,
+                product_name=product.name,
+                quantity_change=quantity,
+                movement_type="FROM_SHOP",
+                reason=reason or "Rücktransfer vom Shop",
+            )
 
         return True
 
@@ -161,24 +235,22 @@ class WarehouseService:
         Returns:
             True wenn erfolgreich, False sonst
         """
-        product = self.repository.load_product(product_id)
-        if not product:
-            return False
-
         if quantity <= 0:
             return False
 
-        product.update_warehouse_qty(quantity)
-        self.repository.save_product(product)
+        with self.repository.transaction():
+            product = self.repository.adjust_stock(product_id, warehouse_delta=quantity)
+            if not product:
+                return False
 
-        # Bewegung aufzeichnen
-        self._record_movement(
-            product_id=product_id,
-            product_name=product.name,
-            quantity_change=quantity,
-            movement_type="IN",
-            reason=reason or "Lieferanteneinkauf",
-        )
+            # Bewegung aufzeichnen
+            self._record_movement(
+                product_id=product_id,
+                product_name=product.name,
+                quantity_change=quantity,
+                movement_type="IN",
+                reason=reason or "Lieferanteneinkauf",
+            )
 
         return True
 
@@ -194,69 +266,267 @@ class WarehouseService:
         Returns:
             True wenn erfolgreich, False sonst
         """
-        product = self.repository.load_product(product_id)
-        if not product:
-            return False
-
-        if product.shop_qty < quantity:
+        if quantity <= 0:
             return False
 
-        product.update_shop_qty(-quantity)
-        self.repository.save_product(product)
+        with self.repository.transaction():
+            product = self.repository.adjust_stock(product_id, shop_delta=-quantity)
+            if not product:
+                return False
 
-        # Bewegung aufzeichnen
-        self._record_movement(
-            product_id=product_id,
-            product_name=product.name,
-            quantity_change=-quantity,
-            movement_type="SOLD",
-            reason=reason or "Kundenverkauf",
-        )
+            # Bewegung aufzeichnen
+            self._record_movement(
+                product_id=product_id,
+                product_name=product.name,
+                quantity_change=-quantity,
+                movement_type="SOLD",
+                reason=reason or "Kundenverkauf",
+            )
 
         return True
 
+    # ===== Batch-Operationen =====
+
+    def apply_operations(
+        self, operations: Iterable[Dict], atomic: bool = True, performed_by: str = "web_ui"
+    ) -> Dict:
+        """
+        Viele Verkäufe, Einkäufe und Transfers auf einmal buchen (z.B. Kassen-Upload)
+
+        Die Operationen werden der Reihe nach gegen den laufenden Bestand geprüft.
+        Alle Bestandsänderungen und Bewegungen werden dann in einer Transaktion
+        geschrieben (je Produkt eine Bestandsänderung, Bewegungen per Batch).
+
+        Args:
+            operations: Dicts mit type (siehe BATCH_OPERATIONS), product_id,
+                quantity und optional reason
+            atomic: True = bei einem Fehler wird nichts gebucht,
+                False = fehlerhafte Operationen werden übersprungen
+            performed_by: Urheber der Bewegungen
+
+        Returns:
+            Dict mit applied (Anzahl gebuchter Operationen) und errors
+            (Liste von {"index", "error"})
+
+        Raises:
+            ValueError: wenn atomic und sich der Bestand während der Buchung
+                geändert hat (nichts gebucht)
+        """
+        errors: List[Dict] = []
+        checked = []
+        for index, operation in enumerate(operations):
+            error = self._check_operation(operation)
+            if error:
+                errors.append({"index": index, "error": error})
+            else:
+                checked.append((index, operation))
+
+        with self.repository.transaction():
+            # Bestände werden in der Transaktion gelesen (SQLite: unter der Schreibsperre),
+            # also aus der Datenbank und nicht aus einem möglicherweise veralteten Cache.
+            # Produkt-ID -> [Lagerbestand, Shopbestand, Name] bzw. None, wenn unbekannt
+            stock: Dict[str, Optional[list]] = {}
+            deltas: Dict[str, tuple] = {}
+            # (Index der Operation, Bewegung) in Reihenfolge der Operationen
+            booked: List[tuple] = []
+            for index, operation in checked:
+                product_id, quantity = operation["product_id"], operation["quantity"]
+                warehouse_factor, shop_factor, movement_type, default_reason = BATCH_OPERATIONS[
+                    operation["type"]
+                ]
+                if product_id not in stock:
+                    product = self.repository.load_product(product_id)
+                    stock[product_id] = product and [
+                        product.warehouse_qty, product.shop_qty, product.name
+                    ]
+                current = stock[product_id]
+                if current is None:
+                    errors.append({"index": index, "error": "Produkt nicht gefunden"})
+                    continue
+
+                warehouse_delta, shop_delta = warehouse_factor * quantity, shop_factor * quantity
+                if current[0] + warehouse_delta < 0 or current[1] + shop_delta < 0:
+                    errors.append({"index": index, "error": "Nicht genug Bestand"})
+                    continue
+                current[0] += warehouse_delta
+                current[1] += shop_delta
+                previous = deltas.get(product_id, (0, 0))
+                deltas[product_id] = (previous[0] + warehouse_delta, previous[1] + shop_delta)
+                booked.append((
+                    index,
+                    self._new_movement(
+                        product_id=product_id,
+                        product_name=current[2],
+                        # Vorzeichen wie bei den Einzeloperationen (Verkauf negativ)
+                        quantity_change=(warehouse_factor or shop_factor) * quantity,
+                        movement_type=movement_type,
+                        reason=operation.get("reason") or default_reason,
+                        performed_by=performed_by,
+                    ),
+                ))
+
+            if errors and atomic:
+                errors.sort(key=lambda error: error["index"])
+                return {"applied": 0, "errors": errors}
+            if deltas and self.repository.adjust_stocks(deltas) is None:
+                # Bestand wurde trotz Transaktion geändert (z.B. von einem anderen Thread)
+                if atomic:
+                    raise ValueError("Bestände wurden während des Batches geändert")
+                # Einzeln je Produkt buchen; Operationen gescheiterter Produkte als Fehler melden
+                failed = {
+                    product_id
+                    for product_id, (warehouse_delta, shop_delta) in deltas.items()
+                    if self.repository.adjust_stock(product_id, warehouse_delta, shop_delta) is None
+                }
+                errors.extend(
+                    {"index": index, "error": "Nicht genug Bestand"}
+                    for index, movement in booked
+                    if movement.product_id in failed
+                )
+                booked = [entry for entry in booked if entry[1].product_id not in failed]
+            movements = [movement for _, movement in booked]
+            self.repository.save_movements(movements)
+
+        errors.sort(key=lambda error: error["index"])
+        return {"applied": len(movements), "errors": errors}
+
+    @staticmethod
+    def _check_operation(operation) -> Optional[str]:
+        """Aufbau einer Batch-Operation prüfen; liefert die Fehlermeldung oder None"""
+        if not isinstance(operation, dict):
+            return "Operation muss ein Objekt sein"
+        if operation.get("type") not in BATCH_OPERATIONS:
+            return "Unbekannte Operation"
+        if not isinstance(operation.get("product_id"), str) or not operation["product_id"]:
+            return "Produkt-ID fehlt"
+        quantity = operation.get("quantity")
+        if not isinstance(quantity, int) or isinstance(quantity, bool) or quantity <= 0:
+            return "Menge muss eine ganze Zahl größer als 0 sein"
+        if not isinstance(operation.get("reason", ""), (str, type(None))):
+            return "Grund muss Text sein"
+        return None
+
     # ===== Bestandsabfragen =====
 
     def get_total_warehouse_value(self) -> float:
-        """Gesamtwert des Lagerbestands berechnen"""
-        total = 0.0
-        for product in self.repository.load_all_products().values():
-            total += product.price * product.warehouse_qty
-        return total
+        """Gesamtwert des Lagerbestands (laufende Summe)"""
+        return self.repository.load_inventory_totals()["total_warehouse_value"]
 
     def get_total_shop_value(self) -> float:
-        """Gesamtwert des Shopbestands berechnen"""
-        total = 0.0
-        for product in self.repository.load_all_products().values():
-            total += product.price * product.shop_qty
-        return total
+        """Gesamtwert des Shopbestands (laufende Summe)"""
+        return self.repository.load_inventory_totals()["total_shop_value"]
 
     def get_total_inventory_value(self) -> float:
-        """Gesamtwert aller Bestände berechnen"""
-        return self.get_total_warehouse_value() + self.get_total_shop_value()
+        """Gesamtwert aller Bestände (laufende Summen)"""
+        totals = self.repository.load_inventory_totals()
+        return totals["total_warehouse_value"] + totals["total_shop_value"]
+
+    def reconcile_inventory_totals(self) -> Dict:
+        """
+        Laufende Bestandswert-Summen mit einer vollständigen Neuberechnung abgleichen
+
+        Returns:
+            Neu berechnete Summen und Abweichung (warehouse_drift, shop_drift)
+        """
+        result = self.repository.reconcile_inventory_totals()
+        self.last_reconciliation = result
+        return result
+
+    def run_reconciliation(self, interval: float, stop: threading.Event) -> None:
+        """
+        Laufende Summen alle interval Sekunden abgleichen, bis stop gesetzt ist
+
+        Läuft in einem Hintergrund-Thread (create_app); Lesezugriffe gleichen
+        nie selbst ab. Gefundene Abweichungen werden als Warnung, Fehler mit
+        Traceback geloggt; nach einem Fehler geht es im nächsten Intervall weiter.
+        """
+        while not stop.wait(interval):
+            try:
+                result = self.reconcile_inventory_totals()
+            except Exception:
+                # z.B. Datenbank gesperrt: beim nächsten Intervall erneut versuchen
+                logger.exception("Abgleich der Bestandswert-Summen fehlgeschlagen")
+                continue
+            if result["warehouse_drift"] or result["shop_drift"]:
+                logger.warning(
+                    "Bestandswert-Summen korrigiert: Lager %+.6f, Shop %+.6f",
+                    result["warehouse_drift"],
+                    result["shop_drift"],
+                )
 
     def get_products_with_totals(self) -> List[Dict]:
         """Alle Produkte mit berechneten Gesamtwerten abrufen"""
-        products = []
-        for product in self.get_all_products():
-            products.append({
-                "id": product.id,
-                "name": product.name,
-                "description": product.description,
-                "price": product.price,
-                "warehouse_qty": product.warehouse_qty,
-                "shop_qty": product.shop_qty,
-                "available_total": product.get_total_qty(),
-                "category": product.category,
-                "sku": product.sku,
-                "notes": product.notes,
-                "created_at": product.created_at,
-                "updated_at": product.updated_at,
-                "min_stock_level": product.min_stock_level,
-                "is_low_stock": product.is_low_stock(),
-                "stock_status": product.get_stock_status(),
-            })
-        return products
+        return [self._product_dict(product) for product in self.get_all_products()]
+
+    def get_products_page(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        sort: str = "id",
+        descending: bool = False,
+        category: Optional[str] = None,
+        low_stock: bool = False,
+        query: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Dict:
+        """
+        Eine Seite Produkte wie in get_products_with_totals (Keyset-Pagination)
+
+        Args:
+            limit: Produkte pro Seite
+            cursor: next_cursor der vorigen Seite (None = erste Seite)
+            sort: Sortierfeld aus PRODUCT_SORT_FIELDS
+            descending: Absteigend sortieren
+            category: Nur Produkte dieser Kategorie
+            low_stock: Nur Produkte unter Mindestbestand
+            query: Nur Produkte, deren Name, SKU oder Beschreibung den Text enthält
+            fields: Gelieferte Felder aus PRODUCT_FIELDS (None = alle)
+
+        Returns:
+            Dict mit items (Liste von Dicts) und next_cursor (None auf der letzten Seite)
+
+        Raises:
+            ValueError: bei ungültigem limit, Feld, Sortierfeld oder Cursor
+        """
+        if limit < 1:
+            raise ValueError("limit muss mindestens 1 sein")
+        unknown = [field for field in fields or () if field not in PRODUCT_FIELDS]
+        if unknown:
+            raise ValueError(f"Unbekannte Felder: {', '.join(unknown)}")
+
+        # Ein Produkt mehr laden: zeigt an, ob es eine nächste Seite gibt
+        products = self.repository.load_products_page(
+            limit + 1, cursor, sort, descending, category, low_stock, query
+        )
+        next_cursor = None
+        if len(products) > limit:
+            products = products[:limit]
+            next_cursor = self.repository.product_cursor(products[-1], sort)
+
+        items = [self._product_dict(product) for product in products]
+        if fields:
+            items = [{field: item[field] for field in fields} for item in items]
+        return {"items": items, "next_cursor": next_cursor}
+
+    @staticmethod
+    def _product_dict(product: Product) -> Dict:
+        return {
+            "id": product.id,
+            "name": product.name,
+            "description": product.description,
+            "price": product.price,
+            "warehouse_qty": product.warehouse_qty,
+            "shop_qty": product.shop_qty,
+            "available_total": product.get_total_qty(),
+            "category": product.category,
+            "sku": product.sku,
+            "notes": product.notes,
+            "created_at": product.created_at,
+            "updated_at": product.updated_at,
+            "min_stock_level": product.min_stock_level,
+            "is_low_stock": product.is_low_stock(),
+            "stock_status": product.get_stock_status(),
+        }
 
     # ===== Bewegungsprotokoll =====
 
@@ -269,7 +539,20 @@ class WarehouseService:
         reason: str = "",
     ) -> None:
         """Lagerbewegung aufzeichnen"""
-        movement = Movement(
+        self.repository.save_movement(
+            self._new_movement(product_id, product_name, quantity_change, movement_type, reason)
+        )
+
+    @staticmethod
+    def _new_movement(
+        product_id: str,
+        product_name: str,
+        quantity_change: int,
+        movement_type: str,
+        reason: str = "",
+        performed_by: str = "web_ui",
+    ) -> Movement:
+        return Movement(
             id=str(uuid.uuid4()),
             product_id=product_id,
             product_name=product_name,
@@ -277,13 +560,51 @@ class WarehouseService:
             movement_type=movement_type,
             reason=reason,
             timestamp=datetime.now(),
-            performed_by="web_ui",
+            performed_by=performed_by,
+        )
+
+    def get_movements(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        product_id: Optional[str] = None,
+        movement_type: Optional[str] = None,
+        limit: Optional[int] = None,
+        after_cursor: Optional[str] = None,
+        newest_first: bool = False,
+    ) -> List[Movement]:
+        """Lagerbewegungen abrufen (ohne Argumente: alle, sonst Zeitfenster/Seite)"""
+        return self.repository.load_movements(
+            since=since,
+            until=until,
+            product_id=product_id,
+            movement_type=movement_type,
+            limit=limit,
+            after_cursor=after_cursor,
+            newest_first=newest_first,
         )
-        self.repository.save_movement(movement)
 
-    def get_movements(self) -> List[Movement]:
-        """Alle Lagerbewegungen abrufen"""
-        return self.repository.load_movements()
+    def iter_movements(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        product_id: Optional[str] = None,
+        movement_type: Optional[str] = None,
+    ) -> Iterator[Movement]:
+        """Lagerbewegungen einzeln liefern (für lange Historien, konstanter Speicher)"""
+        return self.repository.iter_movements(
+            since=since, until=until, product_id=product_id, movement_type=movement_type
+        )
+
+    def get_movement_columns(
+        self, since: Optional[datetime] = None, until: Optional[datetime] = None
+    ) -> MovementColumns:
+        """Lagerbewegungen spaltenweise (für vektorisierte Auswertungen)"""
+        return self.repository.load_movement_columns(since=since, until=until)
+
+    def get_data_version(self) -> Optional[int]:
+        """Änderungszähler der Produkte (None, wenn das Repository keinen führt)"""
+        return self.repository.load_data_version()
 
     # ===== Reports =====
 
@@ -298,113 +619,103 @@ class WarehouseService:
         if self.report_adapter:
             return self.report_adapter.generate_movement_report()
         return "Report Adapter nicht konfiguriert."
+
+    def iter_inventory_report(self) -> Iterator[str]:
+        """Lagerbestandsbericht stückweise (z.B. für eine gestreamte HTTP-Antwort)"""
+        if self.report_adapter:
+            return self.report_adapter.iter_inventory_report()
+        return iter(["Report Adapter nicht konfiguriert."])
+
+    def iter_movement_report(self) -> Iterator[str]:
+        """Bewegungsprotokoll stückweise (konstanter Speicher bei langen Historien)"""
+        if self.report_adapter:
+            return self.report_adapter.iter_movement_report()
+        return iter(["Report Adapter nicht konfiguriert."])
+
     # ===== Low Stock Management =====
 
-    def get_low_stock_products(self) -> List[Product]:
-        """Liefere alle Produkte mit kritischem Lagerbestand (unter Minimum)"""
-        products = self.repository.load_all_products()
-        low_stock = [p for p in products.values() if p.is_low_stock()]
-        return sorted(low_stock, key=lambda x: x.warehouse_qty)
+    def get_low_stock_products(self, limit: Optional[int] = None) -> List[Product]:
+        """Liefere Produkte mit kritischem Lagerbestand (unter Minimum), kritischste zuerst"""
+        return self.repository.load_low_stock_products(limit=limit)
 
     def get_low_stock_count(self) -> int:
         """Anzahl Produkte mit kritischem Lagerbestand"""
-        return len(self.get_low_stock_products())
+        return self.repository.count_low_stock_products()
 
     # ===== Dashboard Statistics =====
 
     def get_dashboard_stats(self) -> Dict:
         """Sammle alle wichtigen Statistiken für das Dashboard"""
-        products = self.repository.load_all_products()
-        
-        total_warehouse_value = self.get_total_warehouse_value()
-        total_shop_value = self.get_total_shop_value()
-        low_stock_products = self.get_low_stock_products()
-        
-        # Kategorien sammeln
-        categories = {}
-        for product in products.values():
-            if product.category:
-                if product.category not in categories:
-                    categories[product.category] = 0
-                categories[product.category] += 1
-        
+        # Kennzahlen werden im Repository aggregiert, geladen werden nur 5 + 1 Produkte
+        stats = self.repository.load_inventory_stats()
+        # Bestandswerte aus den laufenden Summen
+        totals = self.repository.load_inventory_totals()
+        categories = stats["categories"]
+
         # Top Kategorien (nach Anzahl Produkte)
         top_categories = sorted(categories.items(), key=lambda x: x[1], reverse=True)[:5]
         all_categories = sorted(categories.keys())
-        
+
         # Höchster Wert Produkt
-        most_valuable = max(products.values(), key=lambda p: p.get_total_value()) if products else None
-        
+        most_valuable_id = stats["most_valuable_product_id"]
+        most_valuable = self.repository.load_product(most_valuable_id) if most_valuable_id else None
+
         return {
-            "total_products": len(products),
-            "low_stock_count": len(low_stock_products),
-            "total_warehouse_value": total_warehouse_value,
-            "total_shop_value": total_shop_value,
-            "total_inventory_value": total_warehouse_value + total_shop_value,
-            "warehouse_product_count": sum(1 for p in products.values() if p.warehouse_qty > 0),
-            "shop_product_count": sum(1 for p in products.values() if p.shop_qty > 0),
+            "total_products": stats["total_products"],
+            "low_stock_count": stats["low_stock_count"],
+            "total_warehouse_value": totals["total_warehouse_value"],
+            "total_shop_value": totals["total_shop_value"],
+            "total_inventory_value": totals["total_warehouse_value"] + totals["total_shop_value"],
+            "warehouse_product_count": stats["warehouse_product_count"],
+            "shop_product_count": stats["shop_product_count"],
             "top_categories": top_categories,
             "categories": all_categories,
             "most_valuable_product": most_valuable,
-            "low_stock_products": low_stock_products[:5],  # Top 5 kritische Produkte
+            "low_stock_products": self.repository.load_low_stock_products(limit=5),  # Top 5 kritische Produkte
         }
 
     def get_product_categories(self) -> List[str]:
         """Alle eindeutigen Produktkategorien abrufen"""
-        categories = set()
-        for product in self.repository.load_all_products().values():
-            if product.category:
-                categories.add(product.category)
-        return sorted(list(categories))
+        return self.repository.load_categories()
 
     def get_products_by_category(self, category: str) -> List[Dict]:
         """Alle Produkte einer spezifischen Kategorie"""
         products = []
-        for product in self.get_all_products():
-            if product.category == category:
-                products.append({
-                    "id": product.id,
-                    "name": product.name,
-                    "description": product.description,
-                    "price": product.price,
-                    "warehouse_qty": product.warehouse_qty,
-                    "shop_qty": product.shop_qty,
-                    "available_total": product.get_total_qty(),
-                    "category": product.category,
-                    "sku": product.sku,
-                    "min_stock_level": product.min_stock_level,
-                    "is_low_stock": product.is_low_stock(),
-                    "stock_status": product.get_stock_status(),
-                })
+        for product in self.repository.load_products_by_category(category):
+            products.append({
+                "id": product.id,
+                "name": product.name,
+                "description": product.description,
+                "price": product.price,
+                "warehouse_qty": product.warehouse_qty,
+                "shop_qty": product.shop_qty,
+                "available_total": product.get_total_qty(),
+                "category": product.category,
+                "sku": product.sku,
+                "min_stock_level": product.min_stock_level,
+                "is_low_stock": product.is_low_stock(),
+                "stock_status": product.get_stock_status(),
+            })
         return products
 
-    def search_products(self, query: str) -> List[Dict]:
-        """Produkte nach Name, SKU oder Beschreibung durchsuchen"""
-        query_lower = query.lower()
+    def search_products(self, query: str, limit: Optional[int] = None) -> List[Dict]:
+        """Produkte nach Name, SKU oder Beschreibung durchsuchen (beste Treffer zuerst)"""
         results = []
-        
-        for product in self.get_all_products():
-            if (query_lower in product.name.lower() or 
-                query_lower in (product.sku or "").lower() or
-                query_lower in (product.description or "").lower()):
-                results.append({
-                    "id": product.id,
-                    "name": product.name,
-                    "description": product.description,
-                    "price": product.price,
-                    "warehouse_qty": product.warehouse_qty,
-                    "shop_qty": product.shop_qty,
-                    "available_total": product.get_total_qty(),
-                    "category": product.category,
-                    "sku": product.sku,
-                    "min_stock_level": product.min_stock_level,
-                    "is_low_stock": product.is_low_stock(),
-                    "stock_status": product.get_stock_status(),
-                })
-        
-        return results
 
+        for product in self.repository.search_products(query, limit=limit):
+            results.append({
+                "id": product.id,
+                "name": product.name,
+                "description": product.description,
+                "price": product.price,
+                "warehouse_qty": product.warehouse_qty,
+                "shop_qty": product.shop_qty,
+                "available_total": product.get_total_qty(),
+                "category": product.category,
+                "sku": product.sku,
+                "min_stock_level": product.min_stock_level,
+                "is_low_stock": product.is_low_stock(),
+                "stock_status": product.get_stock_status(),
+            })
 
-    def get_low_stock_count(self) -> int:
-        """Anzahl Produkte mit kritischem Lagerbestand"""
-        return len(self.get_low_stock_products())
\ No newline at end of file
+        return results
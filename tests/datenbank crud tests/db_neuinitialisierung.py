@@ -68,12 +68,12 @@ def init_database(db_path: str = "warehouse.db"):
         print("Fehler: Keine Produkte zum Laden gefunden")
         return False
     
-    # Produkte in Datenbank speichern
+    # Produkte in einer Transaktion speichern
+    count = repository.save_products(products)
     for product in products:
-        repository.save_product(product)
         print(f"OK: {product.name} ({product.id})")
     
-    print(f"\nErfolgreich: Datenbank initialisiert mit {len(products)} Produkten!")
+    print(f"\nErfolgreich: Datenbank initialisiert mit {count} Produkten!")
     return True
 
 
@@ -0,0 +1,56 @@
+"""Gemeinsame Fixtures der erweiterten Tests"""
+
+import pytest
+from app import create_app
+from src.adapters.caching_repository import CachingRepository
+from src.adapters.repository import InMemoryRepository, SQLiteRepository
+from src.reports.report_b import ReportB
+
+
+@pytest.fixture(params=["memory", "sqlite", "cached"])
+def repository(request, tmp_path):
+    """Leeres Repository jeder Implementierung (SQLite mit Pool, einmal mit Produkt-Cache)
+
+    Testmodule füllen es mit eigenen Daten, indem sie die Fixture
+    gleichnamig überschreiben oder eine service-Fixture darauf aufbauen.
+    """
+    if request.param == "memory":
+        repo = InMemoryRepository()
+    else:
+        repo = SQLiteRepository(str(tmp_path / "test.db"), pool_size=4)
+        if request.param == "cached":
+            repo = CachingRepository(repo)
+    yield repo
+    repo.close()
+
+
+@pytest.fixture
+def app(tmp_path):
+    """Web-App auf einer leeren SQLite-Datenbank (ohne Verbindungspool)
+
+    Testmodule mit eigenen Daten überschreiben die Fixture gleichnamig
+    und füllen app.warehouse_service.
+    """
+    app = create_app(db_path=str(tmp_path / "test.db"), pool_size=0)
+    yield app
+    app.warehouse_service.repository.close()
+
+
+@pytest.fixture
+def client(app):
+    """Flask-Testclient der app-Fixture"""
+    return app.test_client()
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    """Zählt, wie oft ReportB tatsächlich einen Chart rendert"""
+    calls = []
+    original = ReportB._fig_to_png
+
+    def counting(fig):
+        calls.append(1)
+        return original(fig)
+
+    monkeypatch.setattr(ReportB, "_fig_to_png", staticmethod(counting))
+    return calls
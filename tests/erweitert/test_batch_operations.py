@@ -0,0 +1,262 @@
+"""Erweiterte Tests - Batch-Buchungen (WarehouseService.apply_operations, /api/batch)"""
+
+import pytest
+import app as app_module
+from src.adapters.caching_repository import CachingRepository
+from src.adapters.repository import SQLiteRepository
+from src.services import WarehouseService
+
+
+@pytest.fixture
+def service(repository):
+    """Service mit P001 (Lager 10, Shop 2) und P002 (Lager 0, Shop 5)"""
+    service = WarehouseService(repository)
+    service.create_product("P001", "Ordner", "A4", 2.0, warehouse_qty=10, shop_qty=2)
+    service.create_product("P002", "Stift", "blau", 1.0, warehouse_qty=0, shop_qty=5)
+    return service
+
+
+def _stock(service, product_id):
+    product = service.get_product(product_id)
+    return product.warehouse_qty, product.shop_qty
+
+
+class TestApplyOperations:
+    """Tests für WarehouseService.apply_operations"""
+
+    def test_mixed_batch(self, service):
+        """Test: Verkäufe, Einkauf und Transfers in einem Batch"""
+        result = service.apply_operations([
+            {"type": "sale", "product_id": "P002", "quantity": 2},
+            {"type": "purchase", "product_id": "P002", "quantity": 7, "reason": "Lieferung 12"},
+            {"type": "transfer_to_shop", "product_id": "P001", "quantity": 4},
+            {"type": "transfer_to_warehouse", "product_id": "P002", "quantity": 1},
+            {"type": "sale", "product_id": "P001", "quantity": 6},
+        ])
+
+        assert result == {"applied": 5, "errors": []}
+        assert _stock(service, "P001") == (6, 0)
+        assert _stock(service, "P002") == (8, 2)
+        movements = service.get_movements()
+        assert [(m.movement_type, m.quantity_change) for m in movements] == [
+            ("SOLD", -2), ("IN", 7), ("TO_SHOP", -4), ("FROM_SHOP", 1), ("SOLD", -6),
+        ]
+        assert movements[1].reason == "Lieferung 12"
+        assert movements[0].reason == "Kundenverkauf"
+
+    def test_operations_checked_in_order(self, service):
+        """Test: Verkauf ist erst nach dem vorherigen Transfer gedeckt"""
+        result = service.apply_operations([
+            {"type": "sale", "product_id": "P001", "quantity": 5},
+            {"type": "transfer_to_shop", "product_id": "P001", "quantity": 3},
+            {"type": "sale", "product_id": "P001", "quantity": 5},
+        ], atomic=False)
+
+        assert result["applied"] == 2
+        assert result["errors"] == [{"index": 0, "error": "Nicht genug Bestand"}]
+        assert _stock(service, "P001") == (7, 0)
+
+    def test_atomic_rejects_whole_batch(self, service):
+        """Test: atomic=True bucht bei einem Fehler nichts"""
+        result = service.apply_operations([
+            {"type": "sale", "product_id": "P002", "quantity": 1},
+            {"type": "sale", "product_id": "P999", "quantity": 1},
+            {"type": "sale", "product_id": "P001", "quantity": 3},
+        ])
+
+        assert result == {
+            "applied": 0,
+            "errors": [
+                {"index": 1, "error": "Produkt nicht gefunden"},
+                {"index": 2, "error": "Nicht genug Bestand"},
+            ],
+        }
+        assert _stock(service, "P002") == (0, 5)
+        assert service.get_movements() == []
+
+    @pytest.mark.parametrize(
+        "operation",
+        [
+            "sale",
+            {"type": "verschenken", "product_id": "P001", "quantity": 1},
+            {"type": "sale", "quantity": 1},
+            {"type": "sale", "product_id": "P001", "quantity": 0},
+            {"type": "sale", "product_id": "P001", "quantity": "2"},
+            {"type": "sale", "product_id": "P001", "quantity": True},
+            {"type": "sale", "product_id": "P001", "quantity": 1, "reason": 5},
+        ],
+    )
+    def test_invalid_operation(self, service, operation):
+        """Test: Fehlerhafter Aufbau wird gemeldet, der Rest gebucht"""
+        result = service.apply_operations(
+            [operation, {"type": "sale", "product_id": "P001", "quantity": 1}], atomic=False
+        )
+        assert result["applied"] == 1
+        assert [error["index"] for error in result["errors"]] == [0]
+
+    def test_single_write_per_batch(self, service, monkeypatch):
+        """Test: Ein adjust_stocks und ein save_movements für den ganzen Batch"""
+        repository = service.repository
+        calls = []
+
+        def spy(name):
+            original = getattr(repository, name)
+
+            def wrapper(*args):
+                calls.append(name)
+                return original(*args)
+
+            monkeypatch.setattr(repository, name, wrapper)
+
+        for name in ("adjust_stocks", "save_movements", "adjust_stock", "save_movement"):
+            spy(name)
+
+        result = service.apply_operations(
+            [{"type": "sale", "product_id": "P002", "quantity": 1}] * 5
+        )
+        assert result["applied"] == 5
+        assert calls[0] == "adjust_stocks"
+        assert calls.count("adjust_stocks") == calls.count("save_movements") == 1
+        assert _stock(service, "P002") == (0, 0)
+        assert len(service.get_movements(product_id="P002")) == 5
+
+    def test_value_totals_follow_batch(self, service):
+        """Test: Laufende Bestandswerte passen nach dem Batch"""
+        service.apply_operations([
+            {"type": "purchase", "product_id": "P001", "quantity": 5},
+            {"type": "sale", "product_id": "P002", "quantity": 5},
+        ])
+        assert service.get_total_warehouse_value() == pytest.approx(30.0)
+        assert service.get_total_shop_value() == pytest.approx(4.0)
+
+
+class TestConcurrentChanges:
+    """Tests für Bestandsänderungen außerhalb des Batches
+
+    Geprüft wird immer gegen den Stand der Datenbank, auch wenn ein
+    Produkt-Cache noch den alten Bestand kennt.
+    """
+
+    @pytest.fixture
+    def cached_service(self, tmp_path):
+        """Service mit Cache; P001 (Lager 10, Shop 2) ist bereits gecacht"""
+        service = WarehouseService(CachingRepository(SQLiteRepository(str(tmp_path / "test.db"))))
+        service.create_product("P001", "Ordner", "A4", 2.0, warehouse_qty=10, shop_qty=2)
+        service.get_product("P001")
+        return service
+
+    def test_stale_cache_gives_per_item_errors(self, cached_service, tmp_path):
+        """Test: Ein anderer Prozess hat verkauft, der Cache weiß davon nichts"""
+        SQLiteRepository(str(tmp_path / "test.db")).adjust_stock("P001", shop_delta=-2)
+
+        result = cached_service.apply_operations([
+            {"type": "sale", "product_id": "P001", "quantity": 2},
+            {"type": "transfer_to_shop", "product_id": "P001", "quantity": 1},
+        ], atomic=False)
+        assert result == {"applied": 1, "errors": [{"index": 0, "error": "Nicht genug Bestand"}]}
+        assert cached_service.repository.inner.load_product("P001").shop_qty == 1
+
+    def test_failed_bulk_update(self, service, monkeypatch):
+        """Test: Scheitert die Sammeländerung, wird je Produkt gebucht bzw. abgebrochen"""
+        repository = service.repository
+        monkeypatch.setattr(repository, "adjust_stocks", lambda deltas: None)
+        operations = [
+            {"type": "sale", "product_id": "P001", "quantity": 1},
+            {"type": "sale", "product_id": "P002", "quantity": 1},
+        ]
+
+        with pytest.raises(ValueError):
+            service.apply_operations(operations)
+        assert _stock(service, "P001") == (10, 2)
+        assert service.get_movements() == []
+
+        # Zwischen Prüfung und Buchung verkauft jemand den Shopbestand von P001
+        original = repository.adjust_stock
+
+        def adjust_stock(product_id, warehouse_delta=0, shop_delta=0):
+            if product_id == "P001":
+                original("P001", shop_delta=-2)
+            return original(product_id, warehouse_delta, shop_delta)
+
+        monkeypatch.setattr(repository, "adjust_stock", adjust_stock)
+        result = service.apply_operations(operations, atomic=False)
+        assert result == {"applied": 1, "errors": [{"index": 0, "error": "Nicht genug Bestand"}]}
+        assert [m.product_id for m in service.get_movements()] == ["P002"]
+
+
+class TestAdjustStocks:
+    """Tests für RepositoryPort.adjust_stocks"""
+
+    def test_all_or_nothing(self, service):
+        """Test: Ein negativer Bestand verhindert alle Änderungen"""
+        repository = service.repository
+        assert repository.adjust_stocks({"P001": (-1, 1), "P002": (0, -6)}) is None
+        assert repository.adjust_stocks({"P001": (-1, 1), "P404": (1, 0)}) is None
+        assert _stock(service, "P001") == (10, 2)
+
+        products = repository.adjust_stocks({"P001": (-1, 1), "P002": (3, -5)})
+        assert (products["P001"].warehouse_qty, products["P002"].shop_qty) == (9, 0)
+        assert _stock(service, "P002") == (3, 0)
+
+
+@pytest.fixture
+def app(app):
+    """Web-App mit P001 (Lager 10, Shop 2)"""
+    app.warehouse_service.create_product("P001", "Ordner", "A4", 2.0, warehouse_qty=10, shop_qty=2)
+    return app
+
+
+class TestBatchEndpoint:
+    """Tests für POST /api/batch"""
+
+    def test_list_body(self, client):
+        """Test: Liste von Operationen wird gebucht"""
+        response = client.post("/api/batch", json=[
+            {"type": "transfer_to_shop", "product_id": "P001", "quantity": 8},
+            *[{"type": "sale", "product_id": "P001", "quantity": 1}] * 10,
+        ])
+        assert response.status_code == 200
+        assert response.get_json() == {"applied": 11, "errors": []}
+
+    def test_atomic_failure(self, client):
+        """Test: Fehler im atomaren Batch ergibt 422, nichts gebucht"""
+        response = client.post("/api/batch", json={"operations": [
+            {"type": "sale", "product_id": "P001", "quantity": 1},
+            {"type": "sale", "product_id": "P001", "quantity": 5},
+        ]})
+        assert response.status_code == 422
+        assert response.get_json()["errors"] == [{"index": 1, "error": "Nicht genug Bestand"}]
+
+    def test_per_item(self, client):
+        """Test: atomic=false bucht den gültigen Teil"""
+        response = client.post("/api/batch", json={"atomic": False, "operations": [
+            {"type": "sale", "product_id": "P001", "quantity": 1},
+            {"type": "sale", "product_id": "P001", "quantity": 5},
+        ]})
+        assert response.status_code == 200
+        assert response.get_json()["applied"] == 1
+
+    def test_conflict(self, client, monkeypatch):
+        """Test: Geänderter Bestand während einer atomaren Buchung ergibt 409"""
+        service = client.application.warehouse_service
+        monkeypatch.setattr(service.repository, "adjust_stocks", lambda deltas: None)
+        response = client.post("/api/batch", json=[
+            {"type": "sale", "product_id": "P001", "quantity": 1},
+        ])
+        assert response.status_code == 409
+        assert service.get_product("P001").shop_qty == 2
+
+    @pytest.mark.parametrize("body", [{"ops": []}, {"operations": [], "atomic": "ja"}, 42])
+    def test_bad_request(self, client, body):
+        """Test: Falscher Aufbau ergibt 400"""
+        assert client.post("/api/batch", json=body).status_code == 400
+
+    def test_not_json(self, client):
+        """Test: Kein JSON ergibt 400"""
+        assert client.post("/api/batch", data="sale P001").status_code == 400
+
+    def test_too_many_operations(self, client, monkeypatch):
+        """Test: Mehr als MAX_BATCH_OPERATIONS ergibt 413"""
+        monkeypatch.setattr(app_module, "MAX_BATCH_OPERATIONS", 2)
+        operation = {"type": "sale", "product_id": "P001", "quantity": 1}
+        assert client.post("/api/batch", json=[operation] * 3).status_code == 413
@@ -0,0 +1,238 @@
+"""Erweiterte Tests - CachingRepository (Produkt-Cache vor dem Repository)"""
+
+import pytest
+from src.domain.product import Product
+from src.adapters.caching_repository import CachingRepository
+from src.adapters.repository import SQLiteRepository
+
+
+def _product(product_id: str = "P001", **kwargs) -> Product:
+    """Hilfsfunktion: Testprodukt erstellen"""
+    data = dict(id=product_id, name="Test", description="Test", price=10.0, warehouse_qty=100)
+    data.update(kwargs)
+    return Product(**data)
+
+
+@pytest.fixture
+def inner(tmp_path):
+    """SQLite-Repository mit 3 Produkten, das gezählt wird"""
+    repo = SQLiteRepository(str(tmp_path / "test.db"))
+    repo.save_products(_product(f"P00{i}") for i in range(1, 4))
+    return repo
+
+
+@pytest.fixture
+def cache(inner):
+    """Cache ohne Größenbegrenzung vor dem SQLite-Repository"""
+    return CachingRepository(inner)
+
+
+class TestIdentityMap:
+    """Tests für die Identity Map
+
+    Ein Produkt wird nur einmal aus der Datenbank geladen,
+    danach liefert der Cache immer dasselbe Objekt.
+    """
+
+    def test_second_load_is_hit(self, cache):
+        """Test: Zweiter Zugriff kommt aus dem Cache (gleiches Objekt)"""
+        first = cache.load_product("P001")
+        second = cache.load_product("P001")
+        assert first is second
+        assert cache.cache_info()["misses"] == 1
+        assert cache.cache_info()["hits"] == 1
+
+    def test_load_all_is_o1_without_changes(self, cache, inner, monkeypatch):
+        """Test: load_all_products fragt die Datenbank nur beim ersten Mal"""
+        first = cache.load_all_products()
+
+        def forbidden():
+            raise AssertionError("Datenbank darf nicht erneut gelesen werden")
+
+        monkeypatch.setattr(inner, "load_all_products", forbidden)
+        # Prüfe: dasselbe Dict-Objekt, keine neue Abfrage
+        assert cache.load_all_products() is first
+        assert cache.load_product("P002") is first["P002"]
+
+    def test_unknown_product_with_complete_catalogue(self, cache, inner, monkeypatch):
+        """Test: Ist der Katalog komplett geladen, braucht ein Fehlzugriff keine Abfrage"""
+        cache.load_all_products()
+        monkeypatch.setattr(inner, "load_product", lambda product_id: pytest.fail("keine Abfrage"))
+        assert cache.load_product("NONEXISTENT") is None
+
+
+class TestInvalidation:
+    """Tests für das Aktualisieren des Caches bei Schreibzugriffen"""
+
+    def test_save_updates_cache_and_database(self, cache, inner):
+        """Test: save_product schreibt durch und ist sofort im Cache sichtbar"""
+        before = cache.load_all_products()
+        cache.save_product(_product("P004", price=3.0))
+
+        after = cache.load_all_products()
+        assert after is not before
+        assert "P004" in after
+        assert inner.load_product("P004").price == 3.0
+
+    def test_delete_removes_from_cache(self, cache, inner):
+        """Test: delete_product entfernt das Produkt auch aus dem Cache"""
+        cache.load_all_products()
+        cache.delete_product("P001")
+        assert cache.load_product("P001") is None
+        assert "P001" not in cache.load_all_products()
+        assert inner.load_product("P001") is None
+
+    def test_adjust_stock_updates_cached_object(self, cache):
+        """Test: Bestandsänderung ändert das bereits ausgegebene Objekt mit"""
+        product = cache.load_product("P001")
+        cache.adjust_stock("P001", warehouse_delta=-30, shop_delta=30)
+        assert product.warehouse_qty == 70
+        assert product.shop_qty == 30
+
+    def test_rollback_invalidates_cache(self, cache, inner):
+        """Test: Nach einem Rollback liefert der Cache wieder den gespeicherten Stand"""
+        cache.load_product("P001")
+        with pytest.raises(RuntimeError):
+            with cache.transaction():
+                cache.adjust_stock("P001", warehouse_delta=-50)
+                raise RuntimeError("Abbruch")
+
+        assert cache.load_product("P001").warehouse_qty == 100
+
+    def test_stats_cached_per_generation(self, cache, inner, monkeypatch):
+        """Test: Kennzahlen werden erst nach einer Änderung neu berechnet"""
+        calls = []
+        original = inner.load_inventory_stats
+        monkeypatch.setattr(inner, "load_inventory_stats", lambda: calls.append(1) or original())
+
+        cache.load_inventory_stats()
+        cache.load_inventory_stats()
+        assert len(calls) == 1
+
+        cache.save_product(_product("P004"))
+        assert cache.load_inventory_stats()["total_products"] == 4
+        assert len(calls) == 2
+
+
+class TestLRUMode:
+    """Tests für den begrenzten Cache (max_size)"""
+
+    def test_evicts_least_recently_used(self, inner):
+        """Test: Bei max_size=2 wird das am längsten unbenutzte Produkt verdrängt"""
+        cache = CachingRepository(inner, max_size=2)
+        cache.load_product("P001")
+        cache.load_product("P002")
+        cache.load_product("P001")  # P001 wieder aktuell
+        cache.load_product("P003")  # verdrängt P002
+
+        assert cache.cache_info()["size"] == 2
+        misses = cache.misses
+        cache.load_product("P001")
+        assert cache.misses == misses
+        cache.load_product("P002")
+        assert cache.misses == misses + 1
+
+    def test_load_all_not_cached(self, inner):
+        """Test: Im LRU-Modus geht load_all_products immer an die Datenbank"""
+        cache = CachingRepository(inner, max_size=2)
+        assert len(cache.load_all_products()) == 3
+        assert cache.cache_info()["size"] == 0
+
+    def test_invalid_size(self, inner):
+        """Test: max_size 0 ist ungültig"""
+        with pytest.raises(ValueError):
+            CachingRepository(inner, max_size=0)
+
+
+class TestSharedDatabase:
+    """Tests für zwei Prozesse (hier: zwei Instanzen) auf derselben Datenbank
+
+    Jede Instanz hat ihren eigenen Cache; Schreibzugriffe der einen
+    dürfen in der anderen weder veraltet angezeigt noch überschrieben werden.
+    """
+
+    @pytest.fixture
+    def other(self, inner):
+        """Zweite, unabhängige Instanz auf derselben Datenbankdatei"""
+        return CachingRepository(SQLiteRepository(inner.db_path))
+
+    def test_refresh_sees_other_writer(self, cache, other):
+        """Test: Nach refresh() liefert der Cache die Bestände der anderen Instanz"""
+        cache.load_product("P001")
+        cache.load_inventory_stats()
+        other.adjust_stock("P001", warehouse_delta=-7)
+
+        assert cache.refresh() is True
+        assert cache.load_product("P001").warehouse_qty == 93
+        assert cache.load_inventory_stats()["total_warehouse_value"] == 2930.0
+        # Prüfe: ohne weitere Änderung bleibt der Cache erhalten
+        assert cache.refresh() is False
+
+    def test_stale_save_rejected(self, cache, other):
+        """Test: Ein veraltetes Objekt wird abgewiesen statt alte Bestände zu schreiben"""
+        stale = cache.load_product("P001")
+        other.adjust_stock("P001", warehouse_delta=-7)
+
+        stale.name = "Umbenannt"
+        with pytest.raises(ValueError):
+            cache.save_product(stale)
+
+        stored = other.inner.load_product("P001")
+        assert stored.name == "Test"
+        assert stored.warehouse_qty == 93
+        # Prüfe: neu geladen lässt sich das Produkt wieder speichern
+        fresh = cache.load_product("P001")
+        assert fresh is not stale
+        fresh.name = "Umbenannt"
+        cache.save_product(fresh)
+        assert other.inner.load_product("P001").name == "Umbenannt"
+
+    def test_save_writes_stock(self, cache, other):
+        """Test: Ein aktuelles Objekt speichert auch geänderte Bestände"""
+        product = cache.load_product("P001")
+        product.warehouse_qty = 50
+        cache.save_product(product)
+        # Prüfe: eigene Schreibzugriffe machen das Objekt nicht veraltet
+        product.shop_qty = 5
+        cache.save_product(product)
+
+        stored = other.inner.load_product("P001")
+        assert (stored.warehouse_qty, stored.shop_qty) == (50, 5)
+
+    def test_merge_only_after_commit(self, cache):
+        """Test: Bestandsänderungen erreichen gecachte Objekte erst nach dem Commit"""
+        product = cache.load_product("P001")
+        with cache.transaction():
+            changed = cache.adjust_stock("P001", warehouse_delta=-30)
+            assert changed.warehouse_qty == 70
+            assert product.warehouse_qty == 100
+            # Prüfe: in der Transaktion wird der Stand der Transaktion gelesen
+            assert cache.load_product("P001").warehouse_qty == 70
+        assert product.warehouse_qty == 70
+        assert cache.load_product("P001") is product
+
+
+class TestAppCache:
+    """Tests für den Produkt-Cache in der Web-App"""
+
+    def test_app_without_cache_by_default(self, tmp_path):
+        """Test: create_app legt standardmäßig keinen Cache an"""
+        from app import create_app
+
+        app = create_app(db_path=str(tmp_path / "app.db"), pool_size=0)
+        assert isinstance(app.warehouse_service.repository, SQLiteRepository)
+
+    def test_cached_app_sees_other_process(self, tmp_path):
+        """Test: Mit Cache sieht jeder Request die Verkäufe eines anderen Prozesses"""
+        from app import create_app
+
+        db_path = str(tmp_path / "app.db")
+        app = create_app(db_path=db_path, pool_size=0, product_cache_size=None)
+        service = app.warehouse_service
+        service.create_product("P001", "Test", "Test", 10.0, warehouse_qty=0, shop_qty=10)
+        client = app.test_client()
+        assert client.get("/api/products").get_json()["items"][0]["shop_qty"] == 10
+
+        SQLiteRepository(db_path).adjust_stock("P001", shop_delta=-7)
+
+        assert client.get("/api/products").get_json()["items"][0]["shop_qty"] == 3
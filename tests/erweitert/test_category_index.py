@@ -0,0 +1,86 @@
+"""Erweiterte Tests - Kategorie-Abfragen über den Kategorieindex"""
+
+import pytest
+from src.domain.product import Product
+from src.adapters.caching_repository import CachingRepository
+from src.adapters.repository import SQLiteRepository
+from src.services import WarehouseService
+
+
+@pytest.fixture
+def repository(repository):
+    """Alle Repositories mit 4 Produkten in 2 Kategorien (P004 ohne Kategorie)"""
+    repository.save_products([
+        Product(id="P001", name="Kopierpapier", description="", price=5.0, category="Papier"),
+        Product(id="P002", name="Kugelschreiber", description="", price=1.0, category="Schreiben"),
+        Product(id="P003", name="Karton", description="", price=2.0, category="Papier"),
+        Product(id="P004", name="Sonstiges", description="", price=1.0),
+    ])
+    return repository
+
+
+def _ids(products):
+    """Hilfsfunktion: nur die IDs vergleichen"""
+    return [p.id for p in products]
+
+
+class TestCategoryIndex:
+    """Tests für load_products_by_category und load_categories"""
+
+    def test_products_by_category(self, repository):
+        """Test: Nur Produkte der Kategorie, in Speicherreihenfolge"""
+        assert _ids(repository.load_products_by_category("Papier")) == ["P001", "P003"]
+        assert repository.load_products_by_category("Unbekannt") == []
+
+    def test_categories_sorted_without_empty(self, repository):
+        """Test: Kategorien alphabetisch, leere Kategorie fehlt"""
+        assert repository.load_categories() == ["Papier", "Schreiben"]
+
+    def test_category_change_moves_product(self, repository):
+        """Test: Kategoriewechsel eines (im Speicher geänderten) Produkts wird übernommen"""
+        product = repository.load_product("P002")
+        product.category = "Papier"
+        repository.save_product(product)
+
+        assert _ids(repository.load_products_by_category("Papier")) == ["P001", "P002", "P003"]
+        assert repository.load_products_by_category("Schreiben") == []
+        assert repository.load_categories() == ["Papier"]
+
+    def test_delete_and_rollback(self, repository):
+        """Test: Löschen entfernt aus der Kategorie, Rollback stellt wieder her"""
+        repository.delete_product("P001")
+        assert _ids(repository.load_products_by_category("Papier")) == ["P003"]
+
+        with pytest.raises(RuntimeError):
+            with repository.transaction():
+                repository.delete_product("P002")
+                raise RuntimeError("Abbruch")
+        assert repository.load_categories() == ["Papier", "Schreiben"]
+
+    def test_service_uses_index(self, repository, monkeypatch):
+        """Test: Service lädt für Kategorieseiten nicht den ganzen Katalog"""
+        service = WarehouseService(repository)
+        monkeypatch.setattr(repository, "load_all_products", lambda: pytest.fail("kein Vollscan"))
+        assert [p["id"] for p in service.get_products_by_category("Schreiben")] == ["P002"]
+        assert service.get_product_categories() == ["Papier", "Schreiben"]
+
+
+class TestCachedCategories:
+    """Tests für das Zwischenspeichern der Kategorie-Abfragen im CachingRepository"""
+
+    def test_categories_cached_until_change(self, tmp_path, monkeypatch):
+        """Test: Kategorieliste nur einmal pro Generation aus der Datenbank"""
+        inner = SQLiteRepository(str(tmp_path / "test.db"))
+        cache = CachingRepository(inner)
+        cache.save_product(Product(id="P001", name="A", description="", price=1.0, category="Papier"))
+        calls = []
+        original = inner.load_categories
+        monkeypatch.setattr(inner, "load_categories", lambda: calls.append(1) or original())
+
+        assert cache.load_categories() == ["Papier"]
+        assert cache.load_categories() == ["Papier"]
+        assert len(calls) == 1
+
+        cache.save_product(Product(id="P002", name="B", description="", price=1.0, category="Büro"))
+        assert cache.load_categories() == ["Büro", "Papier"]
+        assert len(calls) == 2
@@ -0,0 +1,131 @@
+"""Erweiterte Tests - Chart-Cache für Report B"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from src.domain.warehouse import Movement
+from src.reports import chart_cache as chart_cache_module
+from src.reports.chart_cache import ChartCache, chart_fingerprint
+from src.reports.report_b import ReportB
+
+START = datetime(2026, 1, 1, 8, 0, 0)
+
+
+def _movements(quantities):
+    """Hilfsfunktion: eine Bewegung pro Menge, alle am selben Tag"""
+    return [
+        Movement(id=f"M{i}", product_id="P001", product_name="Test", quantity_change=qty,
+                 movement_type="IN", timestamp=START + timedelta(minutes=i))
+        for i, qty in enumerate(quantities)
+    ]
+
+
+class TestChartFingerprint:
+    """Tests für chart_fingerprint"""
+
+    def test_same_series_same_key(self):
+        """Test: Gleiche Datenreihen ergeben denselben Fingerabdruck"""
+        assert chart_fingerprint("a", [["2026-01-01"], [3]]) == chart_fingerprint("a", [["2026-01-01"], [3]])
+
+    def test_different_series_or_name(self):
+        """Test: Andere Werte oder anderer Chart ergeben einen anderen Fingerabdruck"""
+        key = chart_fingerprint("a", [["2026-01-01"], [3]])
+        assert chart_fingerprint("a", [["2026-01-01"], [4]]) != key
+        assert chart_fingerprint("b", [["2026-01-01"], [3]]) != key
+
+
+class TestChartCache:
+    """Tests für ChartCache (LRU, TTL, Platte)"""
+
+    def test_get_or_render_renders_once(self):
+        """Test: Zweiter Zugriff kommt aus dem Cache"""
+        cache = ChartCache()
+        calls = []
+
+        def render():
+            calls.append(1)
+            return b"png"
+
+        assert cache.get_or_render("k", render) == b"png"
+        assert cache.get_or_render("k", render) == b"png"
+        assert len(calls) == 1
+        assert cache.cache_info()["hits"] == 1
+
+    def test_lru_eviction(self):
+        """Test: Über max_entries wird der am längsten nicht genutzte Chart verdrängt"""
+        cache = ChartCache(max_entries=2)
+        cache.put("a", b"1")
+        cache.put("b", b"2")
+        cache.get("a")
+        cache.put("c", b"3")
+        # Prüfe: b war am längsten ungenutzt
+        assert cache.get("b") is None
+        assert cache.get("a") == b"1"
+        assert cache.get("c") == b"3"
+
+    def test_ttl_expiry(self, monkeypatch):
+        """Test: Einträge älter als ttl werden verworfen"""
+        now = [1000.0]
+        monkeypatch.setattr(chart_cache_module.time, "time", lambda: now[0])
+        cache = ChartCache(ttl=60)
+        cache.put("a", b"1")
+        now[0] += 59
+        assert cache.get("a") == b"1"
+        now[0] += 2
+        assert cache.get("a") is None
+
+    def test_disk_survives_new_instance(self, tmp_path):
+        """Test: Mit directory findet eine neue Instanz den Chart auf der Platte"""
+        ChartCache(directory=tmp_path).put("a", b"png")
+        cache = ChartCache(directory=tmp_path)
+        assert cache.get("a") == b"png"
+        assert (tmp_path / "a.png").read_bytes() == b"png"
+
+    def test_disk_eviction(self, tmp_path):
+        """Test: Auch auf der Platte bleiben höchstens max_entries Charts"""
+        cache = ChartCache(max_entries=2, directory=tmp_path)
+        for key in ("a", "b", "c"):
+            cache.put(key, key.encode())
+        assert len(list(tmp_path.glob("*.png"))) == 2
+
+    def test_clear(self, tmp_path):
+        """Test: clear leert Speicher und Platte"""
+        cache = ChartCache(directory=tmp_path)
+        cache.put("a", b"1")
+        cache.clear()
+        assert cache.get("a") is None
+        assert not list(tmp_path.glob("*.png"))
+
+    @pytest.mark.parametrize("kwargs", [{"max_entries": 0}, {"ttl": 0}])
+    def test_invalid_arguments(self, kwargs):
+        """Test: Ungültige Größe oder Lebensdauer"""
+        with pytest.raises(ValueError):
+            ChartCache(**kwargs)
+
+
+class TestReportBChartCache:
+    """Tests für Report B mit Chart-Cache"""
+
+    def test_unchanged_data_is_not_rendered_again(self, renders):
+        """Test: Zweiter Report mit denselben Daten rendert nichts neu"""
+        cache = ChartCache()
+        first = ReportB(_movements([1, 2]), [], chart_cache=cache).generate_movement_chart()
+        second = ReportB(_movements([1, 2]), [], chart_cache=cache).generate_movement_chart()
+        assert first == second
+        assert len(renders) == 1
+
+    def test_key_is_aggregated_series(self, renders):
+        """Test: Andere Bewegungen mit gleicher Tagesreihe treffen denselben Chart"""
+        cache = ChartCache()
+        ReportB(_movements([1, 2]), [], chart_cache=cache).generate_movement_chart()
+        ReportB(_movements([5, -3]), [], chart_cache=cache).generate_movement_chart()
+        # Prüfe: Anzahl pro Tag ist gleich (2), Mengen egal für diesen Chart
+        assert len(renders) == 1
+        ReportB(_movements([1, 2, 3]), [], chart_cache=cache).generate_movement_chart()
+        assert len(renders) == 2
+
+    def test_without_cache_same_output(self, renders):
+        """Test: Ohne Cache wird jedes Mal gerendert, das Ergebnis ist gleich kodiert"""
+        report = ReportB(_movements([1, 2]), [])
+        assert report.generate_movement_type_chart() == report.generate_movement_type_chart()
+        assert len(renders) == 2
@@ -0,0 +1,118 @@
+"""Erweiterte Tests - Report-Charts im Prozesspool rendern"""
+
+import multiprocessing
+import os
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from src.domain.warehouse import Movement
+from src.reports import chart_pool as chart_pool_module
+from src.reports.chart_cache import ChartCache
+from src.reports.chart_pool import ChartRenderPool
+from src.reports.report_b import ReportB
+
+START = datetime(2026, 1, 1, 8, 0, 0)
+
+MOVEMENTS = [
+    Movement(id=f"M{i}", product_id="P001", product_name="Test", quantity_change=2 if i % 2 else -1,
+             movement_type="IN" if i % 2 else "SOLD", timestamp=START + timedelta(hours=9 * i))
+    for i in range(12)
+]
+PRODUCTS = [
+    {"id": "P001", "name": "Ordner", "category": "Papier", "price": 2.5,
+     "warehouse_qty": 4, "shop_qty": 2, "available_total": 6, "is_low_stock": False},
+]
+
+
+def _never_ready(barrier, timeout):
+    """Initializer, dessen Worker nie alle an der Barriere ankommen (wie ein fehlender Worker)"""
+    chart_pool_module._start_barrier = threading.Barrier(2)
+    chart_pool_module._start_timeout = timeout
+
+
+def _failing_worker(barrier, timeout):
+    """Initializer, der beim Start abbricht"""
+    raise OSError("Worker konnte nicht starten")
+
+
+class _RecordingPool:
+    """Pool-Ersatz im selben Prozess, merkt sich die übergebenen Aufträge"""
+
+    def __init__(self):
+        self.jobs = []
+
+    def render(self, jobs):
+        from src.reports.charts import render_png
+
+        self.jobs.append(jobs)
+        return {name: render_png(name, series) for name, series in jobs.items()}
+
+
+@pytest.fixture(scope="module")
+def pool():
+    """Echter Pool mit zwei Workern (Start per spawn dauert etwas)"""
+    render_pool = ChartRenderPool(max_workers=2)
+    yield render_pool
+    render_pool.shutdown()
+
+
+class TestChartRenderPool:
+    """Tests für ChartRenderPool und ReportB mit render_pool"""
+
+    def test_workers_are_started_up_front(self, pool):
+        """Test: Alle Worker laufen schon nach dem Konstruktor, in eigenen Prozessen"""
+        assert len(pool.worker_pids) == 2
+        assert os.getpid() not in pool.worker_pids
+
+    def test_same_charts_as_in_process(self, pool):
+        """Test: Charts aus dem Pool sind identisch mit den lokal gerenderten"""
+        names = ["movement_timeline", "movement_types", "inventory_value", "warehouse_vs_shop"]
+        pooled = ReportB(MOVEMENTS, PRODUCTS, render_pool=pool).render_charts(names)
+        local = ReportB(MOVEMENTS, PRODUCTS).render_charts(names)
+        assert pooled == local
+        assert all(png.startswith(b"\x89PNG") for png in pooled.values())
+
+    def test_only_series_are_sent(self):
+        """Test: An den Pool gehen nur Chart-Namen und aggregierte Reihen"""
+        recording = _RecordingPool()
+        report = ReportB(MOVEMENTS, PRODUCTS, render_pool=recording)
+        report.generate_full_report()
+
+        assert len(recording.jobs) == 1
+        jobs = recording.jobs[0]
+        assert set(jobs) == {"movement_timeline", "movement_types", "inventory_value", "warehouse_vs_shop"}
+        assert jobs["warehouse_vs_shop"] == [4, 2]
+        # Prüfe: keine Movement-Objekte in den Aufträgen
+        assert "Movement" not in repr(jobs)
+
+    def test_cached_charts_skip_the_pool(self):
+        """Test: Charts aus dem Chart-Cache werden nicht an den Pool gegeben"""
+        recording = _RecordingPool()
+        cache = ChartCache()
+        ReportB(MOVEMENTS, PRODUCTS, chart_cache=cache, render_pool=recording).generate_full_report()
+        ReportB(MOVEMENTS, PRODUCTS, chart_cache=cache, render_pool=recording).generate_full_report()
+        assert len(recording.jobs) == 1
+
+    def test_empty_charts_skip_the_pool(self):
+        """Test: Charts ohne Daten werden gar nicht gerendert"""
+        recording = _RecordingPool()
+        report = ReportB([], [], render_pool=recording)
+        assert report.generate_full_report()["charts"]["movement_timeline"] == ""
+        assert set(recording.jobs[0]) == {"warehouse_vs_shop"}
+
+    def test_invalid_worker_count(self):
+        """Test: Pool ohne Worker ist nicht erlaubt"""
+        with pytest.raises(ValueError):
+            ChartRenderPool(max_workers=0)
+
+    @pytest.mark.skipif(
+        "fork" not in multiprocessing.get_all_start_methods(),
+        reason="Ersatz-Initializer nur per fork im Worker sichtbar",
+    )
+    @pytest.mark.parametrize("initializer", [_never_ready, _failing_worker])
+    def test_start_failure_raises(self, monkeypatch, initializer):
+        """Test: Startet ein Worker nicht, bricht der Konstruktor ab statt zu hängen"""
+        monkeypatch.setattr(chart_pool_module, "_warm_worker", initializer)
+        with pytest.raises(RuntimeError, match="nicht innerhalb"):
+            ChartRenderPool(max_workers=1, start_method="fork", start_timeout=0.5)
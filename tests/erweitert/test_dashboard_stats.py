@@ -0,0 +1,296 @@
+"""Erweiterte Tests - Dashboard-Kennzahlen aus dem Repository (Aggregation)"""
+
+import sqlite3
+import threading
+import time
+
+import pytest
+from src.adapters.caching_repository import CachingRepository
+from src.adapters.repository import InMemoryRepository, SQLiteRepository
+from src.services import WarehouseService
+
+
+@pytest.fixture
+def service(repository):
+    """Service mit 4 Produkten in 2 Kategorien (P003 ohne Kategorie)"""
+    service = WarehouseService(repository)
+    service.create_product("P001", "Papier", "A4", 5.0, category="Papier", warehouse_qty=100, shop_qty=20)
+    service.create_product("P002", "Karton", "A3", 2.5, category="Papier", warehouse_qty=4, shop_qty=0)
+    service.create_product("P003", "Locher", "", 12.0, warehouse_qty=0, shop_qty=3)
+    service.create_product("P004", "Stift", "blau", 1.0, category="Schreiben", warehouse_qty=8, shop_qty=50)
+    return service
+
+
+class TestInventoryStats:
+    """Tests für RepositoryPort.load_inventory_stats
+
+    Die Kennzahlen müssen dieselben Werte liefern wie die
+    Berechnung über alle geladenen Produkte.
+    """
+
+    def test_stats_match_product_values(self, service):
+        """Test: Summen und Zählungen stimmen mit den Produkten überein"""
+        stats = service.repository.load_inventory_stats()
+        assert stats["total_products"] == 4
+        assert stats["total_warehouse_value"] == pytest.approx(5.0 * 100 + 2.5 * 4 + 1.0 * 8)
+        assert stats["total_shop_value"] == pytest.approx(5.0 * 20 + 12.0 * 3 + 1.0 * 50)
+        assert stats["warehouse_product_count"] == 3
+        assert stats["shop_product_count"] == 3
+        # Prüfe: P002, P003, P004 unter Mindestbestand 10
+        assert stats["low_stock_count"] == 3
+        assert stats["categories"] == {"Papier": 2, "Schreiben": 1}
+        assert stats["most_valuable_product_id"] == "P001"
+
+    def test_empty_repository(self, tmp_path):
+        """Test: Leeres Sortiment liefert Nullwerte"""
+        for repository in (InMemoryRepository(), SQLiteRepository(str(tmp_path / "empty.db"))):
+            stats = repository.load_inventory_stats()
+            assert stats["total_products"] == 0
+            assert stats["total_warehouse_value"] == 0
+            assert stats["categories"] == {}
+            assert stats["most_valuable_product_id"] is None
+
+    def test_low_stock_products_sorted_and_limited(self, service):
+        """Test: Kritischste Produkte zuerst, limit begrenzt die Anzahl"""
+        low_stock = service.repository.load_low_stock_products()
+        assert [p.id for p in low_stock] == ["P003", "P002", "P004"]
+        assert [p.id for p in service.repository.load_low_stock_products(limit=2)] == ["P003", "P002"]
+
+
+class TestDashboardStats:
+    """Tests für WarehouseService.get_dashboard_stats"""
+
+    def test_dashboard_does_not_load_catalogue(self, service, monkeypatch):
+        """Test: Dashboard kommt ohne load_all_products aus"""
+
+        def forbidden():
+            raise AssertionError("load_all_products darf nicht aufgerufen werden")
+
+        monkeypatch.setattr(service.repository, "load_all_products", forbidden)
+        stats = service.get_dashboard_stats()
+
+        assert stats["total_products"] == 4
+        assert stats["total_inventory_value"] == pytest.approx(518.0 + 186.0)
+        assert stats["top_categories"] == [("Papier", 2), ("Schreiben", 1)]
+        assert stats["categories"] == ["Papier", "Schreiben"]
+        assert stats["most_valuable_product"].id == "P001"
+        assert [p.id for p in stats["low_stock_products"]] == ["P003", "P002", "P004"]
+
+    def test_value_helpers_use_aggregates(self, service):
+        """Test: Einzelwerte des Service passen zu den Kennzahlen"""
+        assert service.get_total_warehouse_value() == pytest.approx(518.0)
+        assert service.get_total_shop_value() == pytest.approx(186.0)
+        assert service.get_total_inventory_value() == pytest.approx(704.0)
+        assert service.get_low_stock_count() == 3
+
+
+class TestLowStockSet:
+    """Tests für die laufend gepflegte Low-Stock-Menge
+
+    Jede Bestandsänderung soll sofort in load_low_stock_products
+    und count_low_stock_products sichtbar sein, ohne Vollscan.
+    """
+
+    def test_sale_below_minimum_adds_product(self, service):
+        """Test: P001 fällt durch Umlagerung unter Mindestbestand (10)"""
+        assert service.repository.count_low_stock_products() == 3
+        service.transfer_to_shop("P001", 95)
+
+        assert service.get_low_stock_count() == 4
+        assert [p.id for p in service.get_low_stock_products()] == ["P003", "P002", "P001", "P004"]
+
+    def test_purchase_removes_product(self, service):
+        """Test: Einkauf hebt P002 über Mindestbestand"""
+        service.create_purchase("P002", 20)
+        assert [p.id for p in service.get_low_stock_products()] == ["P003", "P004"]
+        assert service.get_low_stock_count() == 2
+
+    def test_rollback_restores_set(self, service):
+        """Test: Abgebrochene Bestandsänderung lässt die Menge unverändert"""
+        with pytest.raises(RuntimeError):
+            with service.repository.transaction():
+                service.repository.adjust_stock("P001", warehouse_delta=-99)
+                raise RuntimeError("Abbruch")
+        assert service.get_low_stock_count() == 3
+
+    def test_limit_and_delete(self, service):
+        """Test: limit liefert die kritischsten, Löschen entfernt aus der Menge"""
+        assert [p.id for p in service.get_low_stock_products(limit=1)] == ["P003"]
+        service.delete_product("P003")
+        assert [p.id for p in service.get_low_stock_products(limit=1)] == ["P002"]
+        assert service.get_low_stock_count() == 2
+
+
+def _assert_totals_match(repository):
+    """Laufende Summen entsprechen der vollständigen Neuberechnung"""
+    totals = repository.load_inventory_totals()
+    stats = repository.load_inventory_stats()
+    assert totals["total_warehouse_value"] == pytest.approx(stats["total_warehouse_value"])
+    assert totals["total_shop_value"] == pytest.approx(stats["total_shop_value"])
+
+
+def _add_drift(repository, amount):
+    """Laufende Lagersumme künstlich verfälschen (wie aufgelaufene Rundungsfehler)"""
+    if isinstance(repository, CachingRepository):
+        # Am Cache vorbei, wie eine Änderung von außen
+        _add_drift(repository.inner, amount)
+        repository.invalidate()
+    elif isinstance(repository, InMemoryRepository):
+        repository._warehouse_value += amount
+    else:
+        with repository._connect() as conn:
+            conn.execute("UPDATE inventory_totals SET warehouse_value = warehouse_value + ?", (amount,))
+
+
+class TestInventoryTotals:
+    """Tests für die laufenden Bestandswert-Summen
+
+    Jede Änderung an Preis oder Beständen wird per Delta fortgeschrieben;
+    reconcile_inventory_totals gleicht mit einer Neuberechnung ab.
+    """
+
+    def test_totals_follow_changes(self, service):
+        """Test: Umlagerung, Einkauf, Verkauf, Preisänderung und Löschen"""
+        repository = service.repository
+        _assert_totals_match(repository)
+
+        service.transfer_to_shop("P001", 30)
+        service.create_purchase("P002", 10)
+        service.sell_product("P004", 5)
+        _assert_totals_match(repository)
+
+        # Preisänderung am bereits geladenen (und ggf. geteilten) Objekt
+        product = service.get_product("P002")
+        product.price = 20.0
+        service.update_product(product)
+        _assert_totals_match(repository)
+
+        service.delete_product("P003")
+        _assert_totals_match(repository)
+        assert service.get_total_inventory_value() == pytest.approx(120 * 5.0 + 14 * 20.0 + 53 * 1.0)
+
+    def test_totals_without_full_scan(self, service, monkeypatch):
+        """Test: Gesamtwerte kommen ohne Durchlauf über die Produkte aus"""
+
+        def forbidden():
+            raise AssertionError("Vollständige Neuberechnung darf nicht aufgerufen werden")
+
+        monkeypatch.setattr(service.repository, "load_inventory_stats", forbidden)
+        monkeypatch.setattr(service.repository, "load_all_products", forbidden)
+        assert service.get_total_warehouse_value() == pytest.approx(518.0)
+        assert service.get_total_shop_value() == pytest.approx(186.0)
+
+    def test_rollback_restores_totals(self, service):
+        """Test: Abgebrochene Transaktion lässt die Summen unverändert"""
+        with pytest.raises(RuntimeError):
+            with service.repository.transaction():
+                service.repository.adjust_stock("P001", warehouse_delta=-50)
+                service.delete_product("P004")
+                raise RuntimeError("Abbruch")
+        assert service.get_total_warehouse_value() == pytest.approx(518.0)
+        _assert_totals_match(service.repository)
+
+    def test_reconcile_corrects_drift(self, service):
+        """Test: Abgleich meldet die Abweichung und setzt die Summen zurück"""
+        _add_drift(service.repository, 0.75)
+        assert service.get_total_warehouse_value() == pytest.approx(518.75)
+
+        result = service.reconcile_inventory_totals()
+        assert result["warehouse_drift"] == pytest.approx(0.75)
+        assert result["shop_drift"] == pytest.approx(0.0)
+        assert result["total_warehouse_value"] == pytest.approx(518.0)
+        assert service.last_reconciliation is result
+        assert service.get_total_warehouse_value() == pytest.approx(518.0)
+
+    def test_reads_never_reconcile(self, service):
+        """Test: Lesen liefert die laufende Summe und gleicht nie selbst ab"""
+        _add_drift(service.repository, 1.0)
+        assert service.get_total_warehouse_value() == pytest.approx(519.0)
+        assert service.last_reconciliation is None
+
+    def test_dashboard_uses_running_totals(self, service):
+        """Test: Dashboard zeigt die Bestandswerte aus load_inventory_totals"""
+        _add_drift(service.repository, 1.0)
+        stats = service.get_dashboard_stats()
+        assert stats["total_warehouse_value"] == pytest.approx(519.0)
+        assert stats["total_inventory_value"] == pytest.approx(705.0)
+
+    def test_background_reconcile(self, service):
+        """Test: run_reconciliation gleicht im Hintergrund-Thread ab, bis stop gesetzt ist"""
+        _add_drift(service.repository, 1.0)
+        stop = threading.Event()
+        thread = threading.Thread(target=service.run_reconciliation, args=(0.01, stop))
+        thread.start()
+        try:
+            for _ in range(500):
+                if service.last_reconciliation is not None:
+                    break
+                time.sleep(0.01)
+        finally:
+            stop.set()
+            thread.join(timeout=5)
+
+        assert not thread.is_alive()
+        assert service.last_reconciliation["warehouse_drift"] == pytest.approx(1.0)
+        assert service.get_total_warehouse_value() == pytest.approx(518.0)
+
+    def test_background_reconcile_logs(self, service, caplog, monkeypatch):
+        """Test: Abweichungen und Fehler im Hintergrund-Thread werden geloggt"""
+        _add_drift(service.repository, 1.0)
+        results = [RuntimeError("Datenbank gesperrt")]
+        original = service.reconcile_inventory_totals
+
+        def flaky():
+            if results:
+                raise results.pop()
+            stop.set()
+            return original()
+
+        monkeypatch.setattr(service, "reconcile_inventory_totals", flaky)
+        stop = threading.Event()
+        with caplog.at_level("WARNING", logger="src.services.warehouse_service"):
+            service.run_reconciliation(0.001, stop)
+
+        assert "fehlgeschlagen" in caplog.records[0].getMessage()
+        assert caplog.records[0].exc_info is not None
+        assert "Lager +1.000000" in caplog.records[1].getMessage()
+
+    def test_app_starts_no_thread_by_default(self, app):
+        """Test: create_app startet den Abgleich nur mit totals_reconcile_interval"""
+        assert app.reconciliation_thread is None
+
+    def test_existing_database_is_seeded(self, tmp_path):
+        """Test: Datenbank ohne Summentabelle (ältere Version) wird beim Öffnen gefüllt"""
+        db_path = str(tmp_path / "alt.db")
+        service = WarehouseService(SQLiteRepository(db_path))
+        service.create_product("P001", "Papier", "A4", 5.0, warehouse_qty=10, shop_qty=2)
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("DROP TABLE inventory_totals")
+
+        repository = SQLiteRepository(db_path)
+        assert repository.load_inventory_totals() == {"total_warehouse_value": 50.0, "total_shop_value": 10.0}
+
+    def test_caching_repository(self, tmp_path):
+        """Test: Cache liefert die Summen bis zur nächsten Änderung, danach neu"""
+        service = WarehouseService(CachingRepository(SQLiteRepository(str(tmp_path / "test.db"))))
+        service.create_product("P001", "Papier", "A4", 5.0, warehouse_qty=10)
+        assert service.get_total_warehouse_value() == 50.0
+
+        service.transfer_to_shop("P001", 4)
+        assert service.get_total_warehouse_value() == 30.0
+        assert service.get_total_shop_value() == 20.0
+        _assert_totals_match(service.repository)
+
+    def test_caching_repository_reconcile_without_drift(self, tmp_path):
+        """Test: Abgleich ohne Abweichung lässt die zwischengespeicherten Ergebnisse stehen"""
+        cache = CachingRepository(SQLiteRepository(str(tmp_path / "test.db")))
+        service = WarehouseService(cache)
+        service.create_product("P001", "Papier", "A4", 5.0, warehouse_qty=10)
+        generation = cache.cache_info()["generation"]
+
+        assert service.reconcile_inventory_totals()["warehouse_drift"] == 0
+        assert cache.cache_info()["generation"] == generation
+
+        _add_drift(cache.inner, 0.5)
+        service.reconcile_inventory_totals()
+        assert cache.cache_info()["generation"] == generation + 1
@@ -0,0 +1,122 @@
+"""Erweiterte Tests - Gestreamter Export von Bestand und Bewegungen"""
+
+import csv
+import gzip
+import io
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from src.adapters.export import gzip_chunks, iter_movements_csv, iter_movements_jsonl
+from src.domain.warehouse import Movement
+
+START = datetime(2026, 1, 1, 8, 0, 0)
+
+
+def _movements(count):
+    return [
+        Movement(id=f"M{i}", product_id="P001", product_name='Ordner "A4", blau', quantity_change=i - 1,
+                 movement_type="IN", reason=None if i % 2 else "Lieferung\nTeil 2",
+                 timestamp=START + timedelta(minutes=i))
+        for i in range(count)
+    ]
+
+
+class TestExportFormats:
+    """Tests für iter_movements_csv, iter_movements_jsonl und gzip_chunks"""
+
+    def test_csv_roundtrip(self):
+        """Test: CSV mit Kopfzeile, Sonderzeichen korrekt maskiert"""
+        text = "".join(iter_movements_csv(_movements(3)))
+        rows = list(csv.DictReader(io.StringIO(text)))
+        assert len(rows) == 3
+        assert rows[0]["product_name"] == 'Ordner "A4", blau'
+        assert rows[0]["reason"] == "Lieferung\nTeil 2"
+        assert rows[1]["reason"] == ""
+        assert rows[2]["quantity_change"] == "1"
+        assert rows[2]["timestamp"] == (START + timedelta(minutes=2)).isoformat()
+
+    def test_csv_empty(self):
+        """Test: Ohne Bewegungen nur die Kopfzeile"""
+        assert "".join(iter_movements_csv([])).startswith("id,timestamp,")
+
+    def test_jsonl_roundtrip(self):
+        """Test: Eine JSON-Zeile pro Bewegung"""
+        lines = "".join(iter_movements_jsonl(_movements(3))).splitlines()
+        assert len(lines) == 3
+        assert json.loads(lines[0])["reason"] == "Lieferung\nTeil 2"
+        assert json.loads(lines[1])["reason"] == ""
+
+    def test_chunk_size(self):
+        """Test: Große Exporte kommen in mehreren Blöcken"""
+        chunks = list(iter_movements_csv(_movements(2000), size=4096))
+        assert len(chunks) > 10
+        assert max(len(c) for c in chunks) < 4096 + 200
+
+    def test_gzip_stream(self):
+        """Test: Komprimierte Blöcke ergeben zusammen eine gültige gzip-Datei"""
+        chunks = ["äöü\n"] * 1000
+        assert gzip.decompress(b"".join(gzip_chunks(chunks))).decode() == "".join(chunks)
+
+
+@pytest.fixture
+def app(app):
+    """Web-App mit einem Produkt und drei Bewegungen"""
+    service = app.warehouse_service
+    service.create_product("P001", "Ordner", "A4", 2.5, category="Papier", warehouse_qty=10)
+    service.create_purchase("P001", 5)
+    service.transfer_to_shop("P001", 3)
+    service.sell_product("P001", 1)
+    return app
+
+
+class TestExportRoutes:
+    """Tests für /export/..."""
+
+    def test_inventory_txt(self, client):
+        """Test: Lagerbericht aus dem Repository (nicht mehr leer)"""
+        response = client.get("/export/inventory.txt")
+        text = response.get_data(as_text=True)
+        assert response.status_code == 200
+        assert response.mimetype == "text/plain"
+        assert "attachment" in response.headers["Content-Disposition"]
+        assert "ID: P001" in text
+        assert "Gesamtwert Lager:" in text
+
+    def test_movements_csv(self, client):
+        """Test: Alle Bewegungen als CSV, gestreamt"""
+        response = client.get("/export/movements.csv")
+        assert response.is_streamed
+        rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+        assert [row["movement_type"] for row in rows] == ["IN", "TO_SHOP", "SOLD"]
+
+    def test_movements_jsonl_window(self, client):
+        """Test: since/until filtern das Zeitfenster"""
+        tomorrow = (datetime.now() + timedelta(days=1)).date().isoformat()
+        response = client.get(f"/export/movements.jsonl?since={tomorrow}")
+        assert response.status_code == 200
+        assert response.get_data() == b""
+
+        response = client.get("/export/movements.jsonl?until=2000-01-01")
+        assert response.get_data() == b""
+        assert len(client.get("/export/movements.jsonl").get_data(as_text=True).splitlines()) == 3
+
+    def test_invalid_window(self, client):
+        """Test: Ungültiges Datum ergibt 400"""
+        assert client.get("/export/movements.csv?since=gestern").status_code == 400
+
+    @pytest.mark.parametrize(
+        "url, headers",
+        [("/export/movements.csv?gzip=1", {}), ("/export/movements.csv", {"Accept-Encoding": "gzip"})],
+    )
+    def test_gzip(self, client, url, headers):
+        """Test: gzip per ?gzip=1 oder Accept-Encoding"""
+        response = client.get(url, headers=headers)
+        assert response.headers["Content-Encoding"] == "gzip"
+        text = gzip.decompress(response.get_data()).decode()
+        assert text.startswith("id,timestamp,")
+        assert len(text.splitlines()) == 4
+
+    def test_no_gzip_by_default(self, client):
+        """Test: Ohne Anfrage unkomprimiert"""
+        assert "Content-Encoding" not in client.get("/export/movements.csv").headers
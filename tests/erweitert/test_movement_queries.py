@@ -0,0 +1,249 @@
+"""Erweiterte Tests - Gefilterte und seitenweise Abfrage von Lagerbewegungen"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from src.domain.movement_columns import from_epoch_us
+from src.domain.product import Product
+from src.domain.warehouse import Movement
+from src.adapters.repository import InMemoryRepository, SQLiteRepository
+
+START = datetime(2026, 1, 1, 8, 0, 0)
+
+
+@pytest.fixture
+def repository(repository):
+    """Alle Repositories mit 2 Produkten und 20 Bewegungen (eine pro Stunde)
+
+    Gerade Bewegungen: P001 / IN, ungerade: P002 / SOLD.
+    Bewegung 10 und 11 haben denselben Zeitstempel (Gleichstand).
+    """
+    repo = repository
+    for product_id in ("P001", "P002"):
+        repo.save_product(Product(id=product_id, name=product_id, description="T", price=1.0))
+    for i in range(20):
+        repo.save_movement(
+            Movement(
+                id=f"M{i:02d}",
+                product_id="P001" if i % 2 == 0 else "P002",
+                product_name="Test",
+                quantity_change=1,
+                movement_type="IN" if i % 2 == 0 else "SOLD",
+                timestamp=START + timedelta(hours=10 if i == 11 else i),
+            )
+        )
+    return repo
+
+
+def _ids(movements):
+    """Hilfsfunktion: nur die IDs vergleichen"""
+    return [m.id for m in movements]
+
+
+class TestMovementFilters:
+    """Tests für Zeitfenster und Filter von load_movements"""
+
+    def test_without_arguments_returns_all_in_order(self, repository):
+        """Test: Ohne Argumente alle 20 Bewegungen chronologisch"""
+        movements = repository.load_movements()
+        assert len(movements) == 20
+        # Gleichstand 10/11 bleibt in Speicherreihenfolge
+        assert _ids(movements)[9:13] == ["M09", "M10", "M11", "M12"]
+
+    def test_time_window(self, repository):
+        """Test: since ist inklusive, until exklusive"""
+        movements = repository.load_movements(
+            since=START + timedelta(hours=2), until=START + timedelta(hours=5)
+        )
+        assert _ids(movements) == ["M02", "M03", "M04"]
+
+    def test_filter_product_and_type(self, repository):
+        """Test: Filter nach Produkt und Bewegungstyp"""
+        assert len(repository.load_movements(product_id="P001")) == 10
+        sold = repository.load_movements(movement_type="SOLD")
+        assert len(sold) == 10
+        assert {m.product_id for m in sold} == {"P002"}
+
+    def test_newest_first_with_limit(self, repository):
+        """Test: Die letzten 3 Bewegungen, neueste zuerst"""
+        assert _ids(repository.load_movements(limit=3, newest_first=True)) == ["M19", "M18", "M17"]
+
+
+class TestMovementPagination:
+    """Tests für Keyset-Pagination (after_cursor)
+
+    Seite für Seite durch alle Bewegungen blättern darf keine
+    Bewegung auslassen oder doppelt liefern - auch bei gleichen
+    Zeitstempeln.
+    """
+
+    @pytest.mark.parametrize("newest_first", [False, True])
+    def test_pages_cover_everything_once(self, repository, newest_first):
+        """Test: Seiten à 3 ergeben zusammen genau alle 20 Bewegungen"""
+        seen = []
+        cursor = None
+        while True:
+            page = repository.load_movements(
+                limit=3, after_cursor=cursor, newest_first=newest_first
+            )
+            if not page:
+                break
+            seen.extend(_ids(page))
+            cursor = repository.movement_cursor(page[-1])
+
+        expected = _ids(repository.load_movements(newest_first=newest_first))
+        assert seen == expected
+        assert len(set(seen)) == 20
+
+    def test_pagination_with_filter(self, repository):
+        """Test: Cursor funktioniert zusammen mit Produkt-Filter"""
+        first = repository.load_movements(product_id="P002", limit=4)
+        second = repository.load_movements(
+            product_id="P002", limit=4, after_cursor=repository.movement_cursor(first[-1])
+        )
+        assert _ids(first) == ["M01", "M03", "M05", "M07"]
+        assert _ids(second) == ["M09", "M11", "M13", "M15"]
+
+    @pytest.mark.parametrize("newest_first, expected", [
+        (False, [f"M{i}" for i in range(12, 20)]),
+        (True, [f"M{i:02d}" for i in range(9, -1, -1)]),
+    ])
+    def test_cursor_of_missing_movement(self, repository, newest_first, expected):
+        """Test: Cursor einer nicht vorhandenen Bewegung - weiter hinter ihrem Zeitstempel
+
+        Alle Repositories verhalten sich gleich; die beiden Bewegungen mit
+        demselben Zeitstempel (M10, M11) werden übersprungen.
+        """
+        cursor = f"{(START + timedelta(hours=10)).isoformat()}|M99"
+        page = repository.load_movements(after_cursor=cursor, newest_first=newest_first)
+        assert _ids(page) == expected
+
+    def test_invalid_cursor(self, repository):
+        """Test: Kaputter Cursor führt zu ValueError"""
+        with pytest.raises(ValueError):
+            repository.load_movements(after_cursor="kein-cursor")
+
+
+class TestMovementStreaming:
+    """Tests für iter_movements
+
+    iter_movements liefert dieselben Bewegungen wie load_movements,
+    aber einzeln als Generator statt als fertige Liste.
+    """
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {},
+            {"since": START + timedelta(hours=5), "until": START + timedelta(hours=12)},
+            {"product_id": "P002", "newest_first": True},
+            {"limit": 4, "after_cursor": f"{(START + timedelta(hours=10)).isoformat()}|M10"},
+        ],
+    )
+    def test_same_result_as_load_movements(self, repository, kwargs):
+        """Test: Gleiche Bewegungen in gleicher Reihenfolge wie load_movements"""
+        assert _ids(repository.iter_movements(**kwargs)) == _ids(repository.load_movements(**kwargs))
+
+    def test_is_lazy(self, repository):
+        """Test: Ergebnis ist ein Generator, Bewegungen kommen erst beim Iterieren"""
+        iterator = repository.iter_movements()
+        assert not isinstance(iterator, list)
+        assert next(iterator).id == "M00"
+        assert next(iterator).id == "M01"
+        iterator.close()
+
+    def test_memory_iteration_does_not_copy(self):
+        """Test: InMemoryRepository liefert die gespeicherten Objekte selbst"""
+        repo = InMemoryRepository()
+        movement = Movement(id="M1", product_id="P001", product_name="Test",
+                            quantity_change=1, movement_type="IN", timestamp=START)
+        repo.save_movement(movement)
+        assert next(repo.iter_movements()) is movement
+
+    def test_sqlite_small_batches(self, tmp_path):
+        """Test: Auch mit batch_size kleiner als die Treffermenge kommt alles genau einmal"""
+        repo = SQLiteRepository(str(tmp_path / "test.db"))
+        repo.save_product(Product(id="P001", name="P001", description="T", price=1.0))
+        for i in range(7):
+            repo.save_movement(
+                Movement(id=f"M{i}", product_id="P001", product_name="Test", quantity_change=1,
+                         movement_type="IN", timestamp=START + timedelta(minutes=i))
+            )
+        assert _ids(repo.iter_movements(batch_size=3)) == [f"M{i}" for i in range(7)]
+
+    def test_unsorted_saves_are_iterated_in_order(self):
+        """Test: Nachträglich gespeicherte ältere Bewegung wird einsortiert"""
+        repo = InMemoryRepository()
+        for i in (2, 0, 1):
+            repo.save_movement(
+                Movement(id=f"M{i}", product_id="P001", product_name="Test", quantity_change=1,
+                         movement_type="IN", timestamp=START + timedelta(minutes=i))
+            )
+        assert _ids(repo.iter_movements()) == ["M0", "M1", "M2"]
+
+
+class TestMovementColumns:
+    """Tests für load_movement_columns
+
+    Die Spalten enthalten dieselben Bewegungen wie load_movements,
+    als Arrays (Zeitstempel in µs, Produkt-/Typ-Codes, Mengen).
+    """
+
+    @staticmethod
+    def _rows(columns):
+        """Hilfsfunktion: Spalten zurück in Tupel (Zeitstempel, Produkt, Menge, Typ)"""
+        return [
+            (
+                from_epoch_us(columns.timestamps[i]),
+                columns.product_ids[columns.product_codes[i]],
+                columns.quantities[i],
+                columns.movement_types[columns.type_codes[i]],
+            )
+            for i in range(len(columns))
+        ]
+
+    @staticmethod
+    def _expected(movements):
+        return [(m.timestamp, m.product_id, m.quantity_change, m.movement_type) for m in movements]
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [{}, {"since": START + timedelta(hours=5), "until": START + timedelta(hours=12)}],
+    )
+    def test_same_rows_as_load_movements(self, repository, kwargs):
+        """Test: Gleiche Bewegungen in gleicher Reihenfolge wie load_movements"""
+        columns = repository.load_movement_columns(**kwargs)
+        assert self._rows(columns) == self._expected(repository.load_movements(**kwargs))
+
+    def test_microseconds_survive(self, repository):
+        """Test: Zeitstempel mit Mikrosekunden werden exakt übernommen"""
+        timestamp = START + timedelta(days=3, microseconds=123456)
+        repository.save_movement(
+            Movement(id="MX", product_id="P001", product_name="Test", quantity_change=-3,
+                     movement_type="SOLD", timestamp=timestamp)
+        )
+        assert self._rows(repository.load_movement_columns())[-1] == (timestamp, "P001", -3, "SOLD")
+
+    def test_empty_window(self, repository):
+        """Test: Leeres Zeitfenster liefert leere Spalten"""
+        assert len(repository.load_movement_columns(since=START + timedelta(days=5))) == 0
+
+    def test_memory_columns_follow_saves_and_rollback(self):
+        """Test: InMemoryRepository hält die Spalten bei Einfügen und Rollback synchron"""
+        repo = InMemoryRepository()
+        for i in (2, 0):
+            repo.save_movement(
+                Movement(id=f"M{i}", product_id="P001", product_name="Test", quantity_change=i,
+                         movement_type="IN", timestamp=START + timedelta(minutes=i))
+            )
+        with pytest.raises(RuntimeError):
+            with repo.transaction():
+                repo.save_movement(
+                    Movement(id="M1", product_id="P002", product_name="Test", quantity_change=1,
+                             movement_type="SOLD", timestamp=START + timedelta(minutes=1))
+                )
+                raise RuntimeError("Abbruch")
+
+        # Prüfe: ältere Bewegung einsortiert, zurückgerollte Bewegung wieder entfernt
+        assert self._rows(repo.load_movement_columns()) == self._expected(repo.load_movements())
+        assert list(repo.load_movement_columns().quantities) == [0, 2]
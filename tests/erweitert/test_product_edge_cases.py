@@ -306,3 +306,46 @@ class TestProductStockStatus:
             min_stock_level=10,
         )
         assert product.is_low_stock() == True
+
+
+class TestCompactModels:
+    """Tests für die kompakten Modelle (slots=True, from_storage)
+
+    Product und Movement haben kein __dict__ mehr. Beim Laden aus der
+    Datenbank wird datetime.now() nicht unnötig aufgerufen.
+    """
+
+    def test_no_instance_dict(self):
+        """Test: Keine dynamischen Attribute (Tippfehler fallen sofort auf)"""
+        from src.domain.warehouse import Movement
+
+        product = Product(id="P001", name="Test", description="", price=1.0)
+        movement = Movement(id="M1", product_id="P001", product_name="Test",
+                            quantity_change=1, movement_type="IN")
+        assert not hasattr(product, "__dict__")
+        assert not hasattr(movement, "__dict__")
+        with pytest.raises(AttributeError):
+            product.quantity = 5
+
+    def test_from_storage_keeps_timestamps(self):
+        """Test: Gespeicherte Zeitstempel werden direkt übernommen"""
+        created = datetime(2025, 1, 1, 8, 0)
+        updated = datetime(2025, 6, 1, 12, 30)
+        product = Product.from_storage(
+            id="P001", name="Test", description="", price=2.5, warehouse_qty=3, shop_qty=1,
+            sku="", category="Papier", notes=None, min_stock_level=10,
+            created_at=created, updated_at=updated,
+        )
+        # Prüfe: gleich wie ein normal erstelltes Produkt mit denselben Werten
+        expected = Product(id="P001", name="Test", description="", price=2.5, warehouse_qty=3,
+                           shop_qty=1, category="Papier", created_at=created, updated_at=updated)
+        assert product == expected
+
+    def test_from_storage_without_timestamps(self):
+        """Test: Fehlende Zeitstempel werden mit der aktuellen Zeit belegt"""
+        product = Product.from_storage(
+            id="P001", name="Test", description="", price=1.0, warehouse_qty=0, shop_qty=0,
+            sku="", category="", notes=None, min_stock_level=10,
+        )
+        assert product.created_at == product.updated_at
+        assert isinstance(product.created_at, datetime)
@@ -0,0 +1,187 @@
+"""Erweiterte Tests - Massen-Import von Produkten (save_products, import_products)"""
+
+import io
+
+import pytest
+from src.domain.product import Product
+from src.services import WarehouseService
+from src.services.product_import import iter_json_records, product_from_record
+
+
+class TestSaveProducts:
+    """Tests für RepositoryPort.save_products
+
+    Viele Produkte werden in einer Transaktion gespeichert.
+    Ein Fehler mittendrin verwirft den ganzen Import.
+    """
+
+    def test_save_many_products(self, repository):
+        """Test: 2500 Produkte (mehrere Blöcke) auf einmal speichern"""
+        products = (
+            Product(id=f"P{i:05d}", name=f"Produkt {i}", description="T", price=1.0)
+            for i in range(2500)
+        )
+        # Generator statt Liste: darf nicht vorab materialisiert werden müssen
+        count = repository.save_products(products)
+
+        assert count == 2500
+        assert len(repository.load_all_products()) == 2500
+
+    def test_save_products_overwrites_existing(self, repository):
+        """Test: Vorhandene IDs werden aktualisiert statt dupliziert"""
+        repository.save_product(Product(id="P001", name="Alt", description="T", price=1.0))
+        repository.save_products([Product(id="P001", name="Neu", description="T", price=2.0)])
+
+        assert repository.load_product("P001").name == "Neu"
+        assert len(repository.load_all_products()) == 1
+
+    def test_save_products_overwrites_stock(self, repository):
+        """Test: Ein erneuter Import übernimmt auch die Bestände"""
+        repository.save_product(
+            Product(id="P001", name="A", description="T", price=1.0, warehouse_qty=5)
+        )
+        repository.save_products([
+            Product(id="P001", name="A", description="T", price=1.0, warehouse_qty=50, shop_qty=3)
+        ])
+
+        stored = repository.load_product("P001")
+        assert (stored.warehouse_qty, stored.shop_qty) == (50, 3)
+
+    def test_save_products_all_or_nothing(self, repository):
+        """Test: Fehler beim 3. Produkt - auch die ersten beiden werden verworfen"""
+
+        def products():
+            yield Product(id="P001", name="A", description="T", price=1.0)
+            yield Product(id="P002", name="B", description="T", price=1.0)
+            raise ValueError("Defekter Datensatz")
+
+        with pytest.raises(ValueError):
+            repository.save_products(products())
+
+        assert repository.load_all_products() == {}
+
+
+class TestImportProducts:
+    """Tests für WarehouseService.import_products (JSON, JSON Lines, CSV)"""
+
+    def test_import_json_array(self, repository):
+        """Test: JSON-Array, Feld "quantity" wie in sample_data.json"""
+        data = (
+            '[{"id": "P001", "name": "Stift", "price": 0.45, "quantity": 250, "category": "Schreibwaren"},'
+            ' {"id": "P002", "name": "Papier", "price": 4.99, "warehouse_qty": 120,'
+            '  "created_at": "2026-01-10T08:30:00"}]'
+        )
+        service = WarehouseService(repository)
+        assert service.import_products(io.StringIO(data)) == 2
+
+        assert repository.load_product("P001").warehouse_qty == 250
+        assert repository.load_product("P002").created_at.year == 2026
+
+    def test_import_json_lines(self, repository):
+        """Test: JSON Lines (ein Objekt pro Zeile)"""
+        data = '{"id": "P001", "name": "A", "price": 1}\n{"id": "P002", "name": "B", "price": 2}\n'
+        service = WarehouseService(repository)
+        assert service.import_products(io.StringIO(data), file_format="jsonl") == 2
+
+    def test_import_csv(self, repository):
+        """Test: CSV mit Kopfzeile, leere Felder bekommen Standardwerte"""
+        data = (
+            "id,name,description,price,warehouse_qty,shop_qty,category\n"
+            "P001,Stift,,0.45,250,5,Schreibwaren\n"
+            "P002,Papier,A4,4.99,,,\n"
+        )
+        service = WarehouseService(repository)
+        assert service.import_products(io.StringIO(data), file_format="csv") == 2
+
+        paper = repository.load_product("P002")
+        assert paper.warehouse_qty == 0
+        assert paper.min_stock_level == 10
+
+    def test_import_invalid_record_imports_nothing(self, repository):
+        """Test: Datensatz ohne Preis - gesamter Import wird abgelehnt"""
+        data = '[{"id": "P001", "name": "A", "price": 1}, {"id": "P002", "name": "B"}]'
+        service = WarehouseService(repository)
+        with pytest.raises(ValueError):
+            service.import_products(io.StringIO(data))
+        assert repository.load_all_products() == {}
+
+    def test_import_unknown_format(self, repository):
+        """Test: Unbekanntes Format führt zu ValueError"""
+        service = WarehouseService(repository)
+        with pytest.raises(ValueError):
+            service.import_products(io.StringIO(""), file_format="xml")
+
+
+class TestJsonStreaming:
+    """Tests für das blockweise Lesen von JSON"""
+
+    def test_records_spanning_chunks(self):
+        """Test: Objekte über Blockgrenzen hinweg (Blockgröße 7 Zeichen)"""
+        data = '[ {"id": "P001", "name": "Ä,]{"}, {"id": "P002"} ]'
+        records = list(iter_json_records(io.StringIO(data), chunk_size=7))
+        assert records == [{"id": "P001", "name": "Ä,]{"}, {"id": "P002"}]
+
+    def test_reads_lazily(self):
+        """Test: Erstes Objekt ist verfügbar, bevor der Rest gelesen wurde"""
+        stream = io.StringIO('[{"id": "P001"},' + " " * 100_000 + '{"id": "P002"}]')
+        records = iter_json_records(stream, chunk_size=1024)
+        assert next(records) == {"id": "P001"}
+        assert stream.tell() < 100_000
+
+    def test_empty_array(self):
+        """Test: Leeres Array liefert keine Datensätze"""
+        assert list(iter_json_records(io.StringIO("[]"))) == []
+
+    def test_unterminated_array(self):
+        """Test: Abgeschnittene Datei wird als Fehler erkannt"""
+        with pytest.raises(ValueError):
+            list(iter_json_records(io.StringIO('[{"id": "P001"}, {"id": ')))
+
+    @pytest.mark.parametrize("data", [
+        '[{"id": "P001"} {"id": "P002"}]',
+        '[{"id": "P001"},, {"id": "P002"}]',
+        '[{"id": "P001"},]',
+        '[, {"id": "P001"}]',
+        '[{"id": "P001"}] [{"id": "P002"}]',
+        '{"id": "P001"} {"id": "P002"}',
+    ])
+    def test_invalid_separators(self, data):
+        """Test: Fehlende, doppelte oder überzählige Trennzeichen werden abgelehnt"""
+        with pytest.raises(ValueError):
+            list(iter_json_records(io.StringIO(data), chunk_size=4))
+
+    def test_json_lines_across_chunks(self):
+        """Test: Zeilenumbruch zwischen Datensätzen auch über Blockgrenzen erkannt"""
+        data = '{"id": "P001"}\n\n  {"id": "P002"}\n'
+        records = list(iter_json_records(io.StringIO(data), chunk_size=3))
+        assert records == [{"id": "P001"}, {"id": "P002"}]
+
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 4, 5])
+    def test_scalar_across_chunks(self, chunk_size):
+        """Test: Zahl oder Literal über eine Blockgrenze wird nicht abgeschnitten"""
+        data = '[1234567, 2, true, null]'
+        records = list(iter_json_records(io.StringIO(data), chunk_size=chunk_size))
+        assert records == [1234567, 2, True, None]
+
+    def test_number_at_end_of_json_lines(self):
+        """Test: Letzter Wert endet mit dem Stream (ohne Zeilenumbruch)"""
+        records = list(iter_json_records(io.StringIO('{"id": "P001"}\n1234'), chunk_size=4))
+        assert records == [{"id": "P001"}, 1234]
+
+class TestProductFromRecord:
+    """Tests für product_from_record"""
+
+    @pytest.mark.parametrize("record", [["P001", "Ordner", 2.5], "P001", 42, None])
+    def test_non_object_record(self, record):
+        """Test: Datensatz, der kein Objekt ist, ergibt ValueError statt AttributeError"""
+        with pytest.raises(ValueError):
+            product_from_record(record)
+
+    def test_import_nested_array_imports_nothing(self, repository):
+        """Test: Verschachteltes Array im Import wird abgelehnt, nichts gespeichert"""
+        service = WarehouseService(repository)
+        data = '[{"id": "P001", "name": "Ordner", "price": 2.5}, [1, 2]]'
+        with pytest.raises(ValueError):
+            service.import_products(io.StringIO(data))
+        assert repository.load_all_products() == {}
@@ -0,0 +1,119 @@
+"""Erweiterte Tests - Produktsuche über den Suchindex (FTS5 bzw. Trigramm-Index)"""
+
+import pytest
+from src.domain.product import Product
+from src.adapters.repository import SQLiteRepository
+from src.adapters.search_index import TrigramIndex
+from src.services import WarehouseService
+
+
+@pytest.fixture
+def repository(repository):
+    """Alle Repositories mit einem kleinen Bürosortiment"""
+    repository.save_products([
+        Product(id="P001", name="Kopierpapier A4", description="500 Blatt weiß", price=5.0, sku="PAP-A4"),
+        Product(id="P002", name="Ordner breit", description="für Papier bis A4", price=2.0, sku="ORD-80"),
+        Product(id="P003", name="Papierkorb", description="Kunststoff", price=8.0, sku="KORB-1"),
+        Product(id="P004", name="Kugelschreiber", description="blau", price=1.0, sku="KS_BLAU"),
+    ])
+    return repository
+
+
+def _ids(products):
+    """Hilfsfunktion: nur die IDs vergleichen"""
+    return [p.id for p in products]
+
+
+class TestProductSearch:
+    """Tests für RepositoryPort.search_products
+
+    Gefunden wird jeder Teilstring von Name, SKU oder Beschreibung
+    (wie bisher), aber über einen Index und nach Relevanz sortiert.
+    """
+
+    def test_substring_and_case_insensitive(self, repository):
+        """Test: "papier" findet Kopierpapier, Papierkorb und den Ordner (Beschreibung)"""
+        assert set(_ids(repository.search_products("papier"))) == {"P001", "P002", "P003"}
+
+    def test_ranking(self, repository):
+        """Test: Treffer am Namensanfang vor Treffer im Namen vor Treffer in der Beschreibung"""
+        assert _ids(repository.search_products("Papier")) == ["P003", "P001", "P002"]
+
+    def test_prefix_and_sku(self, repository):
+        """Test: Anfang eines Worts und SKU werden gefunden"""
+        assert _ids(repository.search_products("kugel")) == ["P004"]
+        assert _ids(repository.search_products("ord-8")) == ["P002"]
+
+    def test_short_query_and_special_characters(self, repository):
+        """Test: Anfragen unter 3 Zeichen und mit LIKE-Sonderzeichen"""
+        assert set(_ids(repository.search_products("a4"))) == {"P001", "P002"}
+        assert _ids(repository.search_products("s_b")) == ["P004"]
+        assert repository.search_products("%") == []
+        assert repository.search_products("  ") == []
+
+    def test_limit(self, repository):
+        """Test: limit begrenzt auf die besten Treffer"""
+        assert _ids(repository.search_products("papier", limit=1)) == ["P003"]
+
+    def test_index_follows_save_and_delete(self, repository):
+        """Test: Umbenennen und Löschen wirken sofort auf die Suche"""
+        product = repository.load_product("P004")
+        product.name = "Gelstift"
+        repository.save_product(product)
+        assert repository.search_products("kugel") == []
+        assert _ids(repository.search_products("gelst")) == ["P004"]
+
+        repository.delete_product("P003")
+        assert "P003" not in _ids(repository.search_products("papier"))
+
+    def test_rollback_restores_index(self, repository):
+        """Test: Nach einem Rollback ist auch der Suchindex wieder auf dem alten Stand"""
+        with pytest.raises(RuntimeError):
+            with repository.transaction():
+                repository.delete_product("P003")
+                raise RuntimeError("Abbruch")
+        assert "P003" in _ids(repository.search_products("korb"))
+
+    def test_service_uses_index(self, repository, monkeypatch):
+        """Test: WarehouseService.search_products lädt nicht den ganzen Katalog"""
+        service = WarehouseService(repository)
+        monkeypatch.setattr(repository, "load_all_products", lambda: pytest.fail("kein Vollscan"))
+        results = service.search_products("korb")
+        assert [r["id"] for r in results] == ["P003"]
+
+
+class TestSearchIndexMigration:
+    """Tests für bestehende Datenbanken ohne Suchindex"""
+
+    def test_existing_products_are_indexed(self, tmp_path):
+        """Test: Datenbank von vor dem Suchindex wird beim Öffnen nachindexiert"""
+        db_path = str(tmp_path / "test.db")
+        repo = SQLiteRepository(db_path)
+        repo.save_product(Product(id="P001", name="Locher", description="", price=3.0))
+        with repo._connect() as conn:
+            for name in ("products_fts_insert", "products_fts_delete", "products_fts_update"):
+                conn.execute(f"DROP TRIGGER {name}")
+            conn.execute("DROP TABLE products_fts")
+
+        reopened = SQLiteRepository(db_path)
+        assert _ids(reopened.search_products("loch")) == ["P001"]
+
+
+class TestTrigramIndex:
+    """Tests für den Trigramm-Index im Speicher"""
+
+    def test_candidates_are_verified(self):
+        """Test: Alle Trigramme vorhanden, aber nicht zusammenhängend -> kein Treffer"""
+        index = TrigramIndex()
+        index.add(Product(id="P001", name="abcd bcde", description="", price=1.0))
+        # "abcde" hat die Trigramme abc, bcd, cde - alle im Namen, aber nicht am Stück
+        assert index.search("abcde") == []
+        assert index.search("bcd") == ["P001"]
+
+    def test_remove_cleans_postings(self):
+        """Test: Nach dem Entfernen bleiben keine Trigramm-Listen zurück"""
+        index = TrigramIndex()
+        index.add(Product(id="P001", name="Ordner", description="", price=1.0))
+        index.remove("P001")
+        assert len(index) == 0
+        assert index._postings == {}
@@ -0,0 +1,188 @@
+"""Erweiterte Tests - Produktlisten seitenweise (load_products_page, /api/products)"""
+
+import pytest
+from src.adapters.repository import SQLiteRepository
+from src.ports import PRODUCT_SORT_FIELDS
+from src.services import WarehouseService
+
+# (ID, Name, Preis, Lager, Shop, Kategorie); gleiche Namen/Preise: Gleichstand über die ID
+PRODUCTS = [
+    ("P001", "Ordner", 2.5, 40, 5, "Papier"),
+    ("P002", "Kugelschreiber", 1.0, 3, 20, "Schreiben"),
+    ("P003", "Ordner", 2.5, 12, 0, "Papier"),
+    ("P004", "Locher", 12.0, 0, 2, ""),
+    ("P005", "Textmarker gelb", 1.0, 25, 8, "Schreiben"),
+    ("P006", "Kopierpapier A4", 4.2, 5, 10, "Papier"),
+    ("P007", "Ablagekorb", 7.9, 18, 1, ""),
+]
+
+
+@pytest.fixture
+def service(repository):
+    """Service mit 7 Produkten"""
+    service = WarehouseService(repository)
+    for product_id, name, price, warehouse, shop, category in PRODUCTS:
+        service.create_product(
+            product_id, name, f"Beschreibung {name}", price,
+            category=category, warehouse_qty=warehouse, shop_qty=shop,
+        )
+    return service
+
+
+def _all_pages(repository, limit, **filters):
+    """Alle Seiten über den Cursor abrufen; liefert Produkt-IDs je Seite"""
+    pages, cursor = [], None
+    sort = filters.get("sort", "id")
+    while True:
+        page = repository.load_products_page(limit, cursor, **filters)
+        if not page:
+            return pages
+        pages.append([product.id for product in page])
+        cursor = repository.product_cursor(page[-1], sort)
+
+
+class TestProductsPage:
+    """Tests für RepositoryPort.load_products_page (Keyset-Pagination)"""
+
+    @pytest.mark.parametrize("sort", PRODUCT_SORT_FIELDS)
+    @pytest.mark.parametrize("descending", [False, True])
+    def test_pages_cover_sorted_catalogue(self, service, sort, descending):
+        """Test: Seiten ergeben zusammen den sortierten Katalog, ohne Lücken und Doppelte"""
+        repository = service.repository
+        pages = _all_pages(repository, 3, sort=sort, descending=descending)
+
+        products = repository.load_all_products().values()
+        expected = sorted(products, key=lambda p: (getattr(p, sort), p.id), reverse=descending)
+        assert [len(page) for page in pages] == [3, 3, 1]
+        assert sum(pages, []) == [p.id for p in expected]
+
+    def test_filters(self, service):
+        """Test: Kategorie, Low-Stock und Suchtext (kurz und lang) kombiniert"""
+        repository = service.repository
+        assert _all_pages(repository, 2, category="Papier") == [["P001", "P003"], ["P006"]]
+        assert _all_pages(repository, 10, low_stock=True, sort="name") == [["P006", "P002", "P004"]]
+        assert _all_pages(repository, 10, query="ordner") == [["P001", "P003"]]
+        assert _all_pages(repository, 10, query="er", category="Schreiben") == [["P002", "P005"]]
+        assert _all_pages(repository, 10, query="gibt es nicht") == []
+
+    def test_page_follows_changes(self, service):
+        """Test: Neue Produkte vor dem Cursor verschieben die nächste Seite nicht"""
+        repository = service.repository
+        first = repository.load_products_page(3, sort="name")
+        service.create_product("P000", "Aaa", "", 1.0)
+        cursor = repository.product_cursor(first[-1], "name")
+        assert [p.id for p in repository.load_products_page(2, cursor, sort="name")] == [
+            "P004", "P001"
+        ]
+
+    def test_invalid_sort_and_cursor(self, service):
+        """Test: Unbekanntes Sortierfeld, kaputter Cursor, Cursor anderer Sortierung"""
+        repository = service.repository
+        with pytest.raises(ValueError):
+            repository.load_products_page(10, sort="description")
+        with pytest.raises(ValueError):
+            repository.load_products_page(10, "kein-cursor")
+        product = repository.load_product("P001")
+        with pytest.raises(ValueError):
+            repository.load_products_page(
+                10, repository.product_cursor(product, "name"), sort="price"
+            )
+
+    def test_sqlite_uses_index(self, tmp_path):
+        """Test: Sortierung nach Name läuft über idx_products_name (kein Sortierschritt)"""
+        repository = SQLiteRepository(str(tmp_path / "plan.db"))
+        with repository._connect() as conn:
+            plan = " ".join(
+                row["detail"]
+                for row in conn.execute(
+                    "EXPLAIN QUERY PLAN SELECT * FROM products WHERE (name, id) > (?, ?) "
+                    "ORDER BY name ASC, id ASC LIMIT 10",
+                    ("Ordner", "P001"),
+                )
+            )
+        assert "idx_products_name" in plan
+        assert "TEMP B-TREE" not in plan
+
+
+class TestGetProductsPage:
+    """Tests für WarehouseService.get_products_page"""
+
+    def test_next_cursor_and_fields(self, service):
+        """Test: next_cursor bis zur letzten Seite, nur gewünschte Felder"""
+        page = service.get_products_page(limit=4, sort="price", fields=["id", "price"])
+        assert page["items"][0] == {"id": "P002", "price": 1.0}
+        assert page["next_cursor"] is not None
+
+        last = service.get_products_page(limit=4, cursor=page["next_cursor"], sort="price")
+        assert [item["id"] for item in last["items"]] == ["P006", "P007", "P004"]
+        assert last["next_cursor"] is None
+        assert last["items"][0]["is_low_stock"] is True
+
+    def test_invalid_arguments(self, service):
+        """Test: Unbekanntes Feld oder limit < 1"""
+        with pytest.raises(ValueError):
+            service.get_products_page(fields=["id", "passwort"])
+        with pytest.raises(ValueError):
+            service.get_products_page(limit=0)
+
+
+@pytest.fixture
+def app(app):
+    """Web-App mit 7 Produkten"""
+    for product_id, name, price, warehouse, shop, category in PRODUCTS:
+        app.warehouse_service.create_product(
+            product_id, name, "", price, category=category, warehouse_qty=warehouse, shop_qty=shop
+        )
+    return app
+
+
+class TestProductsEndpoint:
+    """Tests für GET /api/products"""
+
+    def test_walk_pages(self, client):
+        """Test: Absteigend nach Preis, Seite für Seite über next_cursor"""
+        ids, cursor = [], ""
+        while True:
+            url = f"/api/products?limit=3&sort=-price&fields=id&cursor={cursor}"
+            page = client.get(url).get_json()
+            ids.extend(item["id"] for item in page["items"])
+            if not page["next_cursor"]:
+                break
+            cursor = page["next_cursor"]
+        assert ids == ["P004", "P007", "P006", "P003", "P001", "P005", "P002"]
+
+    def test_filters_and_dates(self, client):
+        """Test: Filter per Query-Parameter, Zeitstempel als ISO-Text"""
+        page = client.get("/api/products?category=Papier&low_stock=1&q=kopier").get_json()
+        assert [item["id"] for item in page["items"]] == ["P006"]
+        assert "T" in page["items"][0]["updated_at"]
+
+    @pytest.mark.parametrize(
+        "query",
+        ["limit=0", "limit=501", "sort=notes", "fields=id,geheim", "cursor=xyz"],
+    )
+    def test_bad_request(self, client, query):
+        """Test: Ungültige Parameter ergeben 400 mit Fehlermeldung"""
+        response = client.get(f"/api/products?{query}")
+        assert response.status_code == 400
+        assert response.get_json()["error"]
+
+
+class TestListPages:
+    """Tests für die Listen-Seiten: Produkte kommen per /api/products, nicht im HTML"""
+
+    @pytest.mark.parametrize("url", ["/lager", "/shop", "/einkauf", "/transfer", "/verkauf"])
+    def test_page_without_catalogue(self, client, url, monkeypatch):
+        """Test: Seite rendert ohne den ganzen Katalog zu laden"""
+        service = client.application.warehouse_service
+
+        def forbidden():
+            raise AssertionError("Ganzer Katalog darf nicht geladen werden")
+
+        monkeypatch.setattr(service, "get_products_with_totals", forbidden)
+        monkeypatch.setattr(service.repository, "load_all_products", forbidden)
+        response = client.get(url)
+        html = response.get_data(as_text=True)
+        assert response.status_code == 200
+        assert "/api/products" in html
+        assert "Kopierpapier" not in html
@@ -2,6 +2,7 @@
 
 import pytest
 from datetime import datetime, timedelta
+from src.domain.movement_columns import MovementColumns
 from src.domain.product import Product
 from src.domain.warehouse import Movement
 from src.reports.report_b import ReportB
@@ -450,3 +451,169 @@ class TestReportBDataHandling:
         cat_stats = report.get_category_statistics()
         # Sollte sichere leere Struktur sein
         assert isinstance(cat_stats, (dict, type(None)))
+
+
+class TestReportBWindow:
+    """Tests für den Report über ein Zeitfenster
+
+    /report_b lädt nur die Bewegungen des gewählten Zeitraums
+    und die neuesten 50 Bewegungen separat (neueste zuerst).
+    """
+
+    def test_details_from_recent_movements(self):
+        """Test: Details kommen aus recent_movements in deren Reihenfolge"""
+        now = datetime.now()
+        recent = [
+            Movement(id=f"M{i}", product_id="P001", product_name="Test", quantity_change=1,
+                     movement_type="IN", timestamp=now - timedelta(minutes=i))
+            for i in range(5)
+        ]
+        report = ReportB(movements=[], products=[], recent_movements=recent)
+
+        details = report.get_movement_details(limit=3)
+        # Prüfe: nur 3 Einträge, neueste zuerst
+        assert [d["timestamp_iso"] for d in details] == [m.timestamp.isoformat() for m in recent[:3]]
+
+    def test_since_in_full_report(self):
+        """Test: Beginn des Zeitfensters steht im Report"""
+        report = ReportB(movements=[], products=[], since=datetime(2026, 1, 15))
+        assert report.generate_full_report()["since"] == "15.01.2026"
+
+    def test_streamed_movements_match_list(self):
+        """Test: Report mit gestreamten Bewegungen liefert dieselben Zahlen wie mit Liste"""
+        start = datetime(2026, 1, 1, 8, 0, 0)
+        movements = [
+            Movement(id=f"M{i}", product_id="P001", product_name="Test",
+                     quantity_change=5 if i % 2 else -2,
+                     movement_type="IN" if i % 2 else "SOLD",
+                     timestamp=start + timedelta(hours=6 * i))
+            for i in range(10)
+        ]
+        calls = []
+
+        def source():
+            calls.append(1)
+            return iter(movements)
+
+        streamed = ReportB(movements=source, products=[])
+        listed = ReportB(movements=movements, products=[])
+
+        assert streamed.get_movement_summary() == listed.get_movement_summary()
+        assert streamed.get_movements_by_product() == listed.get_movements_by_product()
+        assert streamed.get_movement_details(limit=3) == listed.get_movement_details(limit=3)
+        # Prüfe: alle Auswertungen teilen sich einen Durchlauf
+        assert len(calls) == 1
+
+    def test_columns_match_list(self):
+        """Test: Report über Bewegungsspalten liefert dieselben Zahlen wie mit Liste"""
+        start = datetime(2026, 1, 1, 8, 0, 0)
+        movements = [
+            Movement(id=f"M{i}", product_id=f"P{i % 3}", product_name="Test",
+                     quantity_change=7 if i % 3 else -4,
+                     movement_type=("IN", "SOLD", "TRANSFER")[i % 3],
+                     timestamp=start + timedelta(hours=5 * i))
+            for i in range(30)
+        ]
+        columns = MovementColumns.from_movements(movements)
+
+        from_columns = ReportB(movements=[], products=[], columns=columns)
+        listed = ReportB(movements=movements, products=[])
+
+        assert from_columns.get_movement_summary() == listed.get_movement_summary()
+        summary = listed.get_movement_summary()
+        # Prüfe: Werte gegen eine einfache Schleife
+        assert summary["total_items_in"] == sum(m.quantity_change for m in movements if m.quantity_change > 0)
+        assert summary["total_items_out"] == 4 * 10
+        assert summary["by_type"] == {"SOLD": 10, "TRANSFER": 10, "IN": 10}
+        assert sum(summary["by_date"].values()) == 30
+        assert summary["first_date"] == movements[0].timestamp
+        assert summary["last_date"] == movements[-1].timestamp
+
+
+class TestReportBSinglePass:
+    """Tests für die Durchläufe von Report B
+
+    Alle Auswertungen und Charts eines Reports teilen sich einen
+    Durchlauf über die Bewegungen und einen über die Produkte.
+    """
+
+    @staticmethod
+    def _report(count=20):
+        start = datetime(2026, 1, 1, 8, 0, 0)
+        movements = [
+            Movement(id=f"M{i}", product_id=f"P{i % 2}", product_name="Test",
+                     quantity_change=3 if i % 2 else -1,
+                     movement_type="IN" if i % 2 else "SOLD",
+                     timestamp=start + timedelta(hours=7 * i))
+            for i in range(count)
+        ]
+        products = [
+            {"id": f"P{i}", "name": f"P{i}", "category": "Papier", "price": 2.0,
+             "warehouse_qty": 5, "shop_qty": 1, "available_total": 6, "is_low_stock": i == 0}
+            for i in range(2)
+        ]
+        calls = []
+
+        def source():
+            calls.append(1)
+            return iter(movements)
+
+        return ReportB(movements=source, products=products), calls, movements
+
+    def test_full_report_walks_movements_once(self):
+        """Test: generate_full_report holt genau einen Iterator"""
+        report, calls, _ = self._report()
+        report.generate_full_report()
+        assert len(calls) == 1
+
+    def test_full_report_from_columns_reads_no_movements(self):
+        """Test: Mit Spalten und neuesten Bewegungen (wie in der Route) kein Durchlauf"""
+        _, calls, movements = self._report()
+
+        def source():
+            raise AssertionError("Bewegungen dürfen nicht durchlaufen werden")
+
+        report = ReportB(
+            movements=source,
+            products=[],
+            recent_movements=list(reversed(movements)),
+            columns=MovementColumns.from_movements(movements),
+        )
+        data = report.generate_full_report(render_charts=False)
+
+        assert data["movement_summary"]["total_movements"] == len(movements)
+        assert len(data["movement_details"]) == 20
+        assert "movements_by_product" not in data
+
+    def test_full_report_walks_products_once(self):
+        """Test: Bestands- und Kategoriekennzahlen entstehen in einem Durchlauf"""
+        report, _, _ = self._report()
+        passes = []
+
+        class CountingDict(dict):
+            def values(self):
+                passes.append(1)
+                return super().values()
+
+        report.products = CountingDict(report.products)
+        report.generate_full_report()
+        # Prüfe: drei Aufrufe von get_inventory_statistics, ein Durchlauf
+        assert len(passes) == 1
+
+    def test_results_match_list_based_report(self):
+        """Test: Gemeinsamer Durchlauf liefert dieselben Werte wie die Liste"""
+        report, _, movements = self._report()
+        listed = ReportB(movements=movements, products=list(report.products.values()))
+
+        assert report.get_movements_by_product() == listed.get_movements_by_product()
+        assert report.get_movement_details(limit=5) == listed.get_movement_details(limit=5)
+        assert report.get_inventory_statistics() == listed.get_inventory_statistics()
+        assert report.get_category_statistics() == listed.get_category_statistics()
+        assert report.get_inventory_statistics()["by_category"] == {"Papier": 24.0}
+
+    def test_details_beyond_tail(self):
+        """Test: Mehr Details als der Durchlauf merkt sich - eigener Durchlauf"""
+        report, calls, movements = self._report(count=60)
+        details = report.get_movement_details(limit=55)
+        assert len(details) == 55
+        assert details[0]["timestamp_iso"] == movements[-1].timestamp.isoformat()
@@ -0,0 +1,163 @@
+"""Erweiterte Tests - Report-B-Charts als eigene Bild-URLs"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from app import create_app
+
+
+@pytest.fixture
+def app(app):
+    """Web-App mit einem Produkt und einer Bewegung"""
+    service = app.warehouse_service
+    service.create_product("P001", "Ordner", "A4", 2.5, category="Papier", warehouse_qty=10)
+    service.create_purchase("P001", 5)
+    return app
+
+
+class TestReportChartEndpoints:
+    """Tests für /report_b/chart/<name>.png"""
+
+    def test_page_references_chart_urls(self, client, renders):
+        """Test: HTML bindet die Charts per URL ein und rendert selbst keine"""
+        response = client.get("/report_b?tage=7")
+        html = response.get_data(as_text=True)
+        assert response.status_code == 200
+        assert "/report_b/chart/movement_timeline.svg?tage=7" in html
+        # Prüfe: PNG bleibt als Download
+        assert "/report_b/chart/movement_timeline.png?tage=7" in html
+        assert "data:image/png;base64" not in html
+        assert renders == []
+
+    @pytest.mark.parametrize("name", ["movement_timeline", "movement_types", "inventory_value", "warehouse_vs_shop"])
+    def test_chart_is_png_with_validators(self, client, name):
+        """Test: Chart kommt als PNG mit ETag, Last-Modified und no-cache"""
+        response = client.get(f"/report_b/chart/{name}.png")
+        assert response.status_code == 200
+        assert response.mimetype == "image/png"
+        assert response.data.startswith(b"\x89PNG")
+        assert response.headers["ETag"]
+        assert response.headers["Last-Modified"]
+        assert "no-cache" in response.headers["Cache-Control"]
+
+    @pytest.mark.parametrize("fmt, mimetype", [("svg", "image/svg+xml"), ("json", "application/json")])
+    def test_svg_and_json_without_matplotlib(self, client, renders, fmt, mimetype):
+        """Test: SVG und JSON kommen ohne Rendern mit matplotlib"""
+        response = client.get(f"/report_b/chart/movement_types.{fmt}")
+        assert response.status_code == 200
+        assert response.mimetype == mimetype
+        assert response.headers["ETag"]
+        assert renders == []
+
+    def test_format_is_part_of_etag(self, client):
+        """Test: Gleicher Chart als PNG und SVG hat verschiedene ETags"""
+        png = client.get("/report_b/chart/movement_types.png")
+        svg = client.get("/report_b/chart/movement_types.svg")
+        assert png.headers["ETag"] != svg.headers["ETag"]
+
+    def test_not_modified_without_rendering(self, client, renders):
+        """Test: Passendes If-None-Match liefert 304, ohne den Chart zu rendern"""
+        first = client.get("/report_b/chart/movement_types.png")
+        renders.clear()
+
+        response = client.get(
+            "/report_b/chart/movement_types.png", headers={"If-None-Match": first.headers["ETag"]}
+        )
+        assert response.status_code == 304
+        assert response.data == b""
+        assert renders == []
+
+    def test_if_modified_since(self, client):
+        """Test: If-Modified-Since mit dem gelieferten Last-Modified ergibt 304"""
+        first = client.get("/report_b/chart/movement_timeline.png")
+        response = client.get(
+            "/report_b/chart/movement_timeline.png",
+            headers={"If-Modified-Since": first.headers["Last-Modified"]},
+        )
+        assert response.status_code == 304
+
+    def test_new_movement_changes_etag(self, client):
+        """Test: Neue Bewegung macht den alten ETag ungültig"""
+        first = client.get("/report_b/chart/movement_timeline.png")
+        client.application.warehouse_service.transfer_to_shop("P001", 1)
+
+        response = client.get(
+            "/report_b/chart/movement_timeline.png", headers={"If-None-Match": first.headers["ETag"]}
+        )
+        assert response.status_code == 200
+        assert response.headers["ETag"] != first.headers["ETag"]
+
+    def test_price_change_changes_etag(self, client):
+        """Test: Preisänderung ohne Bewegung macht den ETag eines Bestandscharts ungültig"""
+        first = client.get("/report_b/chart/inventory_value.svg")
+        service = client.application.warehouse_service
+        product = service.get_product("P001")
+        product.price = 9.0
+        service.update_product(product)
+
+        response = client.get(
+            "/report_b/chart/inventory_value.svg", headers={"If-None-Match": first.headers["ETag"]}
+        )
+        assert response.status_code == 200
+        # Prüfe: If-Modified-Since allein reicht bei Bestandscharts nicht für 304
+        response = client.get(
+            "/report_b/chart/inventory_value.svg",
+            headers={"If-Modified-Since": first.headers["Last-Modified"]},
+        )
+        assert response.status_code == 200
+
+    def test_not_modified_without_loading_products(self, client, monkeypatch):
+        """Test: 304 für Bestandscharts, ohne die Produktliste zu laden"""
+        first = client.get("/report_b/chart/warehouse_vs_shop.svg")
+        service = client.application.warehouse_service
+
+        def forbidden():
+            raise AssertionError("Produktliste geladen")
+
+        monkeypatch.setattr(service, "get_products_with_totals", forbidden)
+        response = client.get(
+            "/report_b/chart/warehouse_vs_shop.svg", headers={"If-None-Match": first.headers["ETag"]}
+        )
+        assert response.status_code == 304
+
+    def test_window_is_part_of_etag(self, client):
+        """Test: Anderes Zeitfenster, anderer ETag"""
+        week = client.get("/report_b/chart/movement_timeline.png?tage=7")
+        everything = client.get("/report_b/chart/movement_timeline.png?tage=0")
+        assert week.headers["ETag"] != everything.headers["ETag"]
+
+    def test_unknown_chart(self, client):
+        """Test: Unbekannter Chart-Name ergibt 404"""
+        assert client.get("/report_b/chart/gibtsnicht.png").status_code == 404
+
+    def test_chart_without_data(self, tmp_path):
+        """Test: Bewegungs-Chart ohne Bewegungen ergibt 404"""
+        app = create_app(db_path=str(tmp_path / "leer.db"), pool_size=0)
+        assert app.test_client().get("/report_b/chart/movement_types.png").status_code == 404
+        app.warehouse_service.repository.close()
+
+
+class TestLazyChartImport:
+    """Tests für das verzögerte Laden von matplotlib"""
+
+    def test_create_app_does_not_import_matplotlib(self, tmp_path):
+        """Test: App-Start, Report-Seite und SVG-Charts laden matplotlib nicht"""
+        script = (
+            "import sys\n"
+            "from app import create_app\n"
+            "app = create_app(db_path=sys.argv[1], pool_size=0)\n"
+            "client = app.test_client()\n"
+            "assert client.get('/report_b').status_code == 200\n"
+            "assert client.get('/report_b/chart/warehouse_vs_shop.svg').status_code == 200\n"
+            "print('matplotlib' in sys.modules)\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script, str(tmp_path / "test.db")],
+            cwd=Path(__file__).resolve().parents[2],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert result.stdout.strip() == "False"
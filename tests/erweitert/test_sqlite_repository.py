@@ -0,0 +1,308 @@
+"""Erweiterte Tests - SQLiteRepository (Connection-Pool, Persistenz)"""
+
+import sqlite3
+import threading
+
+import pytest
+from src.domain.product import Product
+from src.domain.warehouse import Movement
+from src.adapters.connection_pool import SQLiteConnectionPool
+from src.adapters.repository import SQLiteRepository
+from src.adapters.sqlite_profile import SQLiteProfile
+
+
+def _product(product_id: str = "P001", **kwargs) -> Product:
+    """Hilfsfunktion: Testprodukt erstellen"""
+    data = dict(id=product_id, name="Test", description="Test", price=10.0, warehouse_qty=100)
+    data.update(kwargs)
+    return Product(**data)
+
+
+class TestSQLiteConnectionPool:
+    """Tests für den Connection-Pool
+
+    Der Pool soll Verbindungen wiederverwenden, nie mehr als
+    pool_size Verbindungen öffnen und beim Schließen alle
+    Verbindungen freigeben.
+    """
+
+    @pytest.fixture
+    def repository(self, tmp_path):
+        """Repository mit Pool (2 Verbindungen)"""
+        repo = SQLiteRepository(str(tmp_path / "test.db"), pool_size=2)
+        yield repo
+        repo.close()
+
+    def test_pooled_repository_reuses_connection(self, repository):
+        """Test: Mehrere Zugriffe nacheinander nutzen dieselbe Verbindung
+
+        Ohne Pool würde jeder Zugriff eine neue Verbindung öffnen.
+        Mit Pool bleibt es bei einer einzigen offenen Verbindung.
+        """
+        repository.save_product(_product())
+        for _ in range(10):
+            assert repository.load_product("P001") is not None
+
+        # Prüfe: nur 1 Verbindung wurde geöffnet
+        assert repository._pool.open_connections == 1
+
+    def test_pooled_repository_roundtrip(self, repository):
+        """Test: Speichern und Laden funktioniert auch mit Pool"""
+        repository.save_product(_product(price=12.5, shop_qty=3))
+        loaded = repository.load_product("P001")
+        assert loaded.price == 12.5
+        assert loaded.shop_qty == 3
+
+    def test_pool_never_exceeds_size(self, repository):
+        """Test: Parallele Threads öffnen höchstens pool_size Verbindungen"""
+        repository.save_product(_product())
+        errors = []
+
+        def worker():
+            try:
+                for _ in range(50):
+                    repository.load_product("P001")
+            except Exception as exc:  # pragma: no cover - nur zur Diagnose
+                errors.append(exc)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert repository._pool.open_connections <= 2
+
+    def test_pool_timeout_when_exhausted(self, tmp_path):
+        """Test: Sind alle Verbindungen vergeben, gibt es nach dem Timeout einen Fehler"""
+        pool = SQLiteConnectionPool(
+            lambda: sqlite3.connect(str(tmp_path / "x.db"), check_same_thread=False),
+            size=1,
+            timeout=0.05,
+        )
+        conn = pool.acquire()
+        with pytest.raises(TimeoutError):
+            pool.acquire()
+        pool.release(conn)
+        pool.close()
+
+    def test_pool_replaces_broken_connection(self, tmp_path):
+        """Test: Health-Check ersetzt eine kaputte Verbindung"""
+        pool = SQLiteConnectionPool(
+            lambda: sqlite3.connect(str(tmp_path / "x.db"), check_same_thread=False),
+            size=1,
+            health_check_interval=0,
+        )
+        conn = pool.acquire()
+        pool.release(conn)
+        # Verbindung "geht kaputt", während sie im Pool liegt
+        conn.close()
+
+        fresh = pool.acquire()
+        assert fresh is not conn
+        assert fresh.execute("SELECT 1").fetchone() == (1,)
+        pool.release(fresh)
+        pool.close()
+
+    def test_open_streams_leave_pool_free(self, repository):
+        """Test: Nicht zu Ende gelesene Bewegungs-Streams belegen keine Pool-Verbindung
+
+        Ein gestreamter Export hält seine Verbindung bis zum Ende des Downloads;
+        andere Zugriffe dürfen darauf nicht warten müssen.
+        """
+        repository.save_product(_product())
+        repository._pool.timeout = 0.05
+        for i in range(3):
+            repository.save_movement(
+                Movement(id=f"M{i}", product_id="P001", product_name="Test",
+                         quantity_change=1, movement_type="IN")
+            )
+        streams = [repository.iter_movements() for _ in range(3)]
+        for stream in streams:
+            next(stream)
+
+        # Prüfe: mehr offene Streams als pool_size, trotzdem kein TimeoutError
+        assert repository.load_product("P001") is not None
+        assert repository._pool.open_connections == 1
+        for stream in streams:
+            stream.close()
+
+    def test_close_releases_all_connections(self, repository):
+        """Test: close() schließt alle Verbindungen, danach keine Zugriffe mehr"""
+        repository.save_product(_product())
+        repository.close()
+
+        assert repository._pool.open_connections == 0
+        with pytest.raises(RuntimeError):
+            repository.load_product("P001")
+
+    def test_invalid_pool_size(self):
+        """Test: Pool-Größe 0 ist für den Pool selbst ungültig"""
+        with pytest.raises(ValueError):
+            SQLiteConnectionPool(lambda: sqlite3.connect(":memory:"), size=0)
+
+
+class TestSQLiteProfiles:
+    """Tests für die PRAGMA-Profile
+
+    Das Repository soll die PRAGMA-Werte des gewählten Profils
+    auf jede Verbindung anwenden.
+    """
+
+    @staticmethod
+    def _pragma(repository, name):
+        """Hilfsfunktion: aktuellen PRAGMA-Wert über das Repository lesen"""
+        with repository._connect() as conn:
+            return conn.execute(f"PRAGMA {name}").fetchone()[0]
+
+    def test_safe_profile_is_default(self, tmp_path):
+        """Test: Standardprofil "safe" = WAL + synchronous FULL"""
+        repository = SQLiteRepository(str(tmp_path / "test.db"))
+        assert self._pragma(repository, "journal_mode") == "wal"
+        # FULL = 2
+        assert self._pragma(repository, "synchronous") == 2
+
+    def test_throughput_profile(self, tmp_path):
+        """Test: Profil "throughput" setzt alle Performance-Werte"""
+        repository = SQLiteRepository(str(tmp_path / "test.db"), profile="throughput")
+        assert self._pragma(repository, "journal_mode") == "wal"
+        # NORMAL = 1
+        assert self._pragma(repository, "synchronous") == 1
+        assert self._pragma(repository, "cache_size") == -64000
+        # MEMORY = 2
+        assert self._pragma(repository, "temp_store") == 2
+        assert self._pragma(repository, "busy_timeout") == 10000
+
+    def test_custom_profile(self, tmp_path):
+        """Test: Eigenes Profil, z.B. klassisches Rollback-Journal"""
+        profile = SQLiteProfile(journal_mode="DELETE", synchronous="EXTRA", busy_timeout=100)
+        repository = SQLiteRepository(str(tmp_path / "test.db"), profile=profile)
+        assert self._pragma(repository, "journal_mode") == "delete"
+        # EXTRA = 3
+        assert self._pragma(repository, "synchronous") == 3
+        assert self._pragma(repository, "busy_timeout") == 100
+
+    def test_unknown_profile_name(self, tmp_path):
+        """Test: Unbekannter Profil-Name führt zu ValueError"""
+        with pytest.raises(ValueError):
+            SQLiteRepository(str(tmp_path / "test.db"), profile="turbo")
+
+    def test_invalid_profile_value(self):
+        """Test: Ungültige PRAGMA-Werte werden schon beim Erstellen abgelehnt"""
+        with pytest.raises(ValueError):
+            SQLiteProfile(synchronous="FAST")
+        with pytest.raises(ValueError):
+            SQLiteProfile(journal_mode="WAL; DROP TABLE products")
+
+    def test_read_during_open_write_transaction(self, tmp_path):
+        """Test: Mit WAL blockiert ein offener Schreiber die Leser nicht
+
+        Ein zweiter Prozess/Thread hält eine Schreib-Transaktion offen.
+        Das Repository liest trotzdem sofort den letzten committeten Stand.
+        """
+        db_path = str(tmp_path / "test.db")
+        repository = SQLiteRepository(db_path, profile=SQLiteProfile(busy_timeout=0))
+        repository.save_product(_product(warehouse_qty=100))
+
+        writer = sqlite3.connect(db_path, isolation_level=None)
+        writer.execute("BEGIN IMMEDIATE")
+        writer.execute("UPDATE products SET warehouse_qty = 1 WHERE id = 'P001'")
+
+        # Prüfe: Leser sieht den alten Wert, ohne zu warten
+        assert repository.load_product("P001").warehouse_qty == 100
+
+        writer.execute("COMMIT")
+        writer.close()
+        assert repository.load_product("P001").warehouse_qty == 1
+
+
+class TestSQLiteIndexes:
+    """Tests für die Sekundärindizes
+
+    Jede häufige Abfrage soll per EXPLAIN QUERY PLAN nachweislich
+    ihren Index benutzen und keinen Full-Table-Scan machen.
+    """
+
+    @pytest.fixture
+    def repository(self, tmp_path):
+        """Frisches SQLite-Repository"""
+        return SQLiteRepository(str(tmp_path / "test.db"))
+
+    @staticmethod
+    def _plan(repository, sql, params=()):
+        """Hilfsfunktion: Query-Plan als ein String"""
+        with repository._connect() as conn:
+            rows = conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+        return " | ".join(row["detail"] for row in rows)
+
+    def test_all_indexes_created(self, repository):
+        """Test: Alle Indizes existieren nach dem Anlegen der Datenbank"""
+        with repository._connect() as conn:
+            names = {
+                row["name"]
+                for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+            }
+        assert {
+            "idx_movements_timestamp",
+            "idx_movements_product_timestamp",
+            "idx_movements_type",
+            "idx_products_category",
+            "idx_products_sku",
+            "idx_products_low_stock",
+        } <= names
+
+    def test_init_db_is_idempotent(self, tmp_path):
+        """Test: Zweites Öffnen derselben Datenbank legt nichts doppelt an"""
+        db_path = str(tmp_path / "test.db")
+        SQLiteRepository(db_path)
+        SQLiteRepository(db_path)
+
+    @pytest.mark.parametrize(
+        "sql, params, index",
+        [
+            ("SELECT * FROM movements ORDER BY timestamp, rowid", (), "idx_movements_timestamp"),
+            (
+                "SELECT * FROM movements WHERE timestamp >= ? ORDER BY timestamp, rowid",
+                ("2026-01-01",),
+                "idx_movements_timestamp",
+            ),
+            (
+                "SELECT * FROM movements WHERE timestamp < ? ORDER BY timestamp DESC, rowid DESC",
+                ("2026-01-01",),
+                "idx_movements_timestamp",
+            ),
+            (
+                "SELECT * FROM movements WHERE product_id = ? ORDER BY timestamp, rowid",
+                ("P001",),
+                "idx_movements_product_timestamp",
+            ),
+            (
+                "SELECT * FROM movements WHERE movement_type = ? ORDER BY timestamp, rowid",
+                ("SOLD",),
+                "idx_movements_type",
+            ),
+            ("SELECT * FROM products WHERE category = ?", ("Papier",), "idx_products_category"),
+            (
+                "SELECT DISTINCT category FROM products WHERE category <> '' ORDER BY category",
+                (),
+                "idx_products_category",
+            ),
+            ("SELECT * FROM products WHERE sku = ?", ("SKU-1",), "idx_products_sku"),
+            (
+                "SELECT * FROM products WHERE warehouse_qty < min_stock_level ORDER BY warehouse_qty",
+                (),
+                "idx_products_low_stock",
+            ),
+            (
+                "SELECT COUNT(*) FROM products WHERE warehouse_qty < min_stock_level",
+                (),
+                "idx_products_low_stock",
+            ),
+        ],
+    )
+    def test_hot_query_uses_index(self, repository, sql, params, index):
+        """Test: Abfrage nutzt den erwarteten Index ohne Sortierung im Speicher"""
+        plan = self._plan(repository, sql, params)
+        assert f"INDEX {index}" in plan
+        assert "TEMP B-TREE" not in plan
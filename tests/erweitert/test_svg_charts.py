@@ -0,0 +1,105 @@
+"""Erweiterte Tests - Report-B-Charts als SVG und JSON (ohne matplotlib)"""
+
+import json
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta
+
+import pytest
+from src.domain.warehouse import Movement
+from src.reports.report_b import ReportB
+from src.reports.svg_charts import chart_data, render_svg
+
+SVG = "{http://www.w3.org/2000/svg}"
+START = datetime(2026, 1, 1, 8, 0, 0)
+
+MOVEMENTS = [
+    Movement(id=f"M{i}", product_id="P001", product_name="Test", quantity_change=2 if i % 3 else -1,
+             movement_type=("IN", "SOLD", "TO_SHOP")[i % 3], timestamp=START + timedelta(hours=10 * i))
+    for i in range(15)
+]
+PRODUCTS = [
+    {"id": "P001", "name": "Ordner", "category": "Papier", "price": 2.0,
+     "warehouse_qty": 4, "shop_qty": 2, "available_total": 6, "is_low_stock": False},
+    {"id": "P002", "name": "Stift", "category": "Schreiben & Co", "price": 1.0,
+     "warehouse_qty": 3, "shop_qty": 3, "available_total": 6, "is_low_stock": False},
+]
+
+
+def _parse(svg):
+    """Hilfsfunktion: SVG muss wohlgeformtes XML sein"""
+    return ET.fromstring(svg)
+
+
+class TestSvgCharts:
+    """Tests für render_svg und chart_data"""
+
+    def test_line_chart(self):
+        """Test: Linienchart mit einem Punkt pro Tag"""
+        root = _parse(render_svg("movement_timeline", [["2026-01-01", "2026-01-02", "2026-01-03"], [3, 1, 4]]))
+        assert root.tag == f"{SVG}svg"
+        assert len(root.findall(f"{SVG}circle")) == 3
+        assert root.find(f"{SVG}polyline") is not None
+
+    def test_bar_chart_labels_values(self):
+        """Test: Balkenchart mit einem Balken pro Wert und Wert als Beschriftung"""
+        root = _parse(render_svg("warehouse_vs_shop", [7, 2]))
+        texts = [t.text for t in root.iter(f"{SVG}text")]
+        # Prüfe: zwei Balken (plus Hintergrund-Rechteck)
+        assert len(root.findall(f"{SVG}rect")) == 3
+        assert {"Lager", "Shop", "7", "2"} <= set(texts)
+
+    def test_pie_chart_escapes_labels(self):
+        """Test: Tortendiagramm mit Legende, Sonderzeichen werden maskiert"""
+        svg = render_svg("inventory_value", [["Papier", "Schreiben & Co"], [3.0, 1.0]])
+        root = _parse(svg)
+        assert len(root.findall(f"{SVG}path")) == 2
+        texts = [t.text for t in root.iter(f"{SVG}text")]
+        assert "Schreiben & Co" in texts
+        assert "75.0%" in texts
+
+    def test_pie_single_and_empty(self):
+        """Test: Eine Kategorie ergibt einen vollen Kreis, Wert 0 keinen Fehler"""
+        assert len(_parse(render_svg("inventory_value", [["A"], [5.0]])).findall(f"{SVG}circle")) == 1
+        assert "Kein Bestandswert" in render_svg("inventory_value", [["A"], [0.0]])
+
+    def test_negative_values(self):
+        """Test: Negative kumulierte Mengen liegen unter der Nulllinie"""
+        _parse(render_svg("movement_quantity", [["2026-01-01", "2026-01-02"], [-5, -12]]))
+
+    def test_chart_data_is_json(self):
+        """Test: Datenreihen sind JSON-serialisierbar und beschriftet"""
+        data = chart_data("warehouse_vs_shop", [7, 2])
+        assert json.loads(json.dumps(data))["labels"] == ["Lager", "Shop"]
+        assert data["kind"] == "bar"
+
+
+class TestReportBChartFormats:
+    """Tests für die Chart-Formate von Report B"""
+
+    def test_full_report_svg_and_json(self, monkeypatch):
+        """Test: SVG- und JSON-Ausgabe zeichnen nichts mit matplotlib"""
+        def fail(fig):
+            raise AssertionError("matplotlib soll nicht rendern")
+
+        monkeypatch.setattr(ReportB, "_fig_to_png", staticmethod(fail))
+        report = ReportB(MOVEMENTS, PRODUCTS)
+
+        svg = report.generate_full_report(chart_format="svg")["charts"]
+        assert all(value.startswith("<svg") for value in svg.values())
+
+        charts = report.generate_full_report(chart_format="json")["charts"]
+        assert charts["movement_types"]["labels"] == ["Einkauf", "Verkauf", "Zum Shop"]
+        assert charts["movement_types"]["values"] == [5, 5, 5]
+        assert charts["inventory_value"]["values"] == [12.0, 6.0]
+
+    def test_empty_charts(self):
+        """Test: Ohne Bewegungen gibt es keine Bewegungscharts"""
+        report = ReportB([], [])
+        assert report.chart_svg("movement_timeline") is None
+        assert report.chart_json("movement_types") is None
+        assert report.generate_full_report(chart_format="svg")["charts"]["movement_timeline"] == ""
+
+    def test_unknown_format(self):
+        """Test: Unbekanntes Format wird abgelehnt"""
+        with pytest.raises(ValueError):
+            ReportB([], []).generate_full_report(chart_format="gif")
@@ -0,0 +1,115 @@
+"""Erweiterte Tests - Textberichte des ConsoleReportAdapter (gestreamt)"""
+
+import io
+from datetime import datetime, timedelta
+
+from src.adapters.export import CHUNK_SIZE
+from src.adapters.report import ConsoleReportAdapter
+from src.adapters.repository import InMemoryRepository
+from src.domain.product import Product
+from src.domain.warehouse import Movement
+
+START = datetime(2026, 1, 1, 8, 0, 0)
+
+
+def _movement(i, reason=None):
+    return Movement(id=f"M{i}", product_id="P001", product_name="Ordner", quantity_change=-2 if i % 2 else 5,
+                    movement_type="SOLD" if i % 2 else "IN", reason=reason,
+                    timestamp=START + timedelta(minutes=i), performed_by="anna")
+
+
+class TestTextReports:
+    """Tests für iter_/write_/generate_*_report"""
+
+    def test_inventory_report_text(self):
+        """Test: Lagerbericht enthält alle Felder und den Gesamtwert"""
+        products = {
+            "P001": Product(id="P001", name="Ordner", description="", price=2.5, category="Papier",
+                            warehouse_qty=4, shop_qty=2),
+        }
+        report = ConsoleReportAdapter(products).generate_inventory_report()
+        assert report == (
+            "=" * 60 + "\nLAGERBESTANDSBERICHT\n" + "=" * 60 + "\n\n"
+            "ID: P001\n  Name: Ordner\n  Kategorie: Papier\n  Lagerbestand: 4\n  Shopbestand: 2\n"
+            "  Gesamtbestand: 6\n  Preis: 2.50 €\n  Gesamtwert: 15.00 €\n\n"
+            + "-" * 60 + "\nGesamtwert Lager: 15.00 €\n" + "=" * 60 + "\n"
+        )
+
+    def test_movement_report_text(self):
+        """Test: Protokoll mit Grund nur, wenn einer angegeben ist"""
+        report = ConsoleReportAdapter(movements=[_movement(1), _movement(0, reason="Lieferung")]).generate_movement_report()
+        assert report == (
+            "=" * 80 + "\nBEWEGUNGSPROTOKOLL\n" + "=" * 80 + "\n\n"
+            "[2026-01-01 08:00:00]\n  Produkt: Ordner (ID: P001)\n  Typ: IN\n  Menge: +5\n"
+            "  Grund: Lieferung\n  Durchgeführt von: anna\n\n"
+            "[2026-01-01 08:01:00]\n  Produkt: Ordner (ID: P001)\n  Typ: SOLD\n  Menge: -2\n"
+            "  Durchgeführt von: anna\n\n"
+            + "=" * 80 + "\nGesamtbewegungen: 2\n" + "=" * 80 + "\n"
+        )
+
+    def test_empty_reports(self):
+        """Test: Leere Berichte wie bisher"""
+        adapter = ConsoleReportAdapter()
+        assert adapter.generate_inventory_report() == "Lager ist leer.\n"
+        assert adapter.generate_movement_report() == "Keine Lagerbewegungen vorhanden.\n"
+
+    def test_chunks_are_bounded(self):
+        """Test: Großes Protokoll kommt in Blöcken von etwa CHUNK_SIZE Zeichen"""
+        adapter = ConsoleReportAdapter(movements=[_movement(i) for i in range(5000)])
+        chunks = list(adapter.iter_movement_report())
+        assert len(chunks) > 5
+        # Prüfe: kein Block wesentlich größer als CHUNK_SIZE
+        assert max(len(c) for c in chunks) < CHUNK_SIZE + 500
+        assert "".join(chunks) == adapter.generate_movement_report()
+
+    def test_write_to_stream(self):
+        """Test: write_*_report schreibt denselben Text in ein Dateiobjekt"""
+        adapter = ConsoleReportAdapter(movements=[_movement(i) for i in range(10)])
+        stream = io.StringIO()
+        adapter.write_movement_report(stream)
+        assert stream.getvalue() == adapter.generate_movement_report()
+
+    def test_streams_from_repository(self):
+        """Test: Mit repository werden Bewegungen erst beim Weiterlesen geholt"""
+        repository = InMemoryRepository()
+        for i in range(5000):
+            repository.save_movement(_movement(i))
+        consumed = []
+
+        def counting(*args, **kwargs):
+            for movement in InMemoryRepository.iter_movements(repository, *args, **kwargs):
+                consumed.append(1)
+                yield movement
+
+        repository.iter_movements = counting
+        chunks = ConsoleReportAdapter(repository=repository).iter_movement_report()
+        next(chunks)
+        # Prüfe: erster Block fertig, bevor alle Bewegungen gelesen sind
+        assert 0 < len(consumed) < 5000
+        chunks.close()
+
+    def test_inventory_pages_from_repository(self, monkeypatch):
+        """Test: Lagerbericht liest den Katalog seitenweise statt komplett"""
+        repository = InMemoryRepository()
+        for i in range(1200):
+            repository.save_product(Product(id=f"P{i:04d}", name="Ordner", description="",
+                                            price=1.0, warehouse_qty=1))
+        pages = []
+        original = repository.load_products_page
+
+        def counting(*args, **kwargs):
+            pages.append(kwargs.get("after_cursor"))
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(repository, "load_products_page", counting)
+        monkeypatch.setattr(repository, "load_all_products", None)
+        adapter = ConsoleReportAdapter(repository=repository)
+        chunks = adapter.iter_inventory_report()
+        first = next(chunks)
+        # Prüfe: erster Block fertig, bevor die zweite Seite gelesen ist
+        assert len(pages) == 1
+        report = first + "".join(chunks)
+        assert report.count("ID: P") == 1200
+        assert "Gesamtwert Lager: 1200.00 €" in report
+        # Prüfe: 3 Seiten zu je höchstens PRODUCT_PAGE_SIZE Produkten
+        assert len(pages) == 3
@@ -0,0 +1,129 @@
+"""Erweiterte Tests - Transaktionen (Unit of Work) und atomare Bestandsänderungen"""
+
+import threading
+
+import pytest
+from src.domain.product import Product
+from src.services import WarehouseService
+
+
+@pytest.fixture
+def service(repository):
+    """Service mit einem Produkt (100 im Lager, 10 im Shop)"""
+    service = WarehouseService(repository)
+    service.create_product("P001", "Test", "Test", 10.0, warehouse_qty=100, shop_qty=10)
+    return service
+
+
+class TestAdjustStock:
+    """Tests für RepositoryPort.adjust_stock
+
+    adjust_stock prüft und ändert den Bestand in einem Schritt.
+    Würde ein Bestand negativ, bleibt alles unverändert.
+    """
+
+    def test_adjust_both_quantities(self, repository, service):
+        """Test: Lager -30, Shop +30 in einem Aufruf"""
+        product = repository.adjust_stock("P001", warehouse_delta=-30, shop_delta=30)
+        assert product.warehouse_qty == 70
+        assert product.shop_qty == 40
+
+        # Prüfe: Änderung ist gespeichert
+        stored = repository.load_product("P001")
+        assert stored.warehouse_qty == 70
+        assert stored.shop_qty == 40
+
+    def test_adjust_rejects_negative_result(self, repository, service):
+        """Test: Shop hat 10, Entnahme von 11 wird abgelehnt"""
+        assert repository.adjust_stock("P001", shop_delta=-11) is None
+        assert repository.load_product("P001").shop_qty == 10
+
+    def test_adjust_unknown_product(self, repository):
+        """Test: Unbekanntes Produkt liefert None"""
+        assert repository.adjust_stock("NONEXISTENT", warehouse_delta=5) is None
+
+
+class TestUnitOfWork:
+    """Tests für RepositoryPort.transaction
+
+    Alle Änderungen im with-Block werden gemeinsam übernommen
+    oder bei einer Exception komplett verworfen.
+    """
+
+    def test_rollback_on_exception(self, repository, service):
+        """Test: Exception im Block nimmt Bestandsänderung zurück"""
+        with pytest.raises(RuntimeError):
+            with repository.transaction():
+                repository.adjust_stock("P001", shop_delta=-5)
+                raise RuntimeError("Abbruch")
+
+        # Prüfe: Shopbestand wieder bei 10, keine Bewegung
+        assert repository.load_product("P001").shop_qty == 10
+        assert repository.load_movements() == []
+
+    def test_failed_movement_rolls_back_sale(self, repository, service, monkeypatch):
+        """Test: Schlägt das Speichern der Bewegung fehl, wird auch der Verkauf verworfen"""
+
+        def broken_save_movement(movement):
+            raise IOError("Platte voll")
+
+        monkeypatch.setattr(repository, "save_movement", broken_save_movement)
+        with pytest.raises(IOError):
+            service.sell_product("P001", 3)
+
+        assert repository.load_product("P001").shop_qty == 10
+
+    def test_commit_keeps_all_changes(self, repository, service):
+        """Test: Ohne Exception bleiben alle Änderungen erhalten"""
+        assert service.sell_product("P001", 3) is True
+
+        assert repository.load_product("P001").shop_qty == 7
+        movements = repository.load_movements()
+        assert len(movements) == 1
+        assert movements[0].movement_type == "SOLD"
+
+    def test_nested_transaction_joins_outer(self, repository, service):
+        """Test: Innere Transaktion gehört zur äußeren (Rollback betrifft beide)"""
+        with pytest.raises(RuntimeError):
+            with repository.transaction():
+                service.transfer_to_shop("P001", 5)
+                raise RuntimeError("Abbruch")
+
+        product = repository.load_product("P001")
+        assert product.warehouse_qty == 100
+        assert product.shop_qty == 10
+
+
+class TestConcurrentSales:
+    """Tests für parallele Verkäufe (Lost-Update-Race)
+
+    Vorher konnten zwei Verkäufe gleichzeitig die Prüfung
+    shop_qty >= quantity bestehen und den Bestand überverkaufen.
+    """
+
+    def test_parallel_sales_never_oversell(self, repository, service):
+        """Test: 20 Threads verkaufen je 1 Stück, nur 10 sind im Shop"""
+        results = []
+
+        def sell():
+            results.append(service.sell_product("P001", 1))
+
+        threads = [threading.Thread(target=sell) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Prüfe: genau 10 Verkäufe erfolgreich, Bestand exakt 0
+        assert results.count(True) == 10
+        assert repository.load_product("P001").shop_qty == 0
+        assert len(repository.load_movements()) == 10
+
+    def test_invalid_quantities_rejected(self, service):
+        """Test: Menge 0 oder negativ wird bei allen Operationen abgelehnt"""
+        for quantity in (0, -5):
+            assert service.transfer_to_shop("P001", quantity) is False
+            assert service.transfer_to_warehouse("P001", quantity) is False
+            assert service.sell_product("P001", quantity) is False
+            assert service.create_purchase("P001", quantity) is False
+        assert service.get_movements() == []